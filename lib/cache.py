@@ -14,6 +14,57 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 # Import utilities
 from utils import get_file_hash, write_json_file
 
+# Optional: msgpack for binary caches written by photo_organizer.py
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+def load_cache_file(cache_file: Path) -> dict:
+    """
+    Load a cache file, JSON or msgpack depending on the extension.
+
+    Args:
+        cache_file: Path to the cache file
+
+    Returns:
+        Parsed cache data
+    """
+    if cache_file.suffix == '.msgpack':
+        with open(cache_file, 'rb') as f:
+            return msgpack.unpack(f, raw=False)
+    # Try UTF-8 first, fall back to UTF-8 with error handling
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except UnicodeDecodeError:
+        with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
+            return json.load(f)
+
+
+def write_cache_file(cache_file: Path, data: dict) -> bool:
+    """
+    Write a cache file back in the format its extension indicates.
+
+    Args:
+        cache_file: Path to the cache file
+        data: Cache data to serialize
+
+    Returns:
+        True if successful
+    """
+    if cache_file.suffix == '.msgpack':
+        try:
+            with open(cache_file, 'wb') as f:
+                msgpack.pack(data, f, use_bin_type=True)
+            return True
+        except Exception as e:
+            print(f"Error writing {cache_file}: {e}")
+            return False
+    return write_json_file(cache_file, data)
+
 
 class CacheManager:
     """Manages cache files and updates file paths."""
@@ -34,6 +85,8 @@ class CacheManager:
             raise ValueError(f"Cache directory does not exist: {self.cache_dir}")
 
         cache_files = list(self.cache_dir.glob("*.json"))
+        if MSGPACK_AVAILABLE:
+            cache_files += list(self.cache_dir.glob("*.msgpack"))
         if not cache_files:
             raise ValueError(f"No JSON cache files found in {self.cache_dir}")
 
@@ -205,14 +258,7 @@ class CacheManager:
         # Process each cache file
         for cache_file in self.cache_files:
             try:
-                # Try UTF-8 first, fall back to UTF-8 with error handling
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                except UnicodeDecodeError:
-                    # Fall back to UTF-8 with replace errors
-                    with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                        cache_data = json.load(f)
+                cache_data = load_cache_file(cache_file)
 
                 if verbose:
                     print(f"\nProcessing cache file: {cache_file.name}")
@@ -299,8 +345,8 @@ class CacheManager:
                     if 'metadata' in cache_data:
                         cache_data['metadata']['last_updated'] = datetime.now().isoformat()
 
-                    # Save the updated cache file
-                    write_json_file(cache_file, cache_data)
+                    # Save the updated cache file (same format it was read in)
+                    write_cache_file(cache_file, cache_data)
                     stats["updated_cache_files"].append(cache_file.name)
 
                     if verbose:
@@ -407,8 +453,8 @@ class CacheManager:
             else:
                 print(f"\n[WARN] Quellordner nicht gefunden: {data_dir}")
 
-        # --- load JSON cache entries ---------------------------------------
-        json_files = [f for f in self.cache_files if f.suffix == '.json']
+        # --- load JSON/msgpack cache entries -------------------------------
+        json_files = [f for f in self.cache_files if f.suffix in ('.json', '.msgpack')]
         if not json_files:
             print("\n[ERROR] Keine JSON-Cache-Dateien gefunden.")
             return False
@@ -416,8 +462,7 @@ class CacheManager:
         all_entries: List[tuple] = []   # (entry_dict, json_path)
         for json_file in sorted(json_files):
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
+                cache_data = load_cache_file(json_file)
                 photos = cache_data.get('photos', [])
                 print(f"\n  [FILE] {json_file.name}: {len(photos)} Eintraege")
                 for photo in photos:
@@ -783,12 +828,7 @@ class CacheManager:
             for cache_file in self.cache_files:
                 try:
                     # Load cache file
-                    try:
-                        with open(cache_file, 'r', encoding='utf-8') as f:
-                            cache_data = json.load(f)
-                    except UnicodeDecodeError:
-                        with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
-                            cache_data = json.load(f)
+                    cache_data = load_cache_file(cache_file)
 
                     if not isinstance(cache_data, dict):
                         continue
@@ -1,2085 +1,3236 @@
-#!/usr/bin/env python3
-"""
-Automatische Foto-Organisation basierend auf Zeitstempel und GPS-Daten
-Organisiert Fotos in Ordnerstrukturen: YYYY/MM-DD/ oder YYYY/Event_YYYY-MM-DD_bis_YYYY-MM-DD/
-"""
-
-import os
-import shutil
-import json
-import re
-import configparser
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set
-from dataclasses import dataclass
-from collections import defaultdict, Counter
-import math
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-# Import utilities
-from utils import (
-    normalize_path, validate_file, ensure_directory_exists,
-    clean_filename, clean_location_name as clean_location_name_util,
-    get_file_hash, escape_bash_path, escape_powershell_path,
-    get_timestamp as get_timestamp_util, get_most_common_items,
-    write_json_file, read_json_file, write_text_file,
-    is_video_file
-)
-
-try:
-    from PIL import Image
-    from PIL.ExifTags import TAGS, GPSTAGS
-    from PIL.ExifTags import Base as ExifBase
-    PILLOW_AVAILABLE = True
-except ImportError:
-    print("PIL/Pillow nicht installiert. Installiere mit: pip install Pillow")
-    PILLOW_AVAILABLE = False
-
-try:
-    import subprocess
-    from static_ffmpeg import run
-    # Get paths to bundled ffmpeg/ffprobe binaries
-    ffmpeg_path, ffprobe_path = run.get_or_fetch_platform_executables_else_raise()
-    FFPROBE_AVAILABLE = True
-    FFPROBE_PATH = ffprobe_path
-except ImportError:
-    FFPROBE_AVAILABLE = False
-    FFPROBE_PATH = 'ffprobe'  # Fallback to system ffprobe
-    print("Warnung: static-ffmpeg nicht verfügbar. Versuche System-ffprobe zu verwenden.")
-
-try:
-    import requests
-    import time
-    GEOCODING_AVAILABLE = True
-except ImportError:
-    GEOCODING_AVAILABLE = False
-    print("Warnung: requests nicht verfügbar. Installiere mit: pip install requests")
-
-@dataclass
-class PhotoInfo:
-    """Informationen über ein Foto/Video"""
-    filepath: Path
-    datetime: datetime
-    gps_coords: Optional[Tuple[float, float]] = None  # (lat, lon)
-    location_name: Optional[str] = None  # Ortsname aus GPS
-    file_hash: str = ""
-    file_size: int = 0
-    is_video: bool = False
-
-class PhotoOrganizer:
-    def __init__(self, 
-                 source_dir: str,
-                 target_dir: str,
-                 same_day_hours: int = 12,
-                 event_max_days: int = 3,
-                 geo_radius_km: float = 10.0,
-                 use_geocoding: bool = True,
-                 max_workers: int = None,
-                 generate_script: bool = False,
-                 script_path: str = None,
-                 cache_file: Optional[str] = None,
-                 add_exif: bool = False,
-                 powershell: bool = False,
-                 compare_with_cache: bool = True):
-        """
-        Initialisiert den Photo Organizer
-
-        Args:
-            source_dir: Quellverzeichnis mit Fotos
-            target_dir: Zielverzeichnis für organisierte Fotos
-            same_day_hours: Stunden-Schwelle für gleichen Tag
-            event_max_days: Maximale Tage für Event-Zusammengehörigkeit
-            geo_radius_km: GPS-Radius in km für Event-Zugehörigkeit
-            use_geocoding: Aktiviert Reverse-Geocoding für Ortsnamen
-            max_workers: Anzahl paralleler Threads (None = auto)
-            generate_script: Erzeugt Shell-Script für spätere Ausführung
-            script_path: Pfad für das Shell-Script (None = auto mit PROJECT_SCRIPTS)
-            cache_file: JSON-Cache-Datei für Photo-Daten und Geocoding (None = auto mit PROJECT_CACHE)
-            add_exif: Fügt EXIF-Daten basierend auf Dateinamen hinzu
-            powershell: Erzeugt PowerShell-Script (.ps1) statt Bash-Script (.sh)
-            compare_with_cache: Vergleicht mit permanenter CSV (default: True)
-        """
-        self.source_dir = Path(source_dir).resolve()
-        self.target_dir = Path(target_dir).resolve()
-        self.same_day_hours = same_day_hours
-        self.event_max_days = event_max_days
-        self.geo_radius_km = geo_radius_km
-        self.use_geocoding = use_geocoding and GEOCODING_AVAILABLE
-        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
-        self.generate_script = generate_script
-        self.add_exif = add_exif and PILLOW_AVAILABLE
-        self.powershell = powershell
-        
-        if add_exif and not PILLOW_AVAILABLE:
-            print("⚠️  --addexif erfordert PIL/Pillow. Feature deaktiviert.")
-        
-        # Auto-generiere Script-Pfad falls nicht angegeben
-        if script_path is None:
-            script_path = self.generate_script_path()
-        self.script_path = Path(script_path)
-        
-        # Auto-generiere Cache-Dateinamen falls nicht angegeben
-        if cache_file is None:
-            cache_file = self.generate_cache_filename()
-        self.cache_file = Path(cache_file) if cache_file else None
-        
-        self.supported_extensions = {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.mov', '.mp4', '.avi', '.vid'}
-        self.video_extensions = {'.mov', '.mp4', '.avi', '.vid'}
-        self.exif_writable_extensions = {'.jpg', '.jpeg', '.tiff', '.tif'}  # Formate die EXIF unterstützen
-        
-        self.photos: List[PhotoInfo] = []
-        self.duplicates: Set[str] = set()
-        self.cached: Set[str] = set()  # Dateien die bereits in der Sammlung sind
-
-        # Thread-sichere Caches
-        self.location_cache: Dict[Tuple[float, float], str] = {}
-        self.location_cache_lock = threading.Lock()
-        self.hash_cache: Dict[str, str] = {}
-        self.hash_cache_lock = threading.Lock()
-
-        # Permanenter Cache aus CSV für Duplikat-Erkennung
-        self.compare_with_cache = compare_with_cache
-        self.cached_hash_dict: Dict[str, str] = {}  # hash -> filepath aus permanenter CSV
-        if compare_with_cache:
-            self.load_permanent_cache()
-        
-        # Shell-Script Sammlung
-        self.move_commands: List[Tuple[Path, Path]] = []  # (source, target)
-        
-        # Lade Dateinamen-Pattern aus Konfiguration
-        self.filename_patterns = self.load_filename_patterns()
-        # Lade default Geokoordinaten aus Konfiguration
-        self.location_cache = self.load_geo_cords()
-        # Lade Zielordner-Benennungsmuster aus Konfiguration
-        self.foldernames_config = self.load_foldernames_config()
-        
-        # EXIF-Statistiken
-        self.exif_added_count = 0
-        self.exif_skipped_count = 0
-        self.exif_error_count = 0
-        
-        print(f"Initialisiert mit {self.max_workers} parallelen Threads")
-        if self.cache_file:
-            print(f"Cache-Datei: {self.cache_file}")
-        if self.generate_script:
-            script_type = "PowerShell" if self.powershell else "Bash"
-            print(f"{script_type}-Script: {self.script_path}")
-        if self.add_exif:
-            print(f"EXIF-Hinzufügung: Aktiviert")
-
-    def load_permanent_cache(self) -> bool:
-        """
-        Lädt die neueste permanente CSV-Cache-Datei.
-        Speichert alle Hashes für Duplikat-Erkennung.
-
-        Returns:
-            True wenn erfolgreich, False sonst
-        """
-        import csv
-
-        try:
-            project_cache = os.environ.get('PROJECT_CACHE')
-            if not project_cache:
-                print("⚠️  PROJECT_CACHE nicht gesetzt. Permanenter Cache wird ignoriert.")
-                return False
-
-            cache_dir = Path(project_cache)
-            if not cache_dir.exists():
-                print(f"⚠️  Cache-Verzeichnis existiert nicht: {cache_dir}")
-                return False
-
-            # Finde die neueste permanente CSV-Datei
-            permanent_files = list(cache_dir.glob('photo_cache_permanent_*.csv'))
-
-            # Fallback: Prüfe auch auf "permanent.csv" (Legacy-Name)
-            if not permanent_files:
-                legacy_file = cache_dir / 'permanent.csv'
-                if legacy_file.exists():
-                    permanent_files = [legacy_file]
-                    print(f"Lade Legacy-Cache: {legacy_file.name}")
-
-            if not permanent_files:
-                print("⚠️  Keine permanente CSV-Datei gefunden")
-                return False
-
-            # Sortiere nach Dateinamen (enthält Timestamp) - wenn mehrere neueste Datei nehmen
-            if len(permanent_files) > 1:
-                permanent_files.sort()
-                permanent_file = permanent_files[-1]  # Neueste Datei
-            else:
-                permanent_file = permanent_files[0]
-
-            print(f"Lade permanenten Cache: {permanent_file.name}")
-
-            # Lade die CSV und fülle cached_hash_dict
-            with open(permanent_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f, delimiter=';')
-                hash_count = 0
-
-                for row in reader:
-                    file_hash = row.get('file_hash', '').strip()
-                    filepath = row.get('filepath', '').strip()
-
-                    if file_hash and filepath:
-                        self.cached_hash_dict[file_hash] = filepath
-                        hash_count += 1
-
-            print(f"  Geladen: {hash_count} Hashes aus permanenter Cache")
-            return True
-
-        except Exception as e:
-            print(f"⚠️  Fehler beim Laden permanenter Cache: {e}")
-            return False
-
-    def load_geo_cords(self) -> Dict[Tuple[float, float], str]:
-        """Lädt Geokoordinaten aus Konfigurationsdatei"""
-       
-        default_patterns = {
-            (47.269,8.846): "Duernten",
-            (48.341,10.906): "Augsburg",
-            (48.147,11.561): "Muenchen",
-            (48.151,11.462): "Muenchen",
-        }
-        project_cfg = os.environ.get('PROJECT_CFG')
-        if not project_cfg:
-            print("🔧 PROJECT_CFG nicht gesetzt, verwende Default-Pattern")
-            return default_patterns
-        
-        config_dir = Path(project_cfg)
-        geoconfig_file = config_dir / "geo_coords.cfg"
-
-        
-        if not geoconfig_file.exists():
-            # Erstelle Standard-Konfigurationsdatei
-            config_content = """# PhotoOrganizer geo Koordinaten Konfigurationsdatei
-#
-# Diese Datei enthält zu den Angaben von Länge und Breite den entsprechenden Ort
-
-[geo_locations]
-# Bekannte Orte mit Koordinaten
-47.269,8.846 = Duernten
-48.341,10.906 = Augsburg
-48.147,11.561 = Muenchen
-48.151,11.462 = Muenchen
-
-[unknown]
-# GPS-Koordinaten, die nicht reverse-geocodiert werden konnten
-# Diese werden bei --no-geocoding Flag gespeichert
-# Format: latitude,longitude = unknown
-"""
-            self.create_default_config(geoconfig_file, config_content)
-            print(f"🔧 Standard-Config erstellt: {geoconfig_file}")
-        
-        try:
-            config = configparser.ConfigParser()
-            config.read(geoconfig_file, encoding='utf-8')
-
-            # Load known locations from [geo_locations]
-            if 'geo_locations' in config:
-                for key, location_name in config['geo_locations'].items():
-                    try:
-                        # Parse Koordinaten aus dem Key "lat,lon"
-                        lat_str, lon_str = key.split(',')
-                        lat = float(lat_str.strip())
-                        lon = float(lon_str.strip())
-
-                        # Füge zum Cache hinzu
-                        default_patterns[(lat, lon)] = location_name.strip()
-
-                    except ValueError as e:
-                        print(f"⚠️  Ungültiges Koordinatenformat in [geo_locations]: '{key}' -> {e}")
-                        continue
-
-            # Load unknown coordinates from [unknown] section
-            # These won't be re-queried via API
-            unknown_count = 0
-            if 'unknown' in config:
-                for key in config['unknown'].keys():
-                    try:
-                        # Parse Koordinaten aus dem Key "lat,lon"
-                        lat_str, lon_str = key.split(',')
-                        lat = float(lat_str.strip())
-                        lon = float(lon_str.strip())
-
-                        # Store as None to avoid re-querying
-                        default_patterns[(lat, lon)] = None
-                        unknown_count += 1
-
-                    except ValueError as e:
-                        print(f"⚠️  Ungültiges Koordinatenformat in [unknown]: '{key}' -> {e}")
-                        continue
-
-            if unknown_count > 0:
-                print(f"🔧 {len(default_patterns)} Pattern aus Config geladen ({unknown_count} unbekannt): {geoconfig_file}")
-            else:
-                print(f"🔧 {len(default_patterns)} Pattern aus Config geladen: {geoconfig_file}")
-            return default_patterns
-
-        except Exception as e:
-            print(f"⚠️  Fehler beim Laden der Config: {e}")
-            print("🔧 Verwende Default-Pattern")
-            return default_patterns
-
-    def save_geo_locations_to_config(self) -> None:
-        """
-        Save geolocation data to geo_coords.cfg using configparser.
-
-        Known locations (with names) go to [geo_locations].
-        Unknown locations (with None value) go to [unknown].
-        Preserves existing sections and entries.
-        """
-        import configparser
-
-        project_cfg = os.environ.get('PROJECT_CFG')
-        config_dir = Path(project_cfg)
-        geoconfig_file = config_dir / "geo_coords.cfg"
-
-        try:
-            # Load existing config to preserve other sections
-            config = configparser.ConfigParser()
-            if config_dir.exists() and geoconfig_file.exists():
-                config.read(geoconfig_file, encoding='utf-8')
-
-            # Ensure sections exist
-            if 'geo_locations' not in config:
-                config['geo_locations'] = {}
-            if 'unknown' not in config:
-                config['unknown'] = {}
-
-            # Separate known and unknown locations
-            known_count = 0
-            unknown_count = 0
-
-            for (lat, lon), location_name in sorted(self.location_cache.items()):
-                key = f"{lat},{lon}"
-
-                if location_name is None or location_name == "unknown":
-                    # Store in [unknown] section only if value is None
-                    # (not an empty string, actual None)
-                    if location_name is None:
-                        config['unknown'][key] = "unknown"
-                        unknown_count += 1
-                else:
-                    # Store in [geo_locations] section
-                    config['geo_locations'][key] = location_name
-                    known_count += 1
-
-            # Remove [unknown] section if it's empty (all entries were geocoded)
-            if 'unknown' in config:
-                if len(config['unknown']) == 0:
-                    config.remove_section('unknown')
-
-            # Save to file
-            os.makedirs(config_dir, exist_ok=True)
-            with open(geoconfig_file, 'w', encoding='utf-8') as f:
-                config.write(f)
-
-            total = known_count + unknown_count
-            print(f"✅ Geo-Locations gespeichert: {geoconfig_file}")
-            print(f"   Bekannte Orte [geo_locations]: {known_count}")
-            if unknown_count > 0:
-                print(f"   Unbekannte Koordinaten [unknown]: {unknown_count}")
-            else:
-                print(f"   [unknown] section wurde entfernt (alle Koordinaten geocodiert)")
-
-        except Exception as e:
-            print(f"❌ Fehler beim Speichern: {e}")
-
-    def load_foldernames_config(self) -> Dict[str, str]:
-        """Lädt Zielordner-Benennungsmuster aus Konfigurationsdatei"""
-        # Default-Muster falls Config nicht verfügbar
-        default_config = {
-            'single_day': '{year}/{start_date}',
-            'multi_day': '{year}/{start_date}_bis_{end_date}',
-            'single_files': '{year}/einzeldateien',
-        }
-
-        project_cfg = os.environ.get('PROJECT_CFG')
-        if not project_cfg:
-            print("🔧 PROJECT_CFG nicht gesetzt, verwende Standard-Muster")
-            return default_config
-
-        config_dir = Path(project_cfg)
-        config_file = config_dir / "photo_organizer.cfg"
-
-        if not config_file.exists():
-            return default_config
-
-        try:
-            config = configparser.ConfigParser()
-            config.read(config_file, encoding='utf-8')
-
-            if 'foldernames_target' in config:
-                loaded_config = {}
-                for key, value in config['foldernames_target'].items():
-                    if value.strip():  # Überspringe leere Werte
-                        loaded_config[key.strip()] = value.strip()
-
-                if loaded_config:
-                    print(f"🔧 Zielordner-Muster aus Config geladen: {config_file}")
-                    # Merge mit Default-Config für fehlende Keys
-                    result = default_config.copy()
-                    result.update(loaded_config)
-                    return result
-
-        except Exception as e:
-            print(f"⚠️  Fehler beim Laden der Folder-Konfiguration: {e}")
-
-        return default_config
-
-    def load_filename_patterns(self) -> List[str]:
-        """Lädt Dateinamen-Pattern aus Konfigurationsdatei"""
-        # Default-Pattern falls Config nicht verfügbar
-        default_patterns = [
-            # YYYY-MM-DD HH.MM.SS oder YYYY-MM-DD HH-MM-SS
-            r'(\d{4})-(\d{2})-(\d{2})\s+(\d{2})[\.\-:](\d{2})[\.\-:](\d{2})',
-            # YYYY-MM-DD_HH.MM.SS oder YYYY-MM-DD_HH-MM-SS
-            r'(\d{4})-(\d{2})-(\d{2})_(\d{2})[\.\-:](\d{2})[\.\-:](\d{2})',
-            # YYYYMMDD_HHMMSS
-            r'(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})',
-            # YYYY-MM-DD (nur Datum, Zeit wird auf 12:00:00 gesetzt)
-            r'(\d{4})-(\d{2})-(\d{2})',
-            # YYYYMMDD (nur Datum)
-            r'(\d{4})(\d{2})(\d{2})',
-            # IMG_YYYYMMDD_HHMMSS (typisch für Kameras)
-            r'IMG_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})',
-            # WhatsApp Format: IMG-YYYYMMDD-WAXXXX
-            r'IMG-(\d{4})(\d{2})(\d{2})-WA\d+',
-            # Signal Format: signal-YYYY-MM-DD-HHMMSS
-            r'signal-(\d{4})-(\d{2})-(\d{2})-(\d{2})(\d{2})(\d{2})',
-            # Screenshot Format: Screenshot_YYYY-MM-DD-HH-MM-SS
-            r'Screenshot_(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})',
-            # Allgemeines Muster: beliebiger Text + YYYYMMDD
-            r'.*(\d{4})(\d{2})(\d{2}).*',
-        ]
-        
-        project_cfg = os.environ.get('PROJECT_CFG')
-        if not project_cfg:
-            print("🔧 PROJECT_CFG nicht gesetzt, verwende Default-Pattern")
-            return default_patterns
-        
-        config_dir = Path(project_cfg)
-        config_file = config_dir / "photo_organizer.cfg"
-        
-        if not config_file.exists():
-            # Erstelle Standard-Konfigurationsdatei
-            config_content = """# PhotoOrganizer Konfigurationsdatei
-# 
-# Diese Datei enthält Regex-Pattern für die Erkennung von Datum/Zeit in Dateinamen
-# Format: pattern_name = regex_pattern
-# 
-# Regex-Gruppen:
-# - 6 Gruppen: Jahr, Monat, Tag, Stunde, Minute, Sekunde
-# - 3 Gruppen: Jahr, Monat, Tag (Zeit wird auf 12:00:00 gesetzt)
-
-[Filename_Patterns]
-
-# Standard-Formate mit Datum und Zeit
-datetime_space = (\\d{4})-(\\d{2})-(\\d{2})\\s+(\\d{2})[\\.-:](\\d{2})[\\.-:](\\d{2})
-datetime_underscore = (\\d{4})-(\\d{2})-(\\d{2})_(\\d{2})[\\.-:](\\d{2})[\\.-:](\\d{2})
-compact_datetime = (\\d{4})(\\d{2})(\\d{2})_(\\d{2})(\\d{2})(\\d{2})
-
-# Nur Datum (Zeit wird auf 12:00:00 gesetzt)
-date_dashes = (\\d{4})-(\\d{2})-(\\d{2})
-date_compact = (\\d{4})(\\d{2})(\\d{2})
-
-# Kamera-/App-spezifische Formate
-img_camera = IMG_(\\d{4})(\\d{2})(\\d{2})_(\\d{2})(\\d{2})(\\d{2})
-whatsapp = IMG-(\\d{4})(\\d{2})(\\d{2})-WA\\d+
-signal = signal-(\\d{4})-(\\d{2})-(\\d{2})-(\\d{2})(\\d{2})(\\d{2})
-screenshot = Screenshot_(\\d{4})-(\\d{2})-(\\d{2})-(\\d{2})-(\\d{2})-(\\d{2})
-
-# Fallback: beliebiger Text + Datum
-fallback_date = .*(\\d{4})(\\d{2})(\\d{2}).*
-
-# Eigene Pattern können hier hinzugefügt werden:
-# mein_format = (\\d{4})\\.(\\d{2})\\.(\\d{2})_(\\d{2})h(\\d{2})m(\\d{2})s
-"""
-            self.create_default_config(config_file, config_content)
-            print(f"🔧 Standard-Config erstellt: {config_file}")
-        
-        try:
-            config = configparser.ConfigParser()
-            config.read(config_file, encoding='utf-8')
-            
-            if 'Filename_Patterns' in config:
-                patterns = []
-                for key, pattern in config['Filename_Patterns'].items():
-                    if pattern.strip():  # Überspringe leere Pattern
-                        patterns.append(pattern.strip())
-                
-                if patterns:
-                    print(f"🔧 {len(patterns)} Pattern aus Config geladen: {config_file}")
-                    return patterns
-                    
-        except Exception as e:
-            print(f"⚠️  Fehler beim Laden der Config: {e}")
-            print("🔧 Verwende Default-Pattern")
-            return default_patterns
-    
-    def create_default_config(self, config_file: Path, config_content) -> None:
-        """Erstellt Standard-Konfigurationsdatei"""
-        config_dir = config_file.parent
-        config_dir.mkdir(parents=True, exist_ok=True)
-        
-        try:
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.write(config_content)
-        except Exception as e:
-            print(f"❌ Fehler beim Erstellen der Config: {e}")
-    
-    def generate_script_path(self) -> str:
-        """Generiert automatischen Script-Pfad mit PROJECT_SCRIPTS falls verfügbar"""
-        # Prüfe PROJECT_SCRIPTS Umgebungsvariable
-        project_scripts = os.environ.get('PROJECT_SCRIPTS')
-        
-        if project_scripts:
-            scripts_dir = Path(project_scripts)
-            # Erstelle Verzeichnis falls es nicht existiert
-            scripts_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Bestimme Dateiendung basierend auf Script-Typ
-            extension = ".ps1" if self.powershell else ".sh"
-            script_filename = f"photo_move_{get_timestamp_util()}{extension}"
-            script_path = scripts_dir / script_filename
-            print(f"🔧 Verwende PROJECT_SCRIPTS: {script_path}")
-            return str(script_path)
-        else:
-            # Fallback auf aktuelles Verzeichnis
-            print(f"🔧 PROJECT_SCRIPTS nicht gesetzt, verwende aktuelles Verzeichnis")
-            extension = ".ps1" if self.powershell else ".sh"
-            return f"photo_move_script{extension}"
-    
-    def generate_cache_filename(self) -> str:
-        """Generiert automatischen Cache-Dateinamen mit PROJECT_CACHE falls verfügbar"""
-        # Prüfe PROJECT_CACHE Umgebungsvariable
-        project_cache = os.environ.get('PROJECT_CACHE')
-        
-        # Verwende nur den Namen des Quellverzeichnisses
-        source_abs = self.source_dir.resolve()
-        source_name = source_abs.name or "root"
-        source_clean = clean_filename(source_name)
-        
-        cache_filename = f"photo_cache_{source_clean}.json"
-        
-        if project_cache:
-            cache_dir = Path(project_cache)
-            # Erstelle Verzeichnis falls es nicht existiert
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            cache_path = cache_dir / cache_filename
-            print(f"🔧 Verwende PROJECT_CACHE: {cache_path}")
-            return str(cache_path)
-        else:
-            # Fallback auf aktuelles Verzeichnis
-            print(f"🔧 PROJECT_CACHE nicht gesetzt, verwende aktuelles Verzeichnis")
-            print(f"🔧 Auto-Cache-Name: {cache_filename}")
-            return cache_filename
-    
-
-    
-    def get_datetime_from_filename(self, filepath: Path) -> Optional[datetime]:
-        """Extrahiert Datum/Zeit aus Dateinamen (Pattern aus Konfiguration)"""
-        import re
-        
-        filename = filepath.stem  # Dateiname ohne Erweiterung
-        
-        # Verwende Pattern aus Konfiguration
-        for pattern in self.filename_patterns:
-            match = re.search(pattern, filename)
-            if match:
-                groups = match.groups()
-                try:
-                    if len(groups) == 6:  # Vollständiges Datum + Zeit
-                        year, month, day, hour, minute, second = map(int, groups)
-                        return datetime(year, month, day, hour, minute, second)
-                    elif len(groups) == 3:  # Nur Datum
-                        year, month, day = map(int, groups)
-                        return datetime(year, month, day, 12, 0, 0)  # Mittag als Standard
-                    elif len(groups) == 2:  # Spezielle Formate
-                        continue
-                except ValueError as e:
-                    print(f"  Ungültiges Datum im Dateinamen {filename}: {e}")
-                    continue
-        
-        return None
-    
-    def add_exif_to_file(self, filepath: Path, datetime_from_filename: datetime) -> bool:
-        """Fügt EXIF-Daten aus Dateinamen zu Bilddatei hinzu"""
-        if not self.add_exif:
-            return False
-            
-        # Nur für unterstützte Bildformate
-        if filepath.suffix.lower() not in self.exif_writable_extensions:
-            return False
-            
-        try:
-            # Prüfe ob bereits EXIF-Datum vorhanden
-            existing_exif_date = self.get_exif_datetime(filepath)
-            if existing_exif_date:
-                print(f"  ⏭️  EXIF bereits vorhanden: {filepath.name}")
-                self.exif_skipped_count += 1
-                return False
-            
-            # Lade Bild - explicitly convert Path to string to handle special characters
-            with Image.open(str(filepath)) as img:
-                # Hole existierende EXIF-Daten oder erstelle neue
-                exif_dict = img.getexif()
-                
-                # Konvertiere datetime zu EXIF-Format (YYYY:MM:DD HH:MM:SS)
-                exif_datetime_str = datetime_from_filename.strftime('%Y:%m:%d %H:%M:%S')
-                
-                # Setze EXIF-Tags für Datum/Zeit
-                # 306 = DateTime (Image creation date)
-                # 36867 = DateTimeOriginal (Original image date)  
-                # 36868 = DateTimeDigitized (Digitization date)
-                exif_dict[306] = exif_datetime_str      # DateTime
-                exif_dict[36867] = exif_datetime_str    # DateTimeOriginal
-                exif_dict[36868] = exif_datetime_str    # DateTimeDigitized
-                
-                # Optional: Software-Tag setzen
-                exif_dict[305] = "PhotoOrganizer"       # Software
-                
-                # Erstelle Backup des Original (optional)
-                # backup_path = filepath.with_suffix(filepath.suffix + '.backup')
-                # shutil.copy2(filepath, backup_path)
-                
-                # Speichere Bild mit neuen EXIF-Daten
-                img.save(filepath, exif=exif_dict, quality=95, optimize=True)
-                
-                print(f"  ✅ EXIF hinzugefügt: {filepath.name} -> {exif_datetime_str}")
-                self.exif_added_count += 1
-                return True
-                
-        except Exception as e:
-            print(f"  ❌ EXIF-Fehler bei {filepath.name}: {e}")
-            self.exif_error_count += 1
-            return False
-    
-    def escape_shell_path(self, path: Path) -> str:
-        """Escapet Pfade für sichere Shell-Verwendung"""
-        shell = 'powershell' if self.powershell else 'bash'
-        return escape_shell_path(str(path), shell=shell)
-    
-    def generate_shell_script(self, events: Dict[str, List[PhotoInfo]]) -> None:
-        """Erzeugt Shell-Script für die Foto-Organisation"""
-        if self.powershell:
-            self.generate_powershell_script(events)
-        else:
-            self.generate_bash_script(events)
-    
-    def generate_bash_script(self, events: Dict[str, List[PhotoInfo]]) -> None:
-        """Erzeugt Bash-Script für die Foto-Organisation"""
-        script_content = []
-        
-        # Script-Header
-        script_content.append("#!/bin/bash")
-        script_content.append("# Automatisch generiertes Bash-Script für Foto-Organisation")
-        script_content.append(f"# Erstellt am: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        script_content.append(f"# Quelle: {self.source_dir}")
-        script_content.append(f"# Ziel: {self.target_dir}")
-        script_content.append("")
-        script_content.append("set -e  # Stoppe bei Fehlern")
-        script_content.append("set -u  # Stoppe bei undefinierten Variablen")
-        script_content.append("")
-        script_content.append("# Farben für Output")
-        script_content.append('GREEN="\\033[0;32m"')
-        script_content.append('RED="\\033[0;31m"')
-        script_content.append('BLUE="\\033[0;34m"')
-        script_content.append('YELLOW="\\033[0;33m"')
-        script_content.append('NC="\\033[0m"  # No Color')
-        script_content.append("")
-        script_content.append("# Statistiken")
-        script_content.append("moved_count=0")
-        script_content.append("error_count=0")
-        script_content.append("")
-        
-        # Funktion für Datei-Moves
-        script_content.append("# Funktion zum Verschieben einer einzelnen Datei")
-        script_content.append("move_file() {")
-        script_content.append("    local source_file=\"$1\"")
-        script_content.append("    local target_path=\"$2\"")
-        script_content.append("    ")
-        script_content.append("    if [[ -f \"$source_file\" ]]; then")
-        script_content.append("        if mv \"$source_file\" \"$target_path\"; then")
-        script_content.append("            echo -e \"  ${GREEN}✅ $(basename \"$source_file\")${NC}\"")
-        script_content.append("            moved_count=$((moved_count + 1))")
-        script_content.append("        else")
-        script_content.append("            echo -e \"  ${RED}❌ Fehler: $(basename \"$source_file\")${NC}\"")
-        script_content.append("            error_count=$((error_count + 1))")
-        script_content.append("        fi")
-        script_content.append("    else")
-        script_content.append("        echo -e \"  ${RED}❌ Nicht gefunden: $(basename \"$source_file\")${NC}\"")
-        script_content.append("        error_count=$((error_count + 1))")
-        script_content.append("    fi")
-        script_content.append("}")
-        script_content.append("")
-        
-        script_content.append("echo -e \"${BLUE}🚀 Starte Foto-Organisation...${NC}\"")
-        script_content.append("echo")
-        script_content.append("")
-        
-        # Wechsle ins Quellverzeichnis
-        script_content.append("# Wechsle ins Quellverzeichnis")
-        source_escaped = self.escape_shell_path(self.source_dir)
-        script_content.append(f"cd {source_escaped}")
-        script_content.append(f"echo -e \"${{YELLOW}}📁 Arbeitsverzeichnis: $(pwd)${{NC}}\"")
-        script_content.append("echo")
-        script_content.append("")
-        
-        # Sammle alle Move-Kommandos
-        all_moves = []
-        
-        for event_name, photos in events.items():
-            if event_name == "einzeldateien" or event_name.endswith("/einzeldateien"):
-                # Einzeldateien in Jahresordnern
-                if "/" in event_name:
-                    year = event_name.split("/")[0]
-                    target_folder = self.target_dir / year / "einzeldateien" 
-                    script_content.append(f"# 📄 Einzeldateien {year} ({len(photos)} Dateien)")
-                    script_content.append(f"echo -e \"${{BLUE}}📄 Einzeldateien {year} ({len(photos)} Dateien)${{NC}}\"")
-                else:
-                    target_folder = self.target_dir / "einzeldateien"
-                    script_content.append(f"# 📄 Einzeldateien ({len(photos)} Dateien)")
-                    script_content.append(f"echo -e \"${{BLUE}}📄 Einzeldateien ({len(photos)} Dateien)${{NC}}\"")
-                
-                # Erstelle Zielordner
-                target_escaped = self.escape_shell_path(target_folder)
-                script_content.append(f"mkdir -p {target_escaped}")
-            elif event_name == ".":
-                # Fallback: Einzelne Dateien direkt ins Zielverzeichnis (sollte nicht mehr vorkommen)
-                target_folder = self.target_dir
-                script_content.append(f"# 📄 Einzelne Dateien -> Zielverzeichnis ({len(photos)} Dateien)")
-                script_content.append(f"echo -e \"${{BLUE}}📄 Einzelne Dateien -> Zielverzeichnis ({len(photos)} Dateien)${{NC}}\"")
-            else:
-                # Event-Ordner
-                target_folder = self.target_dir / event_name
-                script_content.append(f"# 📁 {event_name}/ ({len(photos)} Dateien)")
-                script_content.append(f"echo -e \"${{BLUE}}📁 {event_name}/ ({len(photos)} Dateien)${{NC}}\"")
-                
-                # Erstelle Zielordner
-                target_escaped = self.escape_shell_path(target_folder)
-                script_content.append(f"mkdir -p {target_escaped}")
-            
-            # Move-Kommandos für diese Gruppe
-            for photo in photos:
-                target_path = target_folder / photo.filepath.name
-                
-                # Sammle für Statistiken
-                all_moves.append((photo.filepath, target_path))
-                
-                # Relative Pfade für einfachere Kommandos
-                rel_source = photo.filepath.relative_to(self.source_dir)
-                rel_source_escaped = self.escape_shell_path(rel_source)
-                target_escaped = self.escape_shell_path(target_path)
-                
-                # Funktionsaufruf
-                script_content.append(f"move_file {rel_source_escaped} {target_escaped}")
-            
-            script_content.append("echo")
-        
-        # Script-Footer mit Statistiken
-        script_content.append("")
-        script_content.append("# Zusammenfassung")
-        script_content.append("echo")
-        script_content.append("echo -e \"${BLUE}=== ZUSAMMENFASSUNG ===${NC}\"")
-        script_content.append("echo -e \"${GREEN}✅ $moved_count Dateien erfolgreich verschoben${NC}\"")
-        script_content.append("if [[ $error_count -gt 0 ]]; then")
-        script_content.append("    echo -e \"${RED}❌ $error_count Fehler aufgetreten${NC}\"")
-        script_content.append("    exit 1")
-        script_content.append("else")
-        script_content.append("    echo -e \"${GREEN}🎉 Alle Dateien erfolgreich organisiert!${NC}\"")
-        script_content.append("fi")
-        
-        # Speichere alle Move-Kommandos für interne Verwendung
-        self.move_commands = all_moves
-        
-        # Script in Datei schreiben
-        self.write_script_to_file(script_content)
-    
-    def generate_powershell_script(self, events: Dict[str, List[PhotoInfo]]) -> None:
-        """Erzeugt PowerShell-Script für die Foto-Organisation"""
-        script_content = []
-        
-        # Script-Header
-        script_content.append("# Automatisch generiertes PowerShell-Script für Foto-Organisation")
-        script_content.append(f"# Erstellt am: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        script_content.append(f"# Quelle: {self.source_dir}")
-        script_content.append(f"# Ziel: {self.target_dir}")
-        script_content.append("")
-        script_content.append("# Fehlerbehandlung")
-        script_content.append("$ErrorActionPreference = 'Stop'")
-        script_content.append("")
-        script_content.append("# Statistiken")
-        script_content.append("$movedCount = 0")
-        script_content.append("$errorCount = 0")
-        script_content.append("")
-        
-        # Funktion für Datei-Moves
-        script_content.append("# Funktion zum Verschieben einer einzelnen Datei")
-        script_content.append("function Move-PhotoFile {")
-        script_content.append("    param(")
-        script_content.append("        [string]$SourceFile,")
-        script_content.append("        [string]$TargetPath")
-        script_content.append("    )")
-        script_content.append("    ")
-        script_content.append("    if (Test-Path $SourceFile) {")
-        script_content.append("        try {")
-        script_content.append("            Move-Item -Path $SourceFile -Destination $TargetPath -Force")
-        script_content.append('            Write-Host "   $(Split-Path $SourceFile -Leaf)" -ForegroundColor Green')
-        script_content.append("            $script:movedCount++")
-        script_content.append("        }")
-        script_content.append("        catch {")
-        script_content.append('            Write-Host "[NOT OK] Fehler: $(Split-Path $SourceFile -Leaf)" -ForegroundColor Red')
-        script_content.append("            $script:errorCount++")
-        script_content.append("        }")
-        script_content.append("    }")
-        script_content.append("    else {")
-        script_content.append('        Write-Host "[NOT OK] Nicht gefunden: $(Split-Path $SourceFile -Leaf)" -ForegroundColor Red')
-        script_content.append("        $script:errorCount++")
-        script_content.append("    }")
-        script_content.append("}")
-        script_content.append("")
-        
-        script_content.append('Write-Host "Starte Foto-Organisation..." -ForegroundColor Blue')
-        script_content.append('Write-Host ""')
-        script_content.append("")
-        
-        # Wechsle ins Quellverzeichnis
-        script_content.append("# Wechsle ins Quellverzeichnis")
-        source_escaped = self._escape_powershell_string(str(self.source_dir))
-        script_content.append(f"Set-Location {source_escaped}")
-        script_content.append('Write-Host "Arbeitsverzeichnis: $(Get-Location)" -ForegroundColor Yellow')
-        script_content.append('Write-Host ""')
-        script_content.append("")
-        
-        # Sammle alle Move-Kommandos
-        all_moves = []
-        
-        for event_name, photos in events.items():
-            if event_name == ".":
-                # Einzelne Dateien direkt ins Zielverzeichnis
-                target_folder = self.target_dir
-                safe_header = self._escape_powershell_string(f"📄 Einzelne Dateien -> Zielverzeichnis -{len(photos)} Dateien")
-                script_content.append(f"# 📄 Einzelne Dateien -> Zielverzeichnis -{len(photos)} Dateien")
-                script_content.append(f"Write-Host {safe_header} -ForegroundColor Blue")
-            else:
-                # Event-Ordner
-                target_folder = self.target_dir / event_name
-                safe_header = self._escape_powershell_string(f"{event_name}/ - {len(photos)} Dateien")
-                script_content.append(f"# {event_name.replace('/', '_')}/ - {len(photos)} Dateien")
-                script_content.append(f"Write-Host {safe_header} -ForegroundColor Blue")
-                
-                # Erstelle Zielordner
-                target_escaped = self._escape_powershell_string(str(target_folder))
-                script_content.append(f"New-Item -Path {target_escaped} -ItemType Directory -Force | Out-Null")
-            
-            # Move-Kommandos für diese Gruppe
-            for photo in photos:
-                target_path = target_folder / photo.filepath.name
-                
-                # Sammle für Statistiken
-                all_moves.append((photo.filepath, target_path))
-                
-                # Relative Pfade für einfachere Kommandos
-                rel_source = photo.filepath.relative_to(self.source_dir)
-                rel_source_escaped = self._escape_powershell_string(str(rel_source))
-                target_escaped = self._escape_powershell_string(str(target_path))
-                
-                # Funktionsaufruf
-                script_content.append(f"Move-PhotoFile {rel_source_escaped} {target_escaped}")
-            
-            script_content.append('Write-Host ""')
-        
-        # Script-Footer mit Statistiken
-        script_content.append("")
-        script_content.append("# Zusammenfassung")
-        script_content.append('Write-Host ""')
-        script_content.append('Write-Host "=== ZUSAMMENFASSUNG ===" -ForegroundColor Blue')
-        script_content.append('Write-Host "$movedCount Dateien erfolgreich verschoben" -ForegroundColor Green')
-        script_content.append("if ($errorCount -gt 0) {")
-        script_content.append('    Write-Host "$errorCount Fehler aufgetreten" -ForegroundColor Red')
-        script_content.append("    exit 1")
-        script_content.append("}")
-        script_content.append("else {")
-        script_content.append('    Write-Host "Alle Dateien erfolgreich organisiert!" -ForegroundColor Green')
-        script_content.append("}")
-        
-        # Speichere alle Move-Kommandos für interne Verwendung
-        self.move_commands = all_moves
-        
-        # Script in Datei schreiben
-        self.write_script_to_file(script_content)
-
-    def _escape_powershell_string(self, text: str) -> str:
-        """
-        Escaped einen String für PowerShell korrekt.
-        Verwendet einfache Anführungszeichen für bessere Kompatibilität mit Unicode.
-        """
-        # Ersetze einfache Anführungszeichen durch doppelte einfache Anführungszeichen
-        escaped = text.replace("'", "''")
-        return f"'{escaped}'"
-
-    def write_script_to_file(self, script_content: List[str]) -> None:
-        """Schreibt Script-Inhalt in Datei"""
-        try:
-            with open(self.script_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(script_content))
-            
-            # Script ausführbar machen (nur bei Bash)
-            if not self.powershell:
-                import stat
-                self.script_path.chmod(self.script_path.stat().st_mode | stat.S_IEXEC)
-            
-            script_type = "PowerShell" if self.powershell else "Bash"
-            execution_cmd = f"powershell -ExecutionPolicy Bypass -File {self.script_path}" if self.powershell else f"bash {self.script_path}"
-            
-            print(f"\n🎯 {script_type}-Script erstellt: {self.script_path}")
-            print(f"   🔧 Ausführung mit: {execution_cmd}")
-            print(f"   ⚠️  Das Script verschiebt die Dateien tatsächlich!")
-            
-        except Exception as e:
-            print(f"❌ Fehler beim Erstellen des Shell-Scripts: {e}")
-    
-    def get_exif_datetime(self, filepath: Path) -> Optional[datetime]:
-        """Extrahiert Datum/Zeit aus EXIF-Daten"""
-        try:
-            if filepath.suffix.lower() in self.video_extensions:
-                return self.get_video_datetime(filepath)
-
-            # Explicitly convert Path to string to handle special characters properly
-            with Image.open(str(filepath)) as img:
-                exif = img._getexif()
-                if exif:
-                    for tag_id, value in exif.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        if tag in ['DateTime', 'DateTimeOriginal', 'DateTimeDigitized']:
-                            try:
-                                return datetime.strptime(value, '%Y:%m:%d %H:%M:%S')
-                            except ValueError:
-                                continue
-        except Exception as e:
-            print(f"EXIF-Fehler bei {filepath}: {e}")
-        return None
-    
-    def get_best_datetime(self, filepath: Path) -> datetime:
-        """Bestimmt den besten Zeitstempel in der Prioritätsreihenfolge: EXIF > Dateiname > Datei-Zeit"""
-        # 1. Priorität: EXIF-Daten
-        exif_datetime = self.get_exif_datetime(filepath)
-        if exif_datetime:
-            print(f"  ✅ EXIF-Datum: {exif_datetime}")
-            return exif_datetime
-        
-        # 2. Priorität: Dateiname
-        filename_datetime = self.get_datetime_from_filename(filepath)
-        if filename_datetime:
-            print(f"  📝 Dateiname-Datum: {filename_datetime}")
-            
-            # EXIF hinzufügen falls gewünscht und möglich
-            if self.add_exif:
-                self.add_exif_to_file(filepath, filename_datetime)
-            
-            return filename_datetime
-        
-        # 3. Priorität: Datei-Modifikationszeit
-        file_datetime = datetime.fromtimestamp(filepath.stat().st_mtime)
-        print(f"  📁 Datei-Zeit: {file_datetime}")
-        return file_datetime
-    
-    def get_video_datetime(self, filepath: Path) -> Optional[datetime]:
-        """Extrahiert Datum/Zeit aus Video-Metadaten mit ffprobe"""
-        if not FFPROBE_AVAILABLE:
-            return None
-
-        try:
-            cmd = [FFPROBE_PATH, '-v', 'quiet', '-print_format', 'json', '-show_format', str(filepath)]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                creation_time = data.get('format', {}).get('tags', {}).get('creation_time')
-                if creation_time:
-                    # Verschiedene Zeitformat-Varianten probieren
-                    formats = ['%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S']
-                    for fmt in formats:
-                        try:
-                            return datetime.strptime(creation_time, fmt)
-                        except ValueError:
-                            continue
-        except Exception as e:
-            print(f"Video-Metadaten-Fehler bei {filepath}: {e}")
-        return None
-    
-    def get_gps_coords(self, filepath: Path) -> Optional[Tuple[float, float]]:
-        """Extrahiert GPS-Koordinaten aus EXIF-Daten"""
-        try:
-            if filepath.suffix.lower() in self.video_extensions:
-                return None  # GPS aus Videos ist komplexer
-
-            # Explicitly convert Path to string to handle special characters properly
-            with Image.open(str(filepath)) as img:
-                exif = img._getexif()
-                if exif:
-                    gps_info = exif.get(34853)  # GPS IFD
-                    if gps_info:
-                        gps_data = {}
-                        for key, value in gps_info.items():
-                            decoded = GPSTAGS.get(key, key)
-                            gps_data[decoded] = value
-                        
-                        if 'GPSLatitude' in gps_data and 'GPSLongitude' in gps_data:
-                            lat = self.convert_gps_coord(gps_data['GPSLatitude'], gps_data.get('GPSLatitudeRef', 'N'))
-                            lon = self.convert_gps_coord(gps_data['GPSLongitude'], gps_data.get('GPSLongitudeRef', 'E'))
-                            return (lat, lon)
-        except Exception as e:
-            print(f"GPS-Fehler bei {filepath}: {e}")
-        return None
-    
-    def convert_gps_coord(self, coord_tuple, ref) -> float:
-        """Konvertiert GPS-Koordinaten von DMS zu Dezimalgrad"""
-        degrees, minutes, seconds = coord_tuple
-        decimal = float(degrees) + float(minutes)/60 + float(seconds)/3600
-        if ref in ['S', 'W']:
-            decimal = -decimal
-        return decimal
-    
-    def calculate_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        """Berechnet Entfernung zwischen zwei GPS-Koordinaten in km (Haversine-Formel)"""
-        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        r = 6371  # Erdradius in km
-        
-        return c * r
-    
-    def get_location_name(self, coords: Tuple[float, float]) -> Optional[str]:
-        """Konvertiert GPS-Koordinaten zu Ortsnamen via Reverse-Geocoding (Thread-sicher)"""
-        if not self.use_geocoding:
-            return None
-            
-        # Cache prüfen (gerundet auf ~100m Genauigkeit)
-        rounded_coords = (round(coords[0], 3), round(coords[1], 3))
-        
-        # Thread-sicherer Cache-Zugriff
-        with self.location_cache_lock:
-            if rounded_coords in self.location_cache:
-                return self.location_cache[rounded_coords]
-        
-        try:
-            # Nominatim (OpenStreetMap) API - kostenlos, aber mit Rate-Limiting
-            url = "https://nominatim.openstreetmap.org/reverse"
-            params = {
-                'lat': coords[0],
-                'lon': coords[1],
-                'format': 'json',
-                'addressdetails': 1,
-                'zoom': 10,  # Stadt-Level
-                'extratags': 1
-            }
-            headers = {
-                'User-Agent': 'PhotoOrganizer/1.0 (Python Script)'
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Rate-Limiting respektieren (thread-sicher)
-            time.sleep(1.1)  # Nominatim: max 1 request/second
-            
-            if 'address' in data:
-                address = data['address']
-                
-                # Priorisierte Ortsnamen (vom spezifischsten zum allgemeinsten)
-                location_candidates = [
-                    address.get('city'),
-                    address.get('town'),
-                    address.get('village'),
-                    address.get('municipality'),
-                    address.get('county'),
-                    address.get('state_district'),
-                    address.get('state')
-                ]
-                
-                # Ersten verfügbaren Ortsnamen nehmen
-                for location in location_candidates:
-                    if location:
-                        # Sonderzeichen für Dateinamen bereinigen
-                        clean_location = clean_location_name_util(location)
-
-                        # Thread-sicher in Cache speichern
-                        with self.location_cache_lock:
-                            self.location_cache[rounded_coords] = clean_location
-                        return clean_location
-            
-        except requests.RequestException as e:
-            print(f"Geocoding-Fehler für {coords}: {e}")
-        except Exception as e:
-            print(f"Unerwarteter Geocoding-Fehler für {coords}: {e}")
-        
-        # Fallback: Cache leeren Eintrag setzen (thread-sicher)
-        with self.location_cache_lock:
-            self.location_cache[rounded_coords] = None
-        return None
-    
-    
-    def save_cache(self) -> None:
-        """Speichert Photo-Daten in JSON-Cache"""
-        if not self.cache_file:
-            return
-            
-        cache_data = {
-            'metadata': {
-                'created': datetime.now().isoformat(),
-                'source_dir': str(self.source_dir),
-                'target_dir': str(self.target_dir),
-                'total_photos': len(self.photos),
-                'duplicates_count': len(self.duplicates),
-                'cached_count': len(self.cached)
-            },
-            'photos': [],
-            'duplicates': list(self.duplicates),
-            'cached': list(self.cached),  # Dateien bereits in der Sammlung
-            'location_cache': {}
-        }
-        
-        # Photo-Daten serialisieren
-        for photo in self.photos:
-            photo_data = {
-                'filepath': str(photo.filepath),
-                'datetime': photo.datetime.isoformat(),
-                'gps_coords': photo.gps_coords,
-                'location_name': photo.location_name,
-                'file_hash': photo.file_hash,
-                'file_size': photo.file_size,
-                'is_video': photo.is_video
-            }
-            cache_data['photos'].append(photo_data)
-        
-        # Location-Cache serialisieren
-        with self.location_cache_lock:
-            for coords, location in self.location_cache.items():
-                key = f"{coords[0]:.3f},{coords[1]:.3f}"
-                cache_data['location_cache'][key] = location
-        
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-            print(f"💾 Cache gespeichert: {self.cache_file}")
-        except Exception as e:
-            print(f"❌ Fehler beim Speichern des Caches: {e}")
-    
-    def load_cache(self) -> bool:
-        """Lädt Photo-Daten aus JSON-Cache"""
-        if not self.cache_file or not self.cache_file.exists():
-            if self.cache_file:
-                print(f"📂 Cache-Datei nicht gefunden: {self.cache_file}")
-            return False
-            
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            print(f"📂 Lade Cache: {self.cache_file}")
-            
-            # Metadata prüfen
-            metadata = cache_data.get('metadata', {})
-            cached_source = metadata.get('source_dir')
-            cached_target = metadata.get('target_dir')
-            
-            # Validiere Cache-Kompatibilität
-            if cached_source != str(self.source_dir):
-                print(f"⚠️  Cache-Warnung: Quellverzeichnis unterschiedlich")
-                print(f"   Cache: {cached_source}")
-                print(f"   Aktuell: {self.source_dir}")
-                print(f"   Cache wird trotzdem verwendet (nur bei identischen Inhalten sinnvoll)")
-            
-            # Zielverzeichnis wird nicht validiert (irrelevant für Cache)
-            
-            # Photo-Daten laden
-            self.photos = []
-            skipped_files = 0
-            for photo_data in cache_data.get('photos', []):
-                try:
-                    filepath = Path(photo_data['filepath'])
-
-                    # Skip files that no longer exist
-                    if not filepath.exists():
-                        skipped_files += 1
-                        continue
-
-                    gps_raw = photo_data.get('gps_coords')
-                    photo = PhotoInfo(
-                        filepath=filepath,
-                        datetime=datetime.fromisoformat(photo_data['datetime']),
-                        gps_coords=tuple(gps_raw) if gps_raw else None,
-                        location_name=photo_data.get('location_name'),
-                        file_hash=photo_data.get('file_hash', ''),
-                        file_size=photo_data.get('file_size', 0),
-                        is_video=photo_data.get('is_video', False)
-                    )
-                    self.photos.append(photo)
-                except Exception as e:
-                    print(f"⚠️  Fehler beim Laden von Photo-Daten: {e}")
-            
-            # Duplikate laden
-            self.duplicates = set(cache_data.get('duplicates', []))
-
-            # Cached-Einträge laden (Dateien bereits in der Sammlung)
-            self.cached = set(cache_data.get('cached', []))
-
-            # Location-Cache laden
-            location_cache_data = cache_data.get('location_cache', {})
-            with self.location_cache_lock:
-                self.location_cache = {}
-                for coord_str, location in location_cache_data.items():
-                    try:
-                        lat_str, lon_str = coord_str.split(',')
-                        coords = (float(lat_str), float(lon_str))
-                        self.location_cache[coords] = location
-                    except Exception as e:
-                        print(f"⚠️  Fehler beim Laden von GPS-Cache: {e}")
-            
-            cache_created = metadata.get('created', 'unbekannt')
-            print(f"✅ Cache geladen (erstellt: {cache_created}):")
-            print(f"  📸 {len(self.photos)} Fotos/Videos")
-            if skipped_files > 0:
-                print(f"  ⚠️  {skipped_files} Dateien aus Cache übersprungen (nicht mehr vorhanden)")
-            print(f"  🗑️  {len(self.duplicates)} Duplikate")
-            print(f"  🗺️  {len(self.location_cache)} Orte im GPS-Cache")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Fehler beim Laden des Caches: {e}")
-            return False
-    
-    def post_process_geocoding(self) -> None:
-        """Führt Geocoding als separaten, sequenziellen Schritt durch"""
-        if not self.use_geocoding:
-            return
-
-        # Lade aktuelle Geokoordinaten aus geo_coords.cfg nochmals
-        # (für den Fall, dass die Datei zwischen Läufen aktualisiert wurde)
-        print("🔄 Aktualisiere Geokoordinaten aus geo_coords.cfg...")
-        updated_cache = self.load_geo_cords()
-        with self.location_cache_lock:
-            # Merge: neue Einträge hinzufügen, bestehende behalten
-            for coords, location in updated_cache.items():
-                if coords not in self.location_cache:
-                    self.location_cache[coords] = location
-
-        # Sammle alle eindeutigen GPS-Koordinaten ohne Ortsname
-        coords_to_process = []
-        for photo in self.photos:
-            if photo.gps_coords and not photo.location_name:
-                rounded_coords = (round(photo.gps_coords[0], 3), round(photo.gps_coords[1], 3))
-                if rounded_coords not in coords_to_process:
-                    coords_to_process.append(rounded_coords)
-
-        if not coords_to_process:
-            print("🌍 Alle GPS-Koordinaten haben bereits Ortsnamen")
-            return
-
-        print(f"\n🌍 Starte sequenzielles Geocoding für {len(coords_to_process)} Orte...")
-
-        processed_count = 0
-        for coords in coords_to_process:
-            processed_count += 1
-            print(f"📍 Geocoding {processed_count}/{len(coords_to_process)}: {coords[0]:.3f}, {coords[1]:.3f}")
-
-            # Überspringe wenn bereits im Cache
-            with self.location_cache_lock:
-                if coords in self.location_cache:
-                    location = self.location_cache[coords]
-                    if location is None:
-                        print(f"   ❌ Bereits als nicht-verfügbar markiert")
-                    else:
-                        print(f"   ✅ Aus Cache: {location}")
-                    continue
-            
-            # Geocoding durchführen
-            location_name = self.get_location_name(coords)
-            if location_name:
-                print(f"   ✅ Gefunden: {location_name}")
-                
-                # Aktualisiere alle Fotos mit diesen Koordinaten
-                for photo in self.photos:
-                    if photo.gps_coords:
-                        photo_rounded = (round(photo.gps_coords[0], 3), round(photo.gps_coords[1], 3))
-                        if photo_rounded == coords:
-                            photo.location_name = location_name
-            else:
-                print(f"   ❌ Kein Ortsname gefunden")
-        
-        print(f"✅ Geocoding abgeschlossen")
-        
-        # Cache aktualisieren falls vorhanden
-        if self.cache_file:
-            self.save_cache()
-            self.save_geo_locations_to_config()
-    
-    def process_single_file(self, filepath: Path) -> Optional[PhotoInfo]:
-        """Verarbeitet eine einzelne Datei (für parallele Ausführung) - OHNE Geocoding"""
-        try:
-            # Hash für Duplikat-Erkennung
-            file_hash = get_file_hash(filepath)
-
-            # Prüfe ob bereits in permanenter Cache vorhanden (wenn aktiviert)
-            if self.compare_with_cache and file_hash in self.cached_hash_dict:
-                # Datei ist bereits in der Sammlung gespeichert
-                self.cached.add(str(filepath))
-                return None
-
-            # Thread-sicherer Hash-Cache-Zugriff
-            with self.hash_cache_lock:
-                if file_hash in self.hash_cache:
-                    # Duplikat gefunden (in dieser Verarbeitung)
-                    return None
-                self.hash_cache[file_hash] = str(filepath)
-
-            # Zeitstempel extrahieren (Priorität: EXIF > Dateiname > Datei-Zeit)
-            photo_datetime = self.get_best_datetime(filepath)
-
-            # GPS-Koordinaten extrahieren (OHNE API-Geocoding)
-            gps_coords = self.get_gps_coords(filepath)
-
-            # Prüfe ob GPS-Koordinate bereits in geo_coords.cfg vorhanden ist
-            location_name = None
-            if gps_coords:
-                rounded_coords = (round(gps_coords[0], 3), round(gps_coords[1], 3))
-                with self.location_cache_lock:
-                    if rounded_coords in self.location_cache:
-                        location_name = self.location_cache[rounded_coords]
-
-            return PhotoInfo(
-                filepath=filepath,
-                datetime=photo_datetime,
-                gps_coords=gps_coords,
-                location_name=location_name,  # Aus geo_coords.cfg oder None (wird später geocodiert)
-                file_hash=file_hash,
-                file_size=filepath.stat().st_size,
-                is_video=filepath.suffix.lower() in self.video_extensions
-            )
-
-        except Exception as e:
-            print(f"❌ Fehler bei der Verarbeitung von {filepath}: {e}")
-            return None
-    
-    def scan_photos(self) -> None:
-        """Scannt alle Fotos im Quellverzeichnis mit paralleler Verarbeitung"""
-        
-        # Versuche Cache zu laden
-        if self.cache_file and self.load_cache():
-            print("📂 Verwende Daten aus Cache")
-            return
-        
-        print(f"🔍 Scanne Fotos in: {self.source_dir}")
-        
-        # Sammle alle zu verarbeitenden Dateien
-        all_files = []
-        for filepath in self.source_dir.rglob('*'):
-            # Validate: is_file() checks during scan, exists() prevents race conditions
-            if filepath.is_file() and filepath.exists() and filepath.suffix.lower() in self.supported_extensions:
-                all_files.append(filepath)
-        
-        print(f"📁 Gefunden: {len(all_files)} Dateien zum Verarbeiten")
-        print(f"🚀 Starte parallele Verarbeitung mit {self.max_workers} Threads...")
-        print("⚠️  Geocoding wird später sequenziell durchgeführt")
-        
-        # Progress tracking
-        processed_count = 0
-        duplicates_count = 0
-        
-        # Parallele Verarbeitung mit ThreadPoolExecutor (OHNE Geocoding)
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Alle Tasks starten
-            future_to_filepath = {
-                executor.submit(self.process_single_file, filepath): filepath 
-                for filepath in all_files
-            }
-            
-            # Ergebnisse sammeln
-            for future in as_completed(future_to_filepath):
-                filepath = future_to_filepath[future]
-                processed_count += 1
-                
-                # Progress anzeigen (alle 100 Dateien)
-                if processed_count % 100 == 0 or processed_count == len(all_files):
-                    progress = (processed_count / len(all_files)) * 100
-                    print(f"📊 Progress: {processed_count}/{len(all_files)} ({progress:.1f}%)")
-                
-                try:
-                    photo_info = future.result()
-                    if photo_info is None:
-                        # Duplikat
-                        duplicates_count += 1
-                        self.duplicates.add(str(filepath))
-                    else:
-                        self.photos.append(photo_info)
-                        
-                except Exception as e:
-                    print(f"❌ Fehler bei {filepath}: {e}")
-        
-        print(f"\n✅ Parallel-Verarbeitung abgeschlossen:")
-        print(f"  📸 {len(self.photos)} Fotos/Videos erfolgreich verarbeitet")
-        print(f"  🗑️  {duplicates_count} Duplikate gefunden")
-        if self.compare_with_cache and self.cached:
-            print(f"  💾 {len(self.cached)} Dateien bereits in Sammlung (Cache)")
-        print(f"  🌍 {len([p for p in self.photos if p.gps_coords])} Fotos mit GPS-Daten")
-        
-        # EXIF-Statistiken anzeigen
-        if self.add_exif:
-            print(f"\n📋 EXIF-Hinzufügung:")
-            print(f"  ✅ {self.exif_added_count} EXIF-Daten hinzugefügt")
-            print(f"  ⏭️  {self.exif_skipped_count} bereits vorhanden")
-            print(f"  ❌ {self.exif_error_count} Fehler")
-        
-        # Cache speichern (vor Geocoding)
-        if self.cache_file:
-            self.save_cache()
-        
-        # Geocoding als separater sequenzieller Schritt
-        self.post_process_geocoding()
-        
-        # Cache erneut speichern (nach Geocoding)
-        if self.cache_file:
-            self.save_cache()
-        
-        print(f"  📍 {len([p for p in self.photos if p.location_name])} Fotos mit Ortsinformation")
-    
-    def group_photos_into_events(self) -> Dict[str, List[PhotoInfo]]:
-        """Gruppiert Fotos in Events basierend auf Zeit und Ort"""
-        if not self.photos:
-            return {}
-        
-        # Sortiere Fotos nach Datum
-        sorted_photos = sorted(self.photos, key=lambda p: p.datetime)
-        
-        events = {}
-        current_event_photos = []
-        current_event_start = None
-        
-        for photo in sorted_photos:
-            if not current_event_photos:
-                # Erstes Foto eines neuen Events
-                current_event_photos = [photo]
-                current_event_start = photo.datetime
-            else:
-                # Prüfe ob Foto zum aktuellen Event gehört
-                time_diff = photo.datetime - current_event_start
-                belongs_to_event = False
-                
-                # Zeitkriterium
-                if time_diff.days <= self.event_max_days:
-                    belongs_to_event = True
-                    
-                    # Zusätzliche GPS-Prüfung wenn verfügbar
-                    if photo.gps_coords:
-                        # Prüfe GPS-Nähe zu anderen Fotos im Event
-                        for event_photo in current_event_photos:
-                            if event_photo.gps_coords:
-                                distance = self.calculate_distance(photo.gps_coords, event_photo.gps_coords)
-                                if distance <= self.geo_radius_km:
-                                    belongs_to_event = True
-                                    break
-                        else:
-                            # Kein Foto im Event hat GPS oder alle sind zu weit weg
-                            if any(p.gps_coords for p in current_event_photos):
-                                belongs_to_event = False
-                
-                if belongs_to_event:
-                    current_event_photos.append(photo)
-                else:
-                    # Event abschließen wenn es groß genug ist
-                    self.event_name_from_number(events, current_event_photos)
-                    
-                    # Neues Event starten
-                    current_event_photos = [photo]
-                    current_event_start = photo.datetime
-        
-        # Letztes Event verarbeiten
-        if current_event_photos:
-            self.event_name_from_number(events, current_event_photos)
-        
-        return events
-
-    def event_name_from_number(self, events, current_event_photos):
-        if len(current_event_photos) == 1:
-            # Einzelnes Foto: direkt im Zielverzeichnis
-            event_name = self.create_event_name(current_event_photos)
-            year = event_name.split("/")[0]
-            events[year+"/einzeldateien"] = current_event_photos
-        else:
-            # Gruppe von Fotos: Event-Ordner klassisch benennen
-            event_name = self.create_event_name(current_event_photos) 
-            events[event_name] = current_event_photos
-    
-    def create_event_name(self, photos: List[PhotoInfo]) -> str:
-        """
-        Erstellt Event-Namen basierend auf Zeitraum und optional Ort.
-        Verwendet konfigurierbare Muster aus [foldernames_target].
-        """
-        start_date = min(p.datetime for p in photos)
-        end_date = max(p.datetime for p in photos)
-
-        # Bestimme dominanten Ort falls GPS-Daten vorhanden
-        location_name = self.get_dominant_location(photos)
-
-        # Formatiere die Daten
-        year = start_date.strftime('%Y')
-        start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
-
-        # Wähle das passende Muster aus der Konfiguration
-        if (end_date - start_date).days == 0:
-            # Eintägiges Event - nutze 'single_day' Muster
-            pattern = self.foldernames_config.get('single_day', '{year}/{start_date}')
-        else:
-            # Mehrtägiges Event - nutze 'multi_day' Muster
-            pattern = self.foldernames_config.get('multi_day', '{year}/{start_date}_bis_{end_date}')
-
-        # Ersetze Variablen im Muster
-        event_name = pattern.format(
-            year=year,
-            yyyy=year,  # Alias
-            start_date=start_date_str,
-            end_date=end_date_str,
-            location=location_name if location_name else ''
-        )
-
-        # Entferne trailing Bindestriche falls kein Ort vorhanden
-        if not location_name and event_name.endswith('-'):
-            event_name = event_name[:-1]
-
-        return event_name
-    
-    def get_dominant_location(self, photos: List[PhotoInfo]) -> Optional[str]:
-        """Bestimmt den dominanten Ort einer Foto-Gruppe"""
-        if not self.use_geocoding:
-            return None
-            
-        # Sammle alle Ortsnamen
-        locations = [p.location_name for p in photos if p.location_name]
-        
-        if not locations:
-            return None
-        
-        # Häufigster Ortsname
-        from collections import Counter
-        location_counts = Counter(locations)
-        most_common = location_counts.most_common(1)
-        
-        if most_common:
-            dominant_location, count = most_common[0]
-            # Nur verwenden wenn mindestens 30% der Fotos diesen Ort haben
-            if count >= max(1, len(photos) * 0.3):
-                return dominant_location
-        
-        return None
-    
-    def preview_organization(self) -> Dict[str, List[PhotoInfo]]:
-        """Zeigt Vorschau der geplanten Organisation"""
-        events = self.group_photos_into_events()
-        
-        print("\n=== VORSCHAU DER ORGANISATION ===")
-        
-        # Separate Zählung für Events und einzelne Dateien
-        event_count = len([k for k in events.keys() if k != "." and not k.endswith("/einzeldateien")])
-        single_files_count = sum(len(photos) for event_name, photos in events.items() 
-                                if event_name == "." or event_name.endswith("/einzeldateien"))
-        
-        print(f"Insgesamt {len(self.photos)} Fotos:")
-        if event_count > 0:
-            print(f"  📁 {event_count} Event-Ordner")
-        if single_files_count > 0:
-            print(f"  📄 {single_files_count} einzelne Dateien (in Jahresordnern)")
-        
-        for event_name, photos in events.items():
-            photo_count = len([p for p in photos if not p.is_video])
-            video_count = len([p for p in photos if p.is_video])
-            
-            start_date = min(p.datetime for p in photos)
-            end_date = max(p.datetime for p in photos)
-            
-            if event_name == "." or event_name.endswith("/einzeldateien"):
-                if "/" in event_name:
-                    year = event_name.split("/")[0]
-                    print(f"\n📄 Einzeldateien {year}/:")
-                else:
-                    print(f"\n📄 Einzeldateien:")
-                print(f"   📊 {photo_count} Fotos, {video_count} Videos")
-                print(f"   📅 Zeitraum: {start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')}")
-            else:
-                print(f"\n📁 {event_name}/")
-                print(f"   📊 {photo_count} Fotos, {video_count} Videos")
-                print(f"   📅 {start_date.strftime('%d.%m.%Y %H:%M')} - {end_date.strftime('%d.%m.%Y %H:%M')}")
-            
-            # GPS-Info falls verfügbar
-            gps_photos = [p for p in photos if p.gps_coords]
-            if gps_photos:
-                print(f"   🌍 {len(gps_photos)} Fotos mit GPS-Daten")
-                
-                # Zeige Ortsinformationen
-                locations = [p.location_name for p in photos if p.location_name]
-                if locations:
-                    from collections import Counter
-                    location_counts = Counter(locations)
-                    most_common_locations = location_counts.most_common(3)
-                    location_str = ", ".join([f"{loc} ({count})" for loc, count in most_common_locations])
-                    print(f"   📍 Orte: {location_str}")
-        
-        if self.duplicates:
-            print(f"\n🗑️  {len(self.duplicates)} Duplikate werden übersprungen")
-        
-        return events
-    
-    def organize_photos(self, dry_run: bool = True) -> None:
-        """Organisiert die Fotos in die Zielstruktur"""
-        events = self.group_photos_into_events()
-        
-        # Shell-Script generieren falls gewünscht (am Ende!)
-        if self.generate_script:
-            self.generate_shell_script(events)
-            if dry_run:
-                print(f"\n💡 Dry-Run abgeschlossen.")
-                return
-        
-        if dry_run:
-            print("\n=== DRY RUN - Keine Dateien werden verschoben ===")
-        else:
-            print("\n=== DATEIEN WERDEN VERSCHOBEN ===")
-            self.target_dir.mkdir(parents=True, exist_ok=True)
-        
-        moved_count = 0
-        error_count = 0
-        
-        for event_name, photos in events.items():
-            if event_name == ".":
-                # Einzelne Dateien direkt ins Zielverzeichnis
-                target_folder = self.target_dir
-                print(f"\n📄 Einzelne Dateien (Zielverzeichnis) - {len(photos)} Dateien")
-            else:
-                # Event-Ordner
-                target_folder = self.target_dir / event_name
-                if not dry_run:
-                    target_folder.mkdir(parents=True, exist_ok=True)
-                print(f"\n📁 {event_name}/ ({len(photos)} Dateien)")
-            
-            for photo in photos:
-                target_path = target_folder / photo.filepath.name
-                
-                # Handle Namenskonflikte
-                counter = 1
-                original_target = target_path
-                while target_path.exists() and not dry_run:
-                    stem = original_target.stem
-                    suffix = original_target.suffix
-                    target_path = target_folder / f"{stem}_{counter}{suffix}"
-                    counter += 1
-                
-                try:
-                    if dry_run:
-                        if event_name == "." or event_name.endswith("/einzeldateien"):
-                            folder_name = f"einzeldateien" if "/" not in event_name else event_name
-                            print(f"  würde verschieben: {photo.filepath.name} -> {folder_name}/{target_path.name}")
-                        else:
-                            print(f"  würde verschieben: {photo.filepath.name} -> {target_path}")
-                    else:
-                        shutil.move(str(photo.filepath), str(target_path))
-                        if event_name == "." or event_name.endswith("/einzeldateien"):
-                            folder_name = f"einzeldateien" if "/" not in event_name else event_name
-                            print(f"  ✅ {photo.filepath.name} -> {folder_name}/{target_path.name}")
-                        else:
-                            print(f"  ✅ {photo.filepath.name} -> {target_path.name}")
-                    moved_count += 1
-                except Exception as e:
-                    print(f"  ❌ Fehler bei {photo.filepath.name}: {e}")
-                    error_count += 1
-        
-        print(f"\n=== ZUSAMMENFASSUNG ===")
-        print(f"✅ {moved_count} Dateien {'würden verschoben werden' if dry_run else 'verschoben'}")
-        if error_count > 0:
-            print(f"❌ {error_count} Fehler")
-        if self.duplicates:
-            print(f"🗑️  {len(self.duplicates)} Duplikate übersprungen")
-
-    def _load_cache_hashes(self) -> Optional[Dict[str, str]]:
-        """
-        Lädt alle bekannten Hashes aus CSV- und JSON-Cache-Dateien.
-
-        Returns:
-            Dict hash -> filepath, oder None wenn kein Cache verfügbar.
-        """
-        import csv
-
-        print("🔍 Lade Cache-Hashes...")
-
-        project_cache = os.environ.get('PROJECT_CACHE')
-        if not project_cache:
-            print("⚠️  PROJECT_CACHE nicht gesetzt. Kein Cache verfügbar.")
-            return None
-
-        cache_dir = Path(project_cache)
-        if not cache_dir.exists():
-            print(f"⚠️  Cache-Verzeichnis nicht gefunden: {cache_dir}")
-            return None
-
-        cache_hash_map: Dict[str, str] = {}
-
-        for csv_file in sorted(cache_dir.glob('photo_cache_permanent_*.csv')):
-            print(f"  📄 Lade CSV: {csv_file.name}")
-            try:
-                with open(csv_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f, delimiter=';')
-                    count = 0
-                    for row in reader:
-                        file_hash = row.get('file_hash', '').strip()
-                        filepath = row.get('filepath', '').strip()
-                        if file_hash and filepath:
-                            cache_hash_map[file_hash] = filepath
-                            count += 1
-                print(f"     {count} Hashes geladen")
-            except Exception as e:
-                print(f"⚠️  Fehler beim Lesen von {csv_file.name}: {e}")
-
-        for json_file in sorted(cache_dir.glob('photo_cache_*.json')):
-            print(f"  📄 Lade JSON: {json_file.name}")
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                count = 0
-                for photo in cache_data.get('photos', []):
-                    file_hash = photo.get('file_hash', '').strip()
-                    filepath = photo.get('filepath', '').strip()
-                    if file_hash and filepath and file_hash not in cache_hash_map:
-                        cache_hash_map[file_hash] = filepath
-                        count += 1
-                print(f"     {count} neue Hashes geladen")
-            except Exception as e:
-                print(f"⚠️  Fehler beim Lesen von {json_file.name}: {e}")
-
-        if not cache_hash_map:
-            print("⚠️  Keine Hashes in Cache gefunden.")
-            return None
-
-        print(f"✅ {len(cache_hash_map)} Hashes aus Cache geladen")
-        return cache_hash_map
-
-    def _find_duplicates_in_source(self, cache_hash_map: Dict[str, str]) -> Tuple[List[Tuple[Path, str]], int, int]:
-        """
-        Scannt das Quellverzeichnis und findet Dateien, deren Hash im Cache bekannt ist.
-
-        Args:
-            cache_hash_map: Dict hash -> filepath aus dem Cache.
-
-        Returns:
-            (duplicates, unique_count, error_count)
-            duplicates: List of (source_path, cached_path)
-        """
-        print(f"\n🔍 Scanne Quelldateien in: {self.source_dir}")
-
-        all_files = [
-            f for f in self.source_dir.rglob('*')
-            if f.is_file() and f.suffix.lower() in self.supported_extensions
-        ]
-
-        print(f"📁 {len(all_files)} Dateien zum Prüfen gefunden")
-        print(f"🚀 Berechne Hashes mit {self.max_workers} Threads...")
-
-        duplicates_found = []
-        unique_count = 0
-        error_count = 0
-
-        def hash_and_check(filepath: Path):
-            file_hash = get_file_hash(filepath)
-            if not file_hash:
-                return filepath, None, None
-            cached_path = cache_hash_map.get(file_hash)
-            return filepath, cached_path, file_hash
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_file = {executor.submit(hash_and_check, f): f for f in all_files}
-            processed = 0
-            for future in as_completed(future_to_file):
-                processed += 1
-                if processed % 100 == 0 or processed == len(all_files):
-                    print(f"  📊 Progress: {processed}/{len(all_files)}")
-                try:
-                    filepath, cached_path, file_hash = future.result()
-                    if file_hash is None:
-                        error_count += 1
-                    elif cached_path:
-                        duplicates_found.append((filepath, cached_path))
-                    else:
-                        unique_count += 1
-                except Exception as e:
-                    print(f"❌ Fehler: {e}")
-                    error_count += 1
-
-        duplicates_found.sort(key=lambda x: str(x[0]))
-        return duplicates_found, unique_count, error_count
-
-    def _print_duplicates_report(self, duplicates: List[Tuple[Path, str]], total_files: int, unique_count: int, error_count: int) -> None:
-        """Gibt den Duplikat-Bericht auf der Konsole aus."""
-        print(f"\n{'='*70}")
-        print(f"DUPLIKAT-BERICHT")
-        print(f"{'='*70}")
-        print(f"Geprüfte Dateien: {total_files}")
-        print(f"Duplikate:        {len(duplicates)}")
-        print(f"Einzigartig:      {unique_count}")
-        if error_count:
-            print(f"Fehler:           {error_count}")
-
-        if duplicates:
-            print(f"\n{'='*70}")
-            print(f"DUPLIKATE IM QUELLVERZEICHNIS:")
-            print(f"{'='*70}")
-            for src_file, cached_path in duplicates:
-                try:
-                    rel_src = src_file.relative_to(self.source_dir)
-                except ValueError:
-                    rel_src = src_file
-                print(f"\n  QUELLE:  {rel_src}")
-                print(f"  BEREITS: {cached_path}")
-        else:
-            print("\n✅ Keine Duplikate gefunden.")
-
-    def show_duplicates_from_cache(self) -> None:
-        """Zeigt Duplikate im Quellverzeichnis verglichen mit Cache-Dateien."""
-        cache_hash_map = self._load_cache_hashes()
-        if cache_hash_map is None:
-            return
-
-        duplicates, unique_count, error_count = self._find_duplicates_in_source(cache_hash_map)
-        total = len(duplicates) + unique_count + error_count
-        self._print_duplicates_report(duplicates, total, unique_count, error_count)
-
-    def remove_duplicates_from_source(self) -> None:
-        """
-        Entfernt Duplikate aus dem Quellverzeichnis.
-        Dateien, deren Hash im Cache bekannt ist, werden gelöscht.
-        Gibt zuerst den Bericht aus, dann werden die Dateien entfernt.
-        """
-        cache_hash_map = self._load_cache_hashes()
-        if cache_hash_map is None:
-            return
-
-        duplicates, unique_count, error_count = self._find_duplicates_in_source(cache_hash_map)
-        total = len(duplicates) + unique_count + error_count
-        self._print_duplicates_report(duplicates, total, unique_count, error_count)
-
-        if not duplicates:
-            return
-
-        print(f"\n{'='*70}")
-        print(f"ENTFERNE {len(duplicates)} DUPLIKATE AUS QUELLVERZEICHNIS...")
-        print(f"{'='*70}")
-
-        removed = 0
-        remove_errors = 0
-        for src_file, cached_path in duplicates:
-            try:
-                src_file.unlink()
-                try:
-                    rel_src = src_file.relative_to(self.source_dir)
-                except ValueError:
-                    rel_src = src_file
-                print(f"  🗑️  Gelöscht: {rel_src}")
-                removed += 1
-            except Exception as e:
-                print(f"  ❌ Fehler beim Löschen von {src_file.name}: {e}")
-                remove_errors += 1
-
-        print(f"\n✅ {removed} Duplikate entfernt")
-        if remove_errors:
-            print(f"❌ {remove_errors} Fehler beim Löschen")
-
-
-def main():
-    """Hauptfunktion mit Beispiel-Verwendung"""
-    import argparse
-
-    # Get defaults from environment variables
-    default_source = os.environ.get('PROJECT_DATA', './data')
-    default_target = os.environ.get('PROJECT_WORK', './results')
-
-    examples = """
-EXAMPLES:
-
-  1. Dry-run: Vorschau der Organisation (keine Dateien werden verschoben):
-     python lib/photo_organizer.py
-
-  2. Mit benutzerdefinierten Verzeichnissen (Vorschau):
-     python lib/photo_organizer.py D:\\Fotos D:\\OrganisierteFotos
-
-  3. Dateien tatsächlich verschieben:
-     python lib/photo_organizer.py --execute
-
-  4. Mit benutzerdefinierten Verzeichnissen und Ausführung:
-     python lib/photo_organizer.py D:\\Fotos D:\\OrganisierteFotos --execute
-
-  5. Mit EXIF-Ergänzung aus Dateinamen:
-     python lib/photo_organizer.py --addexif --execute
-
-  6. Ohne Geocoding (schneller, wenn GPS-Daten nicht benötigt):
-     python lib/photo_organizer.py --no-geocoding --execute
-
-  7. Shell-Script generieren für spätere Ausführung:
-     python lib/photo_organizer.py --generate-script
-
-  8. PowerShell-Script statt Bash-Script:
-     python lib/photo_organizer.py --generate-script --powershell
-
-  9. Mit benutzerdefinierten Event-Einstellungen:
-     python lib/photo_organizer.py --event-max-days 5 --geo-radius 20.0 --execute
-
- 10. Mit allen Optimierungen:
-     python lib/photo_organizer.py --addexif --no-compare-with-cache --max-workers 8 --execute
-
- 11. Duplikate anzeigen (Quelldateien die schon im Cache vorhanden sind):
-     python lib/photo_organizer.py --show-duplicates
-
- 12. Duplikate aus Quellverzeichnis löschen:
-     python lib/photo_organizer.py --remove-duplicates
-
-TYPICAL WORKFLOW:
-
-  Step 1: Analysiere Fotos und erhalte Empfehlungen
-    python lib/analyze_photos.py --quick
-    python lib/analyze_photos.py
-
-    Output: Empfehlungen für Flags (--no-geocoding, --addexif, etc.)
-
-  Step 2: Vorschau der Organisation (kein --execute)
-    python lib/photo_organizer.py
-
-    Output: Zeigt geplante Ordnerstruktur ohne Dateien zu verschieben
-
-  Step 3: Führe mit empfohlenen Flags aus
-    python lib/photo_organizer.py --no-geocoding --addexif --execute
-
-  Step 4: Cache und Dateitypen aktualisieren (optional)
-    python lib/cache.py --to-permanent
-    python lib/cache.py --folder D:\\OrganisierteFotos
-
-  Step 5: Duplikate im Quellverzeichnis prüfen und entfernen
-    python lib/photo_organizer.py --show-duplicates
-    python lib/photo_organizer.py --remove-duplicates
-
-OPTIMIZATION:
-
-  Schnelle Verarbeitung:
-    python lib/photo_organizer.py --no-geocoding --max-workers 8 --execute
-
-  Detaillierte Metadaten:
-    python lib/photo_organizer.py --addexif --execute
-
-  Script-Generierung für Batch-Verarbeitung:
-    python lib/photo_organizer.py --generate-script --powershell
-    powershell -ExecutionPolicy Bypass -File scripts\\photo_move_*.ps1
-
-FEATURES:
-
-  --execute:                  Dateien tatsächlich verschieben (sonst Vorschau)
-  --addexif:                  EXIF-Daten aus Dateinamen hinzufügen
-  --no-geocoding:             Ortsnamen-Geocoding deaktivieren (schneller)
-  --generate-script:          Shell/PowerShell-Script für spätere Ausführung
-  --powershell:               PowerShell-Script (.ps1) statt Bash (.sh)
-  --event-max-days:           Maximale Tage für Event-Zusammenfassung
-  --geo-radius:               GPS-Radius in km für räumliche Gruppierung
-  --same-day-hours:           Stunden-Schwelle für "gleicher Tag"
-  --max-workers:              Parallele Threads (default: auto)
-  --cache:                    JSON-Cache-Datei (default: auto)
-  --compare-with-cache:       Duplikate mit permanenter CSV prüfen (default: ja)
-  --show-duplicates:          Zeigt Quelldateien die bereits im Cache bekannt sind (kein Löschen)
-  --remove-duplicates:        Löscht Quelldateien die bereits im Cache bekannt sind
-
-COMMON OPTIONS:
-
-  Schnell (keine GPS/Geocoding):
-    --no-geocoding
-
-  Detailliert (mit Dateimetadaten):
-    --addexif
-
-  Für große Foto-Sammlungen:
-    --max-workers 16 --no-geocoding --execute
-
-  Mit Script-Generierung:
-    --generate-script --powershell
-"""
-
-    parser = argparse.ArgumentParser(
-        description='Automatische Foto-Organisation basierend auf Datum, GPS und Dateinamen',
-        epilog=examples,
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    parser.add_argument('source', nargs='?', default=default_source, help=f'Quellverzeichnis mit Fotos (default: {default_source})')
-    parser.add_argument('target', nargs='?', default=default_target, help=f'Zielverzeichnis für organisierte Fotos (default: {default_target})')
-    parser.add_argument('--execute', action='store_true', help='Dateien tatsächlich verschieben (ohne --execute nur Vorschau)')
-    parser.add_argument('--same-day-hours', type=int, default=12, help='Stunden für gleichen Tag (default: 12)')
-    parser.add_argument('--event-max-days', type=int, default=3, help='Max. Tage für Event (default: 3)')
-    parser.add_argument('--geo-radius', type=float, default=10.0, help='GPS-Radius in km (default: 10.0)')
-    parser.add_argument('--min-event-photos', type=int, default=10, help='Min. Fotos für Event (default: 10)')
-    parser.add_argument('--no-geocoding', action='store_true', help='Deaktiviert Reverse-Geocoding für Ortsnamen')
-    parser.add_argument('--max-workers', type=int, default=None, help='Anzahl paralleler Threads (default: auto)')
-    parser.add_argument('--generate-script', action='store_true', help='Erzeugt Shell-Script für spätere Ausführung')
-    parser.add_argument('--script-path', default=None, help='Pfad für Shell-Script (default: auto mit PROJECT_SCRIPTS)')
-    parser.add_argument('--cache', help='JSON-Cache-Datei für Photo-Daten (default: auto mit PROJECT_CACHE)')
-    parser.add_argument('--addexif', action='store_true', help='Fügt EXIF-Daten basierend auf Dateinamen zu Originaldateien hinzu')
-    parser.add_argument('--powershell', action='store_true', help='Erzeugt PowerShell-Script (.ps1) statt Bash-Script (.sh)')
-    parser.add_argument('--compare-with-cache', action='store_true', default=True, help='Vergleicht mit permanenter CSV (default: True)')
-    parser.add_argument('--no-compare-with-cache', action='store_false', dest='compare_with_cache', help='Deaktiviert Vergleich mit permanenter Cache')
-    parser.add_argument('--show-duplicates', action='store_true', help='Zeigt Duplikate im Quellverzeichnis verglichen mit JSON/CSV-Cache-Dateien')
-    parser.add_argument('--remove-duplicates', action='store_true', help='Entfernt Duplikate aus dem Quellverzeichnis (Dateien, die bereits im Cache bekannt sind)')
-
-    args = parser.parse_args()
-
-    organizer = PhotoOrganizer(
-        source_dir=args.source,
-        target_dir=args.target,
-        same_day_hours=args.same_day_hours,
-        event_max_days=args.event_max_days,
-        geo_radius_km=args.geo_radius,
-        use_geocoding=not args.no_geocoding,
-        max_workers=args.max_workers,
-        generate_script=args.generate_script,
-        script_path=args.script_path,
-        cache_file=args.cache,
-        add_exif=args.addexif,
-        powershell=args.powershell,
-        compare_with_cache=args.compare_with_cache
-    )
-
-    if args.show_duplicates:
-        organizer.show_duplicates_from_cache()
-        return
-
-    if args.remove_duplicates:
-        organizer.remove_duplicates_from_source()
-        return
-
-    # Fotos scannen
-    organizer.scan_photos()
-    
-    if not organizer.photos:
-        print("Keine Fotos gefunden!")
-        return
-    
-    # Vorschau anzeigen
-    organizer.preview_organization()
-    
-    # Organisation durchführen
-    organizer.organize_photos(dry_run=not args.execute)
-    
-    if not args.execute and not args.generate_script:
-        print("\n💡 Verwende --execute um die Dateien tatsächlich zu verschieben")
-        print("💡 Verwende --generate-script um ein Shell-Script zu erstellen")
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Automatische Foto-Organisation basierend auf Zeitstempel und GPS-Daten
+Organisiert Fotos in Ordnerstrukturen: YYYY/MM-DD/ oder YYYY/Event_YYYY-MM-DD_bis_YYYY-MM-DD/
+"""
+
+import os
+import io
+import sys
+import shutil
+import json
+import re
+import mmap
+import sqlite3
+import configparser
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Set, Union
+from dataclasses import dataclass
+from collections import defaultdict, Counter
+import math
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Import utilities
+from utils import (
+    normalize_path, validate_file, ensure_directory_exists,
+    clean_filename, clean_location_name as clean_location_name_util,
+    get_file_hash, get_bytes_hash, get_quick_fingerprint,
+    escape_bash_path, escape_powershell_path,
+    get_timestamp as get_timestamp_util, get_most_common_items,
+    write_json_file, read_json_file, write_text_file,
+    is_video_file
+)
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    print("PIL/Pillow nicht installiert. Installiere mit: pip install Pillow")
+    PILLOW_AVAILABLE = False
+
+try:
+    import exifread
+    EXIFREAD_AVAILABLE = True
+except ImportError:
+    # Optionale Beschleunigung: exifread liest nur das APP1-Segment
+    EXIFREAD_AVAILABLE = False
+
+try:
+    import piexif
+    PIEXIF_AVAILABLE = True
+except ImportError:
+    # Optionale Beschleunigung: EXIF-Schreiben ohne JPEG-Neukodierung
+    PIEXIF_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    # Optionale Beschleunigung: vektorisierte Distanzberechnung
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    # Optionale Beschleunigung: KD-Baum für die GPS-Prüfung großer Events
+    SCIPY_AVAILABLE = False
+
+try:
+    import subprocess
+    from static_ffmpeg import run
+    # Get paths to bundled ffmpeg/ffprobe binaries
+    ffmpeg_path, ffprobe_path = run.get_or_fetch_platform_executables_else_raise()
+    FFPROBE_AVAILABLE = True
+    FFPROBE_PATH = ffprobe_path
+except ImportError:
+    FFPROBE_AVAILABLE = False
+    FFPROBE_PATH = 'ffprobe'  # Fallback to system ffprobe
+    print("Warnung: static-ffmpeg nicht verfügbar. Versuche System-ffprobe zu verwenden.")
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    # Optionale Beschleunigung: binärer Photo-Cache statt JSON
+    MSGPACK_AVAILABLE = False
+
+try:
+    import reverse_geocoder
+    REVERSE_GEOCODER_AVAILABLE = True
+except ImportError:
+    # Optionale Beschleunigung: Offline-Geocoding (GeoNames-KD-Baum)
+    # statt einer Nominatim-Anfrage pro Koordinate
+    REVERSE_GEOCODER_AVAILABLE = False
+
+try:
+    import requests
+    import time
+    GEOCODING_AVAILABLE = True
+except ImportError:
+    GEOCODING_AVAILABLE = False
+    print("Warnung: requests nicht verfügbar. Installiere mit: pip install requests")
+
+# Optionaler exiftool-Daemon: ein Prozess im -stay_open-Modus statt eines
+# Subprozess-Starts pro Videodatei (der Prozessstart dominiert sonst die Laufzeit)
+EXIFTOOL_PATH = shutil.which('exiftool')
+EXIFTOOL_AVAILABLE = EXIFTOOL_PATH is not None
+
+
+class _ExiftoolDaemon:
+    """Langlebiger exiftool-Prozess im -stay_open-Modus (Thread-sicher)"""
+
+    def __init__(self):
+        self.process = None
+        self.lock = threading.Lock()
+
+    def _start(self) -> None:
+        self.process = subprocess.Popen(
+            [EXIFTOOL_PATH, '-stay_open', 'True', '-@', '-'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True
+        )
+
+    def get_metadata(self, filepath: Path) -> Optional[dict]:
+        """Liest Metadaten einer Datei als Dict (None bei Fehler)"""
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self._start()
+            try:
+                self.process.stdin.write(
+                    f"-j\n-fast\n-d\n%Y-%m-%d %H:%M:%S\n{filepath}\n-execute\n"
+                )
+                self.process.stdin.flush()
+                output_lines = []
+                for line in self.process.stdout:
+                    if line.strip() == '{ready}':
+                        break
+                    output_lines.append(line)
+                data = json.loads(''.join(output_lines))
+                return data[0] if data else None
+            except (OSError, ValueError, IndexError) as e:
+                print(f"exiftool-Fehler bei {filepath}: {e}")
+                return None
+
+    def close(self) -> None:
+        """Beendet den exiftool-Prozess sauber"""
+        with self.lock:
+            if self.process is not None and self.process.poll() is None:
+                try:
+                    self.process.stdin.write('-stay_open\nFalse\n')
+                    self.process.stdin.flush()
+                    self.process.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    self.process.kill()
+            self.process = None
+
+
+# Sentinel: unterscheidet "EXIF noch nicht gelesen" von "kein EXIF vorhanden"
+_EXIF_UNREAD = object()
+
+# Ab dieser Event-Größe lohnt sich der KD-Baum gegenüber der linearen Prüfung
+_KDTREE_MIN_POINTS = 64
+
+# Unterhalb dieser Event-Größe ist die skalare Schleife schneller als der
+# NumPy-Pfad (ufunc-Dispatch und temporäre Arrays kosten mehr als das Rechnen)
+_VECTOR_MIN_POINTS = 16
+
+# Max. Dateien pro gebatchtem Move-Kommando in generierten Scripts
+# (bleibt deutlich unter ARG_MAX, hält die Zeilen handhabbar)
+_MOVE_BATCH_SIZE = 1000
+
+# Bis zu dieser Plan-Größe werden Moves seriell ausgeführt: der Aufbau
+# des Thread-Pools kostet mehr als die wenigen rename-Syscalls selbst
+_SERIAL_MOVE_MAX = 8
+
+# Erdradius in km
+_EARTH_RADIUS_KM = 6371
+
+# Statische Script-Bausteine: einmal als Konstante statt Dutzender
+# einzelner yield/f-String-Zeilen pro Generator-Lauf
+_BASH_PRELUDE = r"""
+set -e  # Stoppe bei Fehlern
+set -u  # Stoppe bei undefinierten Variablen
+
+# Farben für Output
+GREEN="\033[0;32m"
+RED="\033[0;31m"
+BLUE="\033[0;34m"
+YELLOW="\033[0;33m"
+NC="\033[0m"  # No Color
+
+# Statistiken
+moved_count=0
+error_count=0
+
+# Funktion zum Verschieben einer einzelnen Datei
+move_file() {
+    local source_file="$1"
+    local target_path="$2"
+
+    if [[ -f "$source_file" ]]; then
+        if mv "$source_file" "$target_path"; then
+            echo -e "  ${GREEN}✅ $(basename "$source_file")${NC}"
+            moved_count=$((moved_count + 1))
+        else
+            echo -e "  ${RED}❌ Fehler: $(basename "$source_file")${NC}"
+            error_count=$((error_count + 1))
+        fi
+    else
+        echo -e "  ${RED}❌ Nicht gefunden: $(basename "$source_file")${NC}"
+        error_count=$((error_count + 1))
+    fi
+}
+
+# Funktion zum Verschieben mehrerer Dateien in einen Zielordner
+move_batch() {
+    local target_dir="$1"
+    shift
+    if mv -t "$target_dir" -- "$@"; then
+        moved_count=$((moved_count + $#))
+        echo -e "  ${GREEN}✅ $# Dateien -> $target_dir${NC}"
+    else
+        # Fallback: einzeln verschieben, um Fehler zuzuordnen.
+        # Dateien, die der Batch-mv schon verschoben hat (Quelle weg,
+        # Ziel da), zählen als Erfolg und nicht als "Nicht gefunden"
+        for source_file in "$@"; do
+            if [[ ! -f "$source_file" && -f "$target_dir/$(basename "$source_file")" ]]; then
+                echo -e "  ${GREEN}✅ $(basename "$source_file")${NC}"
+                moved_count=$((moved_count + 1))
+            else
+                move_file "$source_file" "$target_dir"
+            fi
+        done
+    fi
+}
+
+echo -e "${BLUE}🚀 Starte Foto-Organisation...${NC}"
+echo
+"""
+
+_BASH_FOOTER = """
+# Zusammenfassung
+echo
+echo -e "${BLUE}=== ZUSAMMENFASSUNG ===${NC}"
+echo -e "${GREEN}✅ $moved_count Dateien erfolgreich verschoben${NC}"
+if [[ $error_count -gt 0 ]]; then
+    echo -e "${RED}❌ $error_count Fehler aufgetreten${NC}"
+    exit 1
+else
+    echo -e "${GREEN}🎉 Alle Dateien erfolgreich organisiert!${NC}"
+fi"""
+
+_POWERSHELL_PRELUDE = """
+# Fehlerbehandlung
+$ErrorActionPreference = 'Stop'
+
+# Statistiken
+$movedCount = 0
+$errorCount = 0
+
+# Funktion zum Verschieben einer einzelnen Datei
+function Move-PhotoFile {
+    param(
+        [string]$SourceFile,
+        [string]$TargetPath
+    )
+
+    if (Test-Path $SourceFile) {
+        try {
+            Move-Item -Path $SourceFile -Destination $TargetPath -Force
+            Write-Host "   $(Split-Path $SourceFile -Leaf)" -ForegroundColor Green
+            $script:movedCount++
+        }
+        catch {
+            Write-Host "[NOT OK] Fehler: $(Split-Path $SourceFile -Leaf)" -ForegroundColor Red
+            $script:errorCount++
+        }
+    }
+    else {
+        Write-Host "[NOT OK] Nicht gefunden: $(Split-Path $SourceFile -Leaf)" -ForegroundColor Red
+        $script:errorCount++
+    }
+}
+
+# Funktion zum Verschieben mehrerer Dateien in einen Zielordner
+function Move-PhotoBatch {
+    param(
+        [string[]]$Sources,
+        [string]$TargetDir
+    )
+
+    try {
+        Move-Item -Path $Sources -Destination $TargetDir -Force
+        $script:movedCount += $Sources.Count
+        Write-Host "   $($Sources.Count) Dateien -> $TargetDir" -ForegroundColor Green
+    }
+    catch {
+        # Fallback: einzeln verschieben, um Fehler zuzuordnen.
+        # Dateien, die der Batch-Move schon verschoben hat (Quelle weg,
+        # Ziel da), zählen als Erfolg und nicht als "Nicht gefunden"
+        foreach ($sourceFile in $Sources) {
+            $leaf = Split-Path $sourceFile -Leaf
+            if (-not (Test-Path $sourceFile) -and (Test-Path (Join-Path $TargetDir $leaf))) {
+                Write-Host "   $leaf" -ForegroundColor Green
+                $script:movedCount++
+            }
+            else {
+                Move-PhotoFile $sourceFile $TargetDir
+            }
+        }
+    }
+}
+
+Write-Host "Starte Foto-Organisation..." -ForegroundColor Blue
+Write-Host ""
+"""
+
+_POWERSHELL_FOOTER = """
+# Zusammenfassung
+Write-Host ""
+Write-Host "=== ZUSAMMENFASSUNG ===" -ForegroundColor Blue
+Write-Host "$movedCount Dateien erfolgreich verschoben" -ForegroundColor Green
+if ($errorCount -gt 0) {
+    Write-Host "$errorCount Fehler aufgetreten" -ForegroundColor Red
+    exit 1
+}
+else {
+    Write-Host "Alle Dateien erfolgreich organisiert!" -ForegroundColor Green
+}"""
+
+
+def _ecef(coords: Tuple[float, float]) -> Tuple[float, float, float]:
+    """Projiziert (lat, lon) auf kartesische Koordinaten in km (Kugelmodell)"""
+    lat = math.radians(coords[0])
+    lon = math.radians(coords[1])
+    cos_lat = math.cos(lat)
+    return (_EARTH_RADIUS_KM * cos_lat * math.cos(lon),
+            _EARTH_RADIUS_KM * cos_lat * math.sin(lon),
+            _EARTH_RADIUS_KM * math.sin(lat))
+
+
+@functools.lru_cache(maxsize=4096)
+def _escape_path_cached(path_str: str, powershell: bool) -> str:
+    """Escapet einen Pfad für Bash bzw. PowerShell, mit Cache.
+
+    Nur für Zielordner-Pfade gedacht: die wiederholen sich pro Event
+    hundertfach im Script. Pro-Datei-Quellpfade kommen genau einmal vor
+    und werden direkt escapet, damit der Cache nicht auf O(Dateien) wächst.
+    """
+    if powershell:
+        return escape_powershell_path(path_str)
+    return escape_bash_path(path_str)
+
+
+@dataclass
+class PhotoInfo:
+    """Informationen über ein Foto/Video"""
+    filepath: Path
+    datetime: datetime
+    gps_coords: Optional[Tuple[float, float]] = None  # (lat, lon)
+    location_name: Optional[str] = None  # Ortsname aus GPS
+    file_hash: str = ""
+    file_size: int = 0
+    is_video: bool = False
+    # Einmal geparste Pfad-Bestandteile (Path.name/.stem/.suffix parsen
+    # den String bei jedem Zugriff neu — in den Script-Loops zu teuer)
+    name: str = ""
+    stem: str = ""
+    suffix_lower: str = ""
+
+    def __post_init__(self):
+        if not self.name:
+            self.name = self.filepath.name
+            self.stem, dot, ext = self.name.rpartition('.')
+            if not dot or not self.stem:
+                # keine Endung bzw. versteckte Datei (".foo")
+                self.stem, ext = self.name, ""
+            self.suffix_lower = ('.' + ext).lower() if ext else ""
+
+
+@dataclass(frozen=True)
+class EventMeta:
+    """Vorberechnete Eigenschaften eines Events.
+
+    Einmal bei der Gruppierung bestimmt, damit Vorschau-, Script- und
+    Move-Schleifen nicht pro Event den Namen per endswith/split scannen.
+    """
+    is_singles: bool                # Einzeldateien-Sammelordner?
+    year: Optional[str]             # Jahr bei "JJJJ/einzeldateien", sonst None
+    target_folder: Path             # fertiger Zielordner unter target_dir
+
+
+class PhotoOrganizer:
+    def __init__(self, 
+                 source_dir: Union[str, Path],
+                 target_dir: Union[str, Path],
+                 same_day_hours: int = 12,
+                 event_max_days: int = 3,
+                 geo_radius_km: float = 10.0,
+                 use_geocoding: bool = True,
+                 max_workers: int = None,
+                 generate_script: bool = False,
+                 script_path: Union[str, Path, None] = None,
+                 cache_file: Union[str, Path, None] = None,
+                 add_exif: bool = False,
+                 powershell: bool = False,
+                 compare_with_cache: bool = True,
+                 verbose: bool = False,
+                 nominatim_url: Optional[str] = None):
+        """
+        Initialisiert den Photo Organizer
+
+        Args:
+            source_dir: Quellverzeichnis mit Fotos
+            target_dir: Zielverzeichnis für organisierte Fotos
+            same_day_hours: Stunden-Schwelle für gleichen Tag
+            event_max_days: Maximale Tage für Event-Zusammengehörigkeit
+            geo_radius_km: GPS-Radius in km für Event-Zugehörigkeit
+            use_geocoding: Aktiviert Reverse-Geocoding für Ortsnamen
+            max_workers: Anzahl paralleler Threads (None = auto)
+            generate_script: Erzeugt Shell-Script für spätere Ausführung
+            script_path: Pfad für das Shell-Script (None = auto mit PROJECT_SCRIPTS)
+            cache_file: JSON-Cache-Datei für Photo-Daten und Geocoding (None = auto mit PROJECT_CACHE)
+            add_exif: Fügt EXIF-Daten basierend auf Dateinamen hinzu
+            powershell: Erzeugt PowerShell-Script (.ps1) statt Bash-Script (.sh)
+            compare_with_cache: Vergleicht mit permanenter CSV (default: True)
+            verbose: Gibt Details pro Datei aus (bremst große Läufe)
+            nominatim_url: Eigene Nominatim-Instanz für Reverse-Geocoding
+                (None = öffentliche API mit 1 req/s Rate-Limit)
+        """
+        self.source_dir = Path(source_dir).resolve()
+        self.target_dir = Path(target_dir).resolve()
+        self.same_day_hours = same_day_hours
+        self.event_max_days = event_max_days
+        self.geo_radius_km = geo_radius_km
+        self.use_geocoding = use_geocoding and GEOCODING_AVAILABLE
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.generate_script = generate_script
+        self.verbose = verbose
+        self.add_exif = add_exif and PILLOW_AVAILABLE
+        self.powershell = powershell
+        
+        if add_exif and not PILLOW_AVAILABLE:
+            print("⚠️  --addexif erfordert PIL/Pillow. Feature deaktiviert.")
+        
+        # Auto-generiere Script-Pfad falls nicht angegeben
+        if script_path is None:
+            script_path = self.generate_script_path()
+        self.script_path = Path(script_path)
+        
+        # Auto-generiere Cache-Dateinamen falls nicht angegeben
+        if cache_file is None:
+            cache_file = self.generate_cache_filename()
+        self.cache_file = Path(cache_file) if cache_file else None
+        
+        self.supported_extensions = frozenset({'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.mov', '.mp4', '.avi', '.vid'})
+        self.video_extensions = frozenset({'.mov', '.mp4', '.avi', '.vid'})
+        self.exif_writable_extensions = frozenset({'.jpg', '.jpeg', '.tiff', '.tif'})  # Formate die EXIF unterstützen
+        
+        self.photos: List[PhotoInfo] = []
+        self.duplicates: Set[str] = set()
+        self.cached: Set[str] = set()  # Dateien die bereits in der Sammlung sind
+        # Fehler aus dem Move-Loop, gesammelt für die Zusammenfassung
+        self.errors: List[Tuple[Path, BaseException]] = []
+
+        # Memoisierte Event-Gruppierung: Vorschau und Script-Generierung
+        # nutzen dasselbe Ergebnis, solange sich die Fotos nicht ändern.
+        # _photos_version wird bei jeder Änderung an self.photos erhöht.
+        self._photos_version = 0
+        self._events_cache: Optional[Dict[str, List[PhotoInfo]]] = None
+        self._events_cache_version = -1
+        # Pro Event-Name vorberechnete Metadaten (siehe EventMeta)
+        self.event_meta: Dict[str, EventMeta] = {}
+
+        # Thread-sichere Caches. location_cache braucht kein Lock: während
+        # des parallelen Scans wird er nur gelesen, geschrieben wird er
+        # ausschließlich in den sequenziellen Phasen (Init, Cache-Load,
+        # Geocoding), und einzelne Dict-Zugriffe sind unter dem GIL atomar.
+        self.location_cache: Dict[Tuple[float, float], str] = {}
+        # hash_cache braucht ebenfalls kein Lock: Einträge werden per
+        # setdefault gesetzt (atomar unter dem GIL, first-writer-wins)
+        self.hash_cache: Dict[str, str] = {}
+        self.fingerprint_cache: Dict[str, str] = {}  # fingerprint -> filepath
+        self.fingerprint_cache_lock = threading.Lock()
+        self.size_cache: Dict[int, str] = {}  # file_size -> erste Datei dieser Größe
+        # Pfad -> Event, gesetzt sobald der Fingerprint der Datei im
+        # fingerprint_cache veröffentlicht ist; spätere Größen-Kollisionen
+        # warten darauf statt einen leeren Cache als "einzigartig" zu lesen
+        self.fingerprint_ready: Dict[str, threading.Event] = {}
+
+        # Nominatim-Rate-Limit: Zeitpunkt der nächsten erlaubten Anfrage.
+        # Bei eigener Instanz (nominatim_url) entfällt das Rate-Limit.
+        self.nominatim_url = nominatim_url
+        self.rate_limit_lock = threading.Lock()
+        self.next_request_time = 0.0
+
+        # Eine Session für alle Nominatim-Anfragen: TLS-Handshake nur
+        # einmal (Keep-Alive) plus Retry mit Backoff bei 429/5xx
+        self.http_session = None
+        if GEOCODING_AVAILABLE:
+            self.http_session = requests.Session()
+            self.http_session.headers.update({
+                'User-Agent': 'PhotoOrganizer/1.0 (Python Script)'
+            })
+            try:
+                from requests.adapters import HTTPAdapter, Retry
+                retry = Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=[429, 502, 503, 504])
+                self.http_session.mount('https://', HTTPAdapter(max_retries=retry))
+                self.http_session.mount('http://', HTTPAdapter(max_retries=retry))
+            except ImportError:
+                pass  # Ältere requests-Version ohne Retry: Session reicht
+
+        # KD-Baum über die GPS-Koordinaten des aktuellen Events (scipy)
+        self.event_kdtree = None
+        self.event_kdtree_size = 0
+
+        # Inkrementell gepflegte NumPy-Puffer (Radianten + cos(lat)) der
+        # Event-Koordinaten: Trigonometrie nur einmal pro Koordinate statt
+        # bei jeder Zugehörigkeits-Prüfung
+        self._event_lat_rad = None
+        self._event_lon_rad = None
+        self._event_cos_lat = None
+        self._event_coords_synced = 0
+
+        # Permanenter Cache aus CSV für Duplikat-Erkennung
+        self.compare_with_cache = compare_with_cache
+        self.cached_hash_dict: Dict[str, str] = {}  # hash -> filepath aus permanenter CSV
+        if compare_with_cache:
+            self.load_permanent_cache()
+        
+        # Ein exiftool-Prozess für alle Video-Metadaten (Fallback: ffprobe)
+        self._exiftool_daemon = _ExiftoolDaemon() if EXIFTOOL_AVAILABLE else None
+
+        # Shell-Script Sammlung
+        self.move_commands: List[Tuple[Path, Path]] = []  # (source, target)
+        
+        # Persistenter Geocoding-Cache: spart Nominatim-Anfragen über Läufe hinweg
+        self.geocache_db = self.open_geocache_db()
+
+        # Persistentes Hash-Manifest: unveränderte Dateien nicht erneut hashen
+        self.hash_manifest_db = self.open_hash_manifest_db()
+        self.hash_manifest_lock = threading.Lock()
+
+        # Lade Dateinamen-Pattern aus Konfiguration
+        self.filename_patterns = self.load_filename_patterns()
+        # Alternation über alle Pattern: ein search-Aufruf als Schnell-Filter
+        self.combined_pattern = self.build_combined_pattern(self.filename_patterns)
+        # Pro Verzeichnis: Index des zuletzt erfolgreichen Patterns
+        # (Dateien eines Ordners stammen meist von derselben Kamera)
+        self.pattern_hint: Dict[str, int] = {}
+        # Lade default Geokoordinaten aus Konfiguration
+        self.location_cache = self.load_geo_cords()
+        # Lade Zielordner-Benennungsmuster aus Konfiguration
+        self.foldernames_config = self.load_foldernames_config()
+        
+        # EXIF-Statistiken
+        self.exif_added_count = 0
+        self.exif_skipped_count = 0
+        self.exif_error_count = 0
+        
+        print(f"Initialisiert mit {self.max_workers} parallelen Threads")
+        if self.cache_file:
+            print(f"Cache-Datei: {self.cache_file}")
+        if self.generate_script:
+            script_type = "PowerShell" if self.powershell else "Bash"
+            print(f"{script_type}-Script: {self.script_path}")
+        if self.add_exif:
+            print(f"EXIF-Hinzufügung: Aktiviert")
+
+    def __del__(self):
+        if getattr(self, '_exiftool_daemon', None) is not None:
+            self._exiftool_daemon.close()
+
+    def load_permanent_cache(self) -> bool:
+        """
+        Lädt die neueste permanente CSV-Cache-Datei.
+        Speichert alle Hashes für Duplikat-Erkennung.
+
+        Returns:
+            True wenn erfolgreich, False sonst
+        """
+        import csv
+
+        try:
+            project_cache = os.environ.get('PROJECT_CACHE')
+            if not project_cache:
+                print("⚠️  PROJECT_CACHE nicht gesetzt. Permanenter Cache wird ignoriert.")
+                return False
+
+            cache_dir = Path(project_cache)
+            if not cache_dir.exists():
+                print(f"⚠️  Cache-Verzeichnis existiert nicht: {cache_dir}")
+                return False
+
+            # Finde die neueste permanente CSV-Datei
+            permanent_files = list(cache_dir.glob('photo_cache_permanent_*.csv'))
+
+            # Fallback: Prüfe auch auf "permanent.csv" (Legacy-Name)
+            if not permanent_files:
+                legacy_file = cache_dir / 'permanent.csv'
+                if legacy_file.exists():
+                    permanent_files = [legacy_file]
+                    print(f"Lade Legacy-Cache: {legacy_file.name}")
+
+            if not permanent_files:
+                print("⚠️  Keine permanente CSV-Datei gefunden")
+                return False
+
+            # Sortiere nach Dateinamen (enthält Timestamp) - wenn mehrere neueste Datei nehmen
+            if len(permanent_files) > 1:
+                permanent_files.sort()
+                permanent_file = permanent_files[-1]  # Neueste Datei
+            else:
+                permanent_file = permanent_files[0]
+
+            print(f"Lade permanenten Cache: {permanent_file.name}")
+
+            # Lade die CSV und fülle cached_hash_dict
+            with open(permanent_file, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f, delimiter=';')
+                hash_count = 0
+
+                for row in reader:
+                    file_hash = row.get('file_hash', '').strip()
+                    filepath = row.get('filepath', '').strip()
+
+                    if file_hash and filepath:
+                        self.cached_hash_dict[file_hash] = filepath
+                        hash_count += 1
+
+            print(f"  Geladen: {hash_count} Hashes aus permanenter Cache")
+            return True
+
+        except Exception as e:
+            print(f"⚠️  Fehler beim Laden permanenter Cache: {e}")
+            return False
+
+    def load_geo_cords(self) -> Dict[Tuple[float, float], str]:
+        """Lädt Geokoordinaten aus Konfigurationsdatei"""
+       
+        default_patterns = {
+            (47.269,8.846): "Duernten",
+            (48.341,10.906): "Augsburg",
+            (48.147,11.561): "Muenchen",
+            (48.151,11.462): "Muenchen",
+        }
+        project_cfg = os.environ.get('PROJECT_CFG')
+        if not project_cfg:
+            print("🔧 PROJECT_CFG nicht gesetzt, verwende Default-Pattern")
+            return default_patterns
+        
+        config_dir = Path(project_cfg)
+        geoconfig_file = config_dir / "geo_coords.cfg"
+
+        
+        if not geoconfig_file.exists():
+            # Erstelle Standard-Konfigurationsdatei
+            config_content = """# PhotoOrganizer geo Koordinaten Konfigurationsdatei
+#
+# Diese Datei enthält zu den Angaben von Länge und Breite den entsprechenden Ort
+
+[geo_locations]
+# Bekannte Orte mit Koordinaten
+47.269,8.846 = Duernten
+48.341,10.906 = Augsburg
+48.147,11.561 = Muenchen
+48.151,11.462 = Muenchen
+
+[unknown]
+# GPS-Koordinaten, die nicht reverse-geocodiert werden konnten
+# Diese werden bei --no-geocoding Flag gespeichert
+# Format: latitude,longitude = unknown
+"""
+            self.create_default_config(geoconfig_file, config_content)
+            print(f"🔧 Standard-Config erstellt: {geoconfig_file}")
+        
+        try:
+            config = configparser.ConfigParser()
+            config.read(geoconfig_file, encoding='utf-8')
+
+            # Load known locations from [geo_locations]
+            if 'geo_locations' in config:
+                for key, location_name in config['geo_locations'].items():
+                    try:
+                        # Parse Koordinaten aus dem Key "lat,lon"
+                        lat_str, lon_str = key.split(',')
+                        lat = float(lat_str.strip())
+                        lon = float(lon_str.strip())
+
+                        # Füge zum Cache hinzu
+                        default_patterns[(lat, lon)] = location_name.strip()
+
+                    except ValueError as e:
+                        print(f"⚠️  Ungültiges Koordinatenformat in [geo_locations]: '{key}' -> {e}")
+                        continue
+
+            # Load unknown coordinates from [unknown] section
+            # These won't be re-queried via API
+            unknown_count = 0
+            if 'unknown' in config:
+                for key in config['unknown'].keys():
+                    try:
+                        # Parse Koordinaten aus dem Key "lat,lon"
+                        lat_str, lon_str = key.split(',')
+                        lat = float(lat_str.strip())
+                        lon = float(lon_str.strip())
+
+                        # Store as None to avoid re-querying
+                        default_patterns[(lat, lon)] = None
+                        unknown_count += 1
+
+                    except ValueError as e:
+                        print(f"⚠️  Ungültiges Koordinatenformat in [unknown]: '{key}' -> {e}")
+                        continue
+
+            if unknown_count > 0:
+                print(f"🔧 {len(default_patterns)} Pattern aus Config geladen ({unknown_count} unbekannt): {geoconfig_file}")
+            else:
+                print(f"🔧 {len(default_patterns)} Pattern aus Config geladen: {geoconfig_file}")
+            return default_patterns
+
+        except Exception as e:
+            print(f"⚠️  Fehler beim Laden der Config: {e}")
+            print("🔧 Verwende Default-Pattern")
+            return default_patterns
+
+    def save_geo_locations_to_config(self) -> None:
+        """
+        Save geolocation data to geo_coords.cfg using configparser.
+
+        Known locations (with names) go to [geo_locations].
+        Unknown locations (with None value) go to [unknown].
+        Preserves existing sections and entries.
+        """
+        import configparser
+
+        project_cfg = os.environ.get('PROJECT_CFG')
+        config_dir = Path(project_cfg)
+        geoconfig_file = config_dir / "geo_coords.cfg"
+
+        try:
+            # Load existing config to preserve other sections
+            config = configparser.ConfigParser()
+            if config_dir.exists() and geoconfig_file.exists():
+                config.read(geoconfig_file, encoding='utf-8')
+
+            # Ensure sections exist
+            if 'geo_locations' not in config:
+                config['geo_locations'] = {}
+            if 'unknown' not in config:
+                config['unknown'] = {}
+
+            # Separate known and unknown locations
+            known_count = 0
+            unknown_count = 0
+
+            for (lat, lon), location_name in sorted(self.location_cache.items()):
+                key = f"{lat},{lon}"
+
+                if location_name is None or location_name == "unknown":
+                    # Store in [unknown] section only if value is None
+                    # (not an empty string, actual None)
+                    if location_name is None:
+                        config['unknown'][key] = "unknown"
+                        unknown_count += 1
+                else:
+                    # Store in [geo_locations] section
+                    config['geo_locations'][key] = location_name
+                    known_count += 1
+
+            # Remove [unknown] section if it's empty (all entries were geocoded)
+            if 'unknown' in config:
+                if len(config['unknown']) == 0:
+                    config.remove_section('unknown')
+
+            # Save to file
+            os.makedirs(config_dir, exist_ok=True)
+            with open(geoconfig_file, 'w', encoding='utf-8') as f:
+                config.write(f)
+
+            total = known_count + unknown_count
+            print(f"✅ Geo-Locations gespeichert: {geoconfig_file}")
+            print(f"   Bekannte Orte [geo_locations]: {known_count}")
+            if unknown_count > 0:
+                print(f"   Unbekannte Koordinaten [unknown]: {unknown_count}")
+            else:
+                print(f"   [unknown] section wurde entfernt (alle Koordinaten geocodiert)")
+
+        except Exception as e:
+            print(f"❌ Fehler beim Speichern: {e}")
+
+    def load_foldernames_config(self) -> Dict[str, str]:
+        """Lädt Zielordner-Benennungsmuster aus Konfigurationsdatei"""
+        # Default-Muster falls Config nicht verfügbar
+        default_config = {
+            'single_day': '{year}/{start_date}',
+            'multi_day': '{year}/{start_date}_bis_{end_date}',
+            'single_files': '{year}/einzeldateien',
+        }
+
+        project_cfg = os.environ.get('PROJECT_CFG')
+        if not project_cfg:
+            print("🔧 PROJECT_CFG nicht gesetzt, verwende Standard-Muster")
+            return default_config
+
+        config_dir = Path(project_cfg)
+        config_file = config_dir / "photo_organizer.cfg"
+
+        if not config_file.exists():
+            return default_config
+
+        try:
+            config = configparser.ConfigParser()
+            config.read(config_file, encoding='utf-8')
+
+            if 'foldernames_target' in config:
+                loaded_config = {}
+                for key, value in config['foldernames_target'].items():
+                    if value.strip():  # Überspringe leere Werte
+                        loaded_config[key.strip()] = value.strip()
+
+                if loaded_config:
+                    print(f"🔧 Zielordner-Muster aus Config geladen: {config_file}")
+                    # Merge mit Default-Config für fehlende Keys
+                    result = default_config.copy()
+                    result.update(loaded_config)
+                    return result
+
+        except Exception as e:
+            print(f"⚠️  Fehler beim Laden der Folder-Konfiguration: {e}")
+
+        return default_config
+
+    def compile_filename_patterns(self, patterns: List[str]) -> List[re.Pattern]:
+        """Kompiliert Dateinamen-Pattern einmalig (statt re-Cache-Lookup pro Datei)"""
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern))
+            except re.error as e:
+                print(f"⚠️  Ungültiges Pattern '{pattern}': {e}")
+        return compiled
+
+    def load_filename_patterns(self) -> List[re.Pattern]:
+        """Lädt Dateinamen-Pattern aus Konfigurationsdatei (vorkompiliert)"""
+        # Default-Pattern falls Config nicht verfügbar
+        default_patterns = [
+            # YYYY-MM-DD HH.MM.SS oder YYYY-MM-DD HH-MM-SS
+            r'(\d{4})-(\d{2})-(\d{2})\s+(\d{2})[\.\-:](\d{2})[\.\-:](\d{2})',
+            # YYYY-MM-DD_HH.MM.SS oder YYYY-MM-DD_HH-MM-SS
+            r'(\d{4})-(\d{2})-(\d{2})_(\d{2})[\.\-:](\d{2})[\.\-:](\d{2})',
+            # YYYYMMDD_HHMMSS
+            r'(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})',
+            # YYYY-MM-DD (nur Datum, Zeit wird auf 12:00:00 gesetzt)
+            r'(\d{4})-(\d{2})-(\d{2})',
+            # YYYYMMDD (nur Datum)
+            r'(\d{4})(\d{2})(\d{2})',
+            # IMG_YYYYMMDD_HHMMSS (typisch für Kameras)
+            r'IMG_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})',
+            # WhatsApp Format: IMG-YYYYMMDD-WAXXXX
+            r'IMG-(\d{4})(\d{2})(\d{2})-WA\d+',
+            # Signal Format: signal-YYYY-MM-DD-HHMMSS
+            r'signal-(\d{4})-(\d{2})-(\d{2})-(\d{2})(\d{2})(\d{2})',
+            # Screenshot Format: Screenshot_YYYY-MM-DD-HH-MM-SS
+            r'Screenshot_(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})',
+            # Allgemeines Muster: beliebiger Text + YYYYMMDD
+            r'.*(\d{4})(\d{2})(\d{2}).*',
+        ]
+        
+        project_cfg = os.environ.get('PROJECT_CFG')
+        if not project_cfg:
+            print("🔧 PROJECT_CFG nicht gesetzt, verwende Default-Pattern")
+            return self.compile_filename_patterns(default_patterns)
+
+        config_dir = Path(project_cfg)
+        config_file = config_dir / "photo_organizer.cfg"
+
+        if not config_file.exists():
+            # Erstelle Standard-Konfigurationsdatei
+            config_content = """# PhotoOrganizer Konfigurationsdatei
+# 
+# Diese Datei enthält Regex-Pattern für die Erkennung von Datum/Zeit in Dateinamen
+# Format: pattern_name = regex_pattern
+# 
+# Regex-Gruppen:
+# - 6 Gruppen: Jahr, Monat, Tag, Stunde, Minute, Sekunde
+# - 3 Gruppen: Jahr, Monat, Tag (Zeit wird auf 12:00:00 gesetzt)
+
+[Filename_Patterns]
+
+# Standard-Formate mit Datum und Zeit
+datetime_space = (\\d{4})-(\\d{2})-(\\d{2})\\s+(\\d{2})[\\.-:](\\d{2})[\\.-:](\\d{2})
+datetime_underscore = (\\d{4})-(\\d{2})-(\\d{2})_(\\d{2})[\\.-:](\\d{2})[\\.-:](\\d{2})
+compact_datetime = (\\d{4})(\\d{2})(\\d{2})_(\\d{2})(\\d{2})(\\d{2})
+
+# Nur Datum (Zeit wird auf 12:00:00 gesetzt)
+date_dashes = (\\d{4})-(\\d{2})-(\\d{2})
+date_compact = (\\d{4})(\\d{2})(\\d{2})
+
+# Kamera-/App-spezifische Formate
+img_camera = IMG_(\\d{4})(\\d{2})(\\d{2})_(\\d{2})(\\d{2})(\\d{2})
+whatsapp = IMG-(\\d{4})(\\d{2})(\\d{2})-WA\\d+
+signal = signal-(\\d{4})-(\\d{2})-(\\d{2})-(\\d{2})(\\d{2})(\\d{2})
+screenshot = Screenshot_(\\d{4})-(\\d{2})-(\\d{2})-(\\d{2})-(\\d{2})-(\\d{2})
+
+# Fallback: beliebiger Text + Datum
+fallback_date = .*(\\d{4})(\\d{2})(\\d{2}).*
+
+# Eigene Pattern können hier hinzugefügt werden:
+# mein_format = (\\d{4})\\.(\\d{2})\\.(\\d{2})_(\\d{2})h(\\d{2})m(\\d{2})s
+"""
+            self.create_default_config(config_file, config_content)
+            print(f"🔧 Standard-Config erstellt: {config_file}")
+        
+        try:
+            config = configparser.ConfigParser()
+            config.read(config_file, encoding='utf-8')
+            
+            if 'Filename_Patterns' in config:
+                patterns = []
+                for key, pattern in config['Filename_Patterns'].items():
+                    if pattern.strip():  # Überspringe leere Pattern
+                        patterns.append(pattern.strip())
+                
+                if patterns:
+                    print(f"🔧 {len(patterns)} Pattern aus Config geladen: {config_file}")
+                    return self.compile_filename_patterns(patterns)
+
+        except Exception as e:
+            print(f"⚠️  Fehler beim Laden der Config: {e}")
+            print("🔧 Verwende Default-Pattern")
+
+        return self.compile_filename_patterns(default_patterns)
+
+    def create_default_config(self, config_file: Path, config_content) -> None:
+        """Erstellt Standard-Konfigurationsdatei"""
+        config_dir = config_file.parent
+        config_dir.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            with open(config_file, 'w', encoding='utf-8') as f:
+                f.write(config_content)
+        except Exception as e:
+            print(f"❌ Fehler beim Erstellen der Config: {e}")
+    
+    def generate_script_path(self) -> str:
+        """Generiert automatischen Script-Pfad mit PROJECT_SCRIPTS falls verfügbar"""
+        # Prüfe PROJECT_SCRIPTS Umgebungsvariable
+        project_scripts = os.environ.get('PROJECT_SCRIPTS')
+        
+        if project_scripts:
+            scripts_dir = Path(project_scripts)
+            # Erstelle Verzeichnis falls es nicht existiert
+            scripts_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Bestimme Dateiendung basierend auf Script-Typ
+            extension = ".ps1" if self.powershell else ".sh"
+            script_filename = f"photo_move_{get_timestamp_util()}{extension}"
+            script_path = scripts_dir / script_filename
+            print(f"🔧 Verwende PROJECT_SCRIPTS: {script_path}")
+            return str(script_path)
+        else:
+            # Fallback auf aktuelles Verzeichnis
+            print(f"🔧 PROJECT_SCRIPTS nicht gesetzt, verwende aktuelles Verzeichnis")
+            extension = ".ps1" if self.powershell else ".sh"
+            return f"photo_move_script{extension}"
+    
+    def generate_cache_filename(self) -> str:
+        """Generiert automatischen Cache-Dateinamen mit PROJECT_CACHE falls verfügbar"""
+        # Prüfe PROJECT_CACHE Umgebungsvariable
+        project_cache = os.environ.get('PROJECT_CACHE')
+        
+        # Verwende nur den Namen des Quellverzeichnisses (bereits in __init__ aufgelöst)
+        source_name = self.source_dir.name or "root"
+        source_clean = clean_filename(source_name)
+
+        # msgpack-Caches bekommen eine eigene Endung, damit JSON-Konsumenten
+        # nicht unbemerkt auf Binärdaten laufen; ein vorhandener JSON-Cache
+        # wird weiterverwendet statt neu zu scannen
+        cache_filename = f"photo_cache_{source_clean}.json"
+
+        if project_cache:
+            cache_dir = Path(project_cache)
+            # Erstelle Verzeichnis falls es nicht existiert
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            cache_dir = Path('.')
+
+        cache_path = cache_dir / cache_filename
+        if MSGPACK_AVAILABLE:
+            msgpack_path = cache_dir / f"photo_cache_{source_clean}.msgpack"
+            if msgpack_path.exists() or not cache_path.exists():
+                cache_path = msgpack_path
+
+        if project_cache:
+            print(f"🔧 Verwende PROJECT_CACHE: {cache_path}")
+            return str(cache_path)
+        else:
+            # Fallback auf aktuelles Verzeichnis
+            print(f"🔧 PROJECT_CACHE nicht gesetzt, verwende aktuelles Verzeichnis")
+            print(f"🔧 Auto-Cache-Name: {cache_path.name}")
+            return cache_path.name
+    
+
+    
+    def build_combined_pattern(self, patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+        """
+        Baut eine Alternation über alle Dateinamen-Pattern. Ein einziger
+        search-Aufruf genügt dann, um Dateinamen ohne Datumsanteil
+        auszusortieren, statt jedes Pattern einzeln zu versuchen.
+        """
+        if not patterns:
+            return None
+        try:
+            return re.compile('|'.join(f'(?P<p{i}>{p.pattern})'
+                                       for i, p in enumerate(patterns)))
+        except re.error as e:
+            print(f"⚠️  Kombiniertes Dateinamen-Pattern nicht erstellbar: {e}")
+            return None
+
+    def parse_datetime_pattern(self, pattern: re.Pattern, filename: str) -> Optional[datetime]:
+        """Wendet ein einzelnes Dateinamen-Pattern an (None = kein Treffer/ungültig)"""
+        match = pattern.search(filename)
+        if not match:
+            return None
+        groups = match.groups()
+        try:
+            if len(groups) == 6:  # Vollständiges Datum + Zeit
+                year, month, day, hour, minute, second = map(int, groups)
+                return datetime(year, month, day, hour, minute, second)
+            elif len(groups) == 3:  # Nur Datum
+                year, month, day = map(int, groups)
+                return datetime(year, month, day, 12, 0, 0)  # Mittag als Standard
+        except ValueError as e:
+            print(f"  Ungültiges Datum im Dateinamen {filename}: {e}")
+        return None
+
+    def get_datetime_from_filename(self, filepath: Path) -> Optional[datetime]:
+        """Extrahiert Datum/Zeit aus Dateinamen (vorkompilierte Pattern aus Konfiguration)"""
+        filename = filepath.stem  # Dateiname ohne Erweiterung
+        parent = str(filepath.parent)
+
+        # Verzeichnis-Hint: das zuletzt in diesem Ordner erfolgreiche
+        # Pattern zuerst versuchen (Kameras benennen einheitlich).
+        # Abkürzen darf nur ein volles Datum+Zeit-Pattern (6 Gruppen):
+        # ein Datum-only-Hint würde sonst spätere Dateien mit vollem
+        # Zeitstempel im selben Ordner auf 12:00 Mittag degradieren
+        hint = self.pattern_hint.get(parent)
+        if hint is not None and hint < len(self.filename_patterns):
+            hint_pattern = self.filename_patterns[hint]
+            if hint_pattern.groups == 6:
+                result = self.parse_datetime_pattern(hint_pattern, filename)
+                if result is not None:
+                    return result
+            else:
+                hint = None  # Prioritätsreihenfolge unten gilt wieder voll
+
+        # Schnell-Filter: matcht keines der Pattern irgendwo im Namen,
+        # kann die Einzel-Schleife komplett entfallen
+        if self.combined_pattern is not None and not self.combined_pattern.search(filename):
+            return None
+
+        # Verwende vorkompilierte Pattern aus Konfiguration
+        for index, pattern in enumerate(self.filename_patterns):
+            if index == hint:
+                continue  # bereits oben versucht
+            result = self.parse_datetime_pattern(pattern, filename)
+            if result is not None:
+                self.pattern_hint[parent] = index
+                return result
+
+        return None
+    
+    def add_exif_to_file(self, filepath: Path, datetime_from_filename: datetime) -> bool:
+        """Fügt EXIF-Daten aus Dateinamen zu Bilddatei hinzu"""
+        if not self.add_exif:
+            return False
+            
+        # Nur für unterstützte Bildformate
+        if filepath.suffix.lower() not in self.exif_writable_extensions:
+            return False
+            
+        try:
+            # Prüfe ob bereits EXIF-Datum vorhanden
+            existing_exif_date = self.get_exif_datetime(filepath)
+            if existing_exif_date:
+                print(f"  ⏭️  EXIF bereits vorhanden: {filepath.name}")
+                self.exif_skipped_count += 1
+                return False
+            
+            # Konvertiere datetime zu EXIF-Format (YYYY:MM:DD HH:MM:SS)
+            exif_datetime_str = datetime_from_filename.strftime('%Y:%m:%d %H:%M:%S')
+
+            if PIEXIF_AVAILABLE and filepath.suffix.lower() in {'.jpg', '.jpeg'}:
+                # Schneller Pfad: piexif schreibt nur das APP1-Segment neu,
+                # ohne das JPEG zu dekodieren und neu zu kodieren
+                # (keine Qualitätsverluste, Bruchteil der CPU-Zeit)
+                exif_data = piexif.load(str(filepath))
+                exif_data['0th'][piexif.ImageIFD.DateTime] = exif_datetime_str.encode()
+                exif_data['0th'][piexif.ImageIFD.Software] = b"PhotoOrganizer"
+                exif_data['Exif'][piexif.ExifIFD.DateTimeOriginal] = exif_datetime_str.encode()
+                exif_data['Exif'][piexif.ExifIFD.DateTimeDigitized] = exif_datetime_str.encode()
+                piexif.insert(piexif.dump(exif_data), str(filepath))
+
+                print(f"  ✅ EXIF hinzugefügt: {filepath.name} -> {exif_datetime_str}")
+                self.exif_added_count += 1
+                return True
+
+            # Fallback: Lade Bild - explicitly convert Path to string to handle special characters
+            with Image.open(str(filepath)) as img:
+                # Hole existierende EXIF-Daten oder erstelle neue
+                exif_dict = img.getexif()
+
+                # Setze EXIF-Tags für Datum/Zeit
+                # 306 = DateTime (Image creation date)
+                # 36867 = DateTimeOriginal (Original image date)
+                # 36868 = DateTimeDigitized (Digitization date)
+                exif_dict[306] = exif_datetime_str      # DateTime
+                exif_dict[36867] = exif_datetime_str    # DateTimeOriginal
+                exif_dict[36868] = exif_datetime_str    # DateTimeDigitized
+
+                # Optional: Software-Tag setzen
+                exif_dict[305] = "PhotoOrganizer"       # Software
+
+                # Erstelle Backup des Original (optional)
+                # backup_path = filepath.with_suffix(filepath.suffix + '.backup')
+                # shutil.copy2(filepath, backup_path)
+
+                # Speichere Bild mit neuen EXIF-Daten
+                img.save(filepath, exif=exif_dict, quality=95, optimize=True)
+
+                print(f"  ✅ EXIF hinzugefügt: {filepath.name} -> {exif_datetime_str}")
+                self.exif_added_count += 1
+                return True
+
+        except Exception as e:
+            print(f"  ❌ EXIF-Fehler bei {filepath.name}: {e}")
+            self.exif_error_count += 1
+            return False
+    
+    def escape_shell_path(self, path: Path) -> str:
+        """Escapet Pfade für sichere Shell-Verwendung (gecacht, da Zielordner sich oft wiederholen)"""
+        return _escape_path_cached(str(path), self.powershell)
+    
+    def generate_shell_script(self, events: Dict[str, List[PhotoInfo]]) -> None:
+        """Erzeugt Shell-Script für die Foto-Organisation"""
+        if self.powershell:
+            self.generate_powershell_script(events)
+        else:
+            self.generate_bash_script(events)
+    
+    def generate_bash_script(self, events: Dict[str, List[PhotoInfo]]) -> None:
+        """Erzeugt Bash-Script für die Foto-Organisation"""
+        self.write_script_to_file(self.bash_script_lines(events))
+
+    def bash_script_lines(self, events: Dict[str, List[PhotoInfo]]):
+        """Generator über die Zeilen des Bash-Scripts (wird streamend geschrieben)"""
+        # Script-Header
+        yield "#!/bin/bash"
+        yield "# Automatisch generiertes Bash-Script für Foto-Organisation"
+        yield f"# Erstellt am: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"# Quelle: {self.source_dir}"
+        yield f"# Ziel: {self.target_dir}"
+        # Statischer Teil (Farben, Statistiken, move_file/move_batch) als
+        # ein Block statt Dutzender Einzel-Zeilen
+        yield _BASH_PRELUDE
+
+        # Wechsle ins Quellverzeichnis
+        yield "# Wechsle ins Quellverzeichnis"
+        source_escaped = self.escape_shell_path(self.source_dir)
+        yield f"cd {source_escaped}"
+        yield f"echo -e \"${{YELLOW}}📁 Arbeitsverzeichnis: $(pwd)${{NC}}\""
+        yield "echo"
+        yield ""
+        
+        # Sammle alle Move-Kommandos
+        all_moves = []
+        
+        for event_name, photos in events.items():
+            meta = self._event_meta_for(event_name)
+            target_folder = meta.target_folder
+            if event_name == ".":
+                # Fallback: Einzelne Dateien direkt ins Zielverzeichnis (sollte nicht mehr vorkommen)
+                yield f"# 📄 Einzelne Dateien -> Zielverzeichnis ({len(photos)} Dateien)"
+                yield f"echo -e \"${{BLUE}}📄 Einzelne Dateien -> Zielverzeichnis ({len(photos)} Dateien)${{NC}}\""
+            elif meta.is_singles:
+                # Einzeldateien in Jahresordnern
+                if meta.year:
+                    yield f"# 📄 Einzeldateien {meta.year} ({len(photos)} Dateien)"
+                    yield f"echo -e \"${{BLUE}}📄 Einzeldateien {meta.year} ({len(photos)} Dateien)${{NC}}\""
+                else:
+                    yield f"# 📄 Einzeldateien ({len(photos)} Dateien)"
+                    yield f"echo -e \"${{BLUE}}📄 Einzeldateien ({len(photos)} Dateien)${{NC}}\""
+
+                # Erstelle Zielordner
+                target_escaped = self.escape_shell_path(target_folder)
+                yield f"mkdir -p {target_escaped}"
+            else:
+                # Event-Ordner
+                yield f"# 📁 {event_name}/ ({len(photos)} Dateien)"
+                yield f"echo -e \"${{BLUE}}📁 {event_name}/ ({len(photos)} Dateien)${{NC}}\""
+                
+                # Erstelle Zielordner
+                target_escaped = self.escape_shell_path(target_folder)
+                yield f"mkdir -p {target_escaped}"
+            
+            # Move-Kommandos für diese Gruppe: gebatcht pro Zielordner,
+            # ein mv -t pro _MOVE_BATCH_SIZE Dateien statt eines pro Datei
+            rel_sources = []
+            for photo in photos:
+                target_path = target_folder / photo.name
+
+                # Sammle für Statistiken
+                all_moves.append((photo.filepath, target_path))
+
+                # Relative Pfade für einfachere Kommandos; jede Quelle
+                # kommt genau einmal vor, also ungecacht escapen
+                rel_source = photo.filepath.relative_to(self.source_dir)
+                rel_sources.append(escape_bash_path(str(rel_source)))
+
+            target_escaped = self.escape_shell_path(target_folder)
+            for i in range(0, len(rel_sources), _MOVE_BATCH_SIZE):
+                batch = rel_sources[i:i + _MOVE_BATCH_SIZE]
+                yield f"move_batch {target_escaped} {' '.join(batch)}"
+
+            yield "echo"
+        
+        # Script-Footer mit Statistiken
+        yield _BASH_FOOTER
+
+        # Speichere alle Move-Kommandos für interne Verwendung
+        self.move_commands = all_moves
+
+    def generate_powershell_script(self, events: Dict[str, List[PhotoInfo]]) -> None:
+        """Erzeugt PowerShell-Script für die Foto-Organisation"""
+        self.write_script_to_file(self.powershell_script_lines(events))
+
+    def powershell_script_lines(self, events: Dict[str, List[PhotoInfo]]):
+        """Generator über die Zeilen des PowerShell-Scripts (wird streamend geschrieben)"""
+        # Script-Header
+        yield "# Automatisch generiertes PowerShell-Script für Foto-Organisation"
+        yield f"# Erstellt am: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"# Quelle: {self.source_dir}"
+        yield f"# Ziel: {self.target_dir}"
+        # Statischer Teil (Statistiken, Move-PhotoFile/Move-PhotoBatch) als
+        # ein Block statt Dutzender Einzel-Zeilen
+        yield _POWERSHELL_PRELUDE
+
+        # Wechsle ins Quellverzeichnis
+        yield "# Wechsle ins Quellverzeichnis"
+        source_escaped = self._escape_powershell_string(str(self.source_dir))
+        yield f"Set-Location {source_escaped}"
+        yield 'Write-Host "Arbeitsverzeichnis: $(Get-Location)" -ForegroundColor Yellow'
+        yield 'Write-Host ""'
+        yield ""
+        
+        # Sammle alle Move-Kommandos
+        all_moves = []
+        
+        for event_name, photos in events.items():
+            target_folder = self._event_meta_for(event_name).target_folder
+            if event_name == ".":
+                # Einzelne Dateien direkt ins Zielverzeichnis
+                safe_header = self._escape_powershell_string(f"📄 Einzelne Dateien -> Zielverzeichnis -{len(photos)} Dateien")
+                yield f"# 📄 Einzelne Dateien -> Zielverzeichnis -{len(photos)} Dateien"
+                yield f"Write-Host {safe_header} -ForegroundColor Blue"
+            else:
+                # Event-Ordner
+                safe_header = self._escape_powershell_string(f"{event_name}/ - {len(photos)} Dateien")
+                yield f"# {event_name.replace('/', '_')}/ - {len(photos)} Dateien"
+                yield f"Write-Host {safe_header} -ForegroundColor Blue"
+                
+                # Erstelle Zielordner
+                target_escaped = self._escape_powershell_string(str(target_folder))
+                yield f"New-Item -Path {target_escaped} -ItemType Directory -Force | Out-Null"
+            
+            # Move-Kommandos für diese Gruppe: gebatcht pro Zielordner
+            rel_sources = []
+            for photo in photos:
+                target_path = target_folder / photo.name
+
+                # Sammle für Statistiken
+                all_moves.append((photo.filepath, target_path))
+
+                # Relative Pfade für einfachere Kommandos
+                rel_source = photo.filepath.relative_to(self.source_dir)
+                rel_sources.append(self._escape_powershell_string(str(rel_source)))
+
+            target_escaped = self._escape_powershell_string(str(target_folder))
+            for i in range(0, len(rel_sources), _MOVE_BATCH_SIZE):
+                batch = ', '.join(rel_sources[i:i + _MOVE_BATCH_SIZE])
+                yield f"Move-PhotoBatch -Sources @({batch}) -TargetDir {target_escaped}"
+
+            yield 'Write-Host ""'
+        
+        # Script-Footer mit Statistiken
+        yield _POWERSHELL_FOOTER
+
+        # Speichere alle Move-Kommandos für interne Verwendung
+        self.move_commands = all_moves
+
+    def _escape_powershell_string(self, text: str) -> str:
+        """
+        Escaped einen String für PowerShell korrekt.
+        Verwendet einfache Anführungszeichen für bessere Kompatibilität mit Unicode.
+        """
+        # Ersetze einfache Anführungszeichen durch doppelte einfache Anführungszeichen
+        escaped = text.replace("'", "''")
+        return f"'{escaped}'"
+
+    def write_script_to_file(self, script_lines) -> None:
+        """Schreibt Script-Zeilen streamend in die Datei (kein Join-Zwischenstring)"""
+        try:
+            with open(self.script_path, 'w', encoding='utf-8') as f:
+                f.writelines(line + '\n' for line in script_lines)
+            
+            # Script ausführbar machen (nur bei Bash)
+            if not self.powershell:
+                import stat
+                self.script_path.chmod(self.script_path.stat().st_mode | stat.S_IEXEC)
+            
+            script_type = "PowerShell" if self.powershell else "Bash"
+            execution_cmd = f"powershell -ExecutionPolicy Bypass -File {self.script_path}" if self.powershell else f"bash {self.script_path}"
+            
+            print(f"\n🎯 {script_type}-Script erstellt: {self.script_path}")
+            print(f"   🔧 Ausführung mit: {execution_cmd}")
+            print(f"   ⚠️  Das Script verschiebt die Dateien tatsächlich!")
+            
+        except Exception as e:
+            print(f"❌ Fehler beim Erstellen des Shell-Scripts: {e}")
+    
+    def get_exif_metadata(self, filepath: Path,
+                          is_video: Optional[bool] = None,
+                          file_obj=None) -> Tuple[Optional[datetime], Optional[Tuple[float, float]]]:
+        """
+        Extrahiert Datum/Zeit UND GPS-Koordinaten in einem einzigen
+        Image.open-Durchlauf (statt zwei getrennter EXIF-Parses pro Datei).
+
+        Args:
+            filepath: Pfad zur Datei
+            is_video: Bereits bestimmter Video-Status (None = selbst prüfen)
+            file_obj: Bereits geöffnetes Dateiobjekt/mmap (spart erneutes Öffnen)
+
+        Returns:
+            (datetime oder None, (lat, lon) oder None)
+        """
+        if is_video is None:
+            is_video = filepath.suffix.lower() in self.video_extensions
+        if is_video:
+            return self.get_video_datetime(filepath), None  # GPS aus Videos ist komplexer
+
+        if EXIFREAD_AVAILABLE:
+            try:
+                if file_obj is not None:
+                    file_obj.seek(0)
+                    return self._exifread_metadata(file_obj)
+                with open(filepath, 'rb') as f:
+                    return self._exifread_metadata(f)
+            except Exception:
+                pass  # Fallback auf PIL
+
+        exif_datetime = None
+        gps_coords = None
+        try:
+            if file_obj is not None:
+                file_obj.seek(0)
+                image_source = file_obj
+            else:
+                # Explicitly convert Path to string to handle special characters properly
+                image_source = str(filepath)
+            with Image.open(image_source) as img:
+                exif = img.getexif()
+                if exif:
+                    # Datum/Zeit: DateTimeOriginal > DateTimeDigitized > DateTime
+                    exif_ifd = exif.get_ifd(0x8769)
+                    for value in (exif_ifd.get(36867), exif_ifd.get(36868), exif.get(306)):
+                        if value:
+                            try:
+                                exif_datetime = datetime.strptime(value, '%Y:%m:%d %H:%M:%S')
+                                break
+                            except ValueError:
+                                continue
+
+                    # GPS IFD (Tag 34853): direkt über numerische Tag-IDs,
+                    # statt das ganze IFD in ein benanntes Dict umzubauen
+                    gps_info = exif.get_ifd(0x8825)
+                    if gps_info:
+                        lat_dms = gps_info.get(2)  # GPSLatitude
+                        lon_dms = gps_info.get(4)  # GPSLongitude
+                        if lat_dms is not None and lon_dms is not None:
+                            lat = self.convert_gps_coord(lat_dms, gps_info.get(1, 'N'))  # GPSLatitudeRef
+                            lon = self.convert_gps_coord(lon_dms, gps_info.get(3, 'E'))  # GPSLongitudeRef
+                            gps_coords = (lat, lon)
+        except Exception as e:
+            print(f"EXIF-Fehler bei {filepath}: {e}")
+
+        return exif_datetime, gps_coords
+
+    def _exifread_metadata(self, file_obj) -> Tuple[Optional[datetime], Optional[Tuple[float, float]]]:
+        """
+        Schneller EXIF-Pfad über exifread: liest nur das APP1-Segment
+        (statt PIL-Header-Decode) und überspringt MakerNotes/Thumbnails.
+        Erwartet ein geöffnetes Binär-Dateiobjekt (oder mmap).
+        """
+        tags = exifread.process_file(file_obj, details=False)
+
+        exif_datetime = None
+        for key in ('EXIF DateTimeOriginal', 'EXIF DateTimeDigitized', 'Image DateTime'):
+            value = tags.get(key)
+            if value:
+                try:
+                    exif_datetime = datetime.strptime(str(value), '%Y:%m:%d %H:%M:%S')
+                    break
+                except ValueError:
+                    continue
+
+        gps_coords = None
+        lat_tag = tags.get('GPS GPSLatitude')
+        lon_tag = tags.get('GPS GPSLongitude')
+        if lat_tag and lon_tag:
+            try:
+                lat_dms = [v.num / v.den for v in lat_tag.values]
+                lon_dms = [v.num / v.den for v in lon_tag.values]
+                lat = self.convert_gps_coord(lat_dms, str(tags.get('GPS GPSLatitudeRef', 'N')))
+                lon = self.convert_gps_coord(lon_dms, str(tags.get('GPS GPSLongitudeRef', 'E')))
+                gps_coords = (lat, lon)
+            except (AttributeError, ValueError, ZeroDivisionError):
+                gps_coords = None
+
+        return exif_datetime, gps_coords
+
+    def get_exif_datetime(self, filepath: Path) -> Optional[datetime]:
+        """Extrahiert Datum/Zeit aus EXIF-Daten"""
+        return self.get_exif_metadata(filepath)[0]
+
+    def get_best_datetime(self, filepath: Path, exif_datetime=_EXIF_UNREAD,
+                          stat_result: Optional[os.stat_result] = None) -> datetime:
+        """
+        Bestimmt den besten Zeitstempel in der Prioritätsreihenfolge: EXIF > Dateiname > Datei-Zeit
+
+        Args:
+            filepath: Pfad zur Datei
+            exif_datetime: Bereits extrahiertes EXIF-Datum oder None, falls
+                           keines vorhanden ist (vermeidet erneutes Öffnen)
+            stat_result: Bereits gelesenes stat-Ergebnis (spart einen Syscall)
+        """
+        # 1. Priorität: EXIF-Daten
+        if exif_datetime is _EXIF_UNREAD:
+            exif_datetime = self.get_exif_datetime(filepath)
+        if exif_datetime:
+            if self.verbose:
+                print(f"  ✅ EXIF-Datum: {exif_datetime}")
+            return exif_datetime
+
+        # 2. Priorität: Dateiname
+        filename_datetime = self.get_datetime_from_filename(filepath)
+        if filename_datetime:
+            if self.verbose:
+                print(f"  📝 Dateiname-Datum: {filename_datetime}")
+
+            # EXIF hinzufügen falls gewünscht und möglich
+            if self.add_exif:
+                self.add_exif_to_file(filepath, filename_datetime)
+            
+            return filename_datetime
+        
+        # 3. Priorität: Datei-Modifikationszeit
+        if stat_result is None:
+            stat_result = filepath.stat()
+        file_datetime = datetime.fromtimestamp(stat_result.st_mtime)
+        if self.verbose:
+            print(f"  📁 Datei-Zeit: {file_datetime}")
+        return file_datetime
+    
+    def get_video_datetime(self, filepath: Path) -> Optional[datetime]:
+        """Extrahiert Datum/Zeit aus Video-Metadaten mit exiftool oder ffprobe"""
+        if self._exiftool_daemon is not None:
+            metadata = self._exiftool_daemon.get_metadata(filepath)
+            if metadata:
+                creation_time = (metadata.get('CreateDate') or
+                                 metadata.get('DateTimeOriginal') or
+                                 metadata.get('CreationDate'))
+                if creation_time:
+                    try:
+                        return datetime.strptime(creation_time, '%Y-%m-%d %H:%M:%S')
+                    except ValueError:
+                        pass
+
+        if not FFPROBE_AVAILABLE:
+            return None
+
+        try:
+            cmd = [FFPROBE_PATH, '-v', 'quiet', '-print_format', 'json', '-show_format', str(filepath)]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode == 0:
+                data = json.loads(result.stdout)
+                creation_time = data.get('format', {}).get('tags', {}).get('creation_time')
+                if creation_time:
+                    # Verschiedene Zeitformat-Varianten probieren
+                    formats = ['%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S']
+                    for fmt in formats:
+                        try:
+                            return datetime.strptime(creation_time, fmt)
+                        except ValueError:
+                            continue
+        except Exception as e:
+            print(f"Video-Metadaten-Fehler bei {filepath}: {e}")
+        return None
+    
+    def get_gps_coords(self, filepath: Path) -> Optional[Tuple[float, float]]:
+        """Extrahiert GPS-Koordinaten aus EXIF-Daten"""
+        return self.get_exif_metadata(filepath)[1]
+
+
+    def convert_gps_coord(self, coord_tuple, ref) -> float:
+        """Konvertiert GPS-Koordinaten von DMS zu Dezimalgrad"""
+        degrees, minutes, seconds = coord_tuple
+        decimal = float(degrees) + float(minutes)/60 + float(seconds)/3600
+        if ref in ['S', 'W']:
+            decimal = -decimal
+        return decimal
+    
+    def calculate_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+        """Berechnet Entfernung zwischen zwei GPS-Koordinaten in km (Haversine-Formel)"""
+        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
+        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+        
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+        
+        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+        c = 2 * math.asin(math.sqrt(a))
+        r = 6371  # Erdradius in km
+        
+        return c * r
+
+    def calculate_distance_fast(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+        """
+        Schnelle Entfernungs-Näherung in km (äquirektangulare Projektion).
+        Bei Distanzen unter ~100 km auf <0,1 % genau — ausreichend für die
+        Event-Zugehörigkeit; eine cos- und eine sqrt-Auswertung statt vier
+        trigonometrischer Funktionen wie bei Haversine.
+        """
+        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
+        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+
+        x = (lon2 - lon1) * math.cos((lat1 + lat2) / 2)
+        y = lat2 - lat1
+        return _EARTH_RADIUS_KM * math.sqrt(x * x + y * y)
+
+    def gps_near_any(self, coords: Tuple[float, float],
+                     event_coords: List[Tuple[float, float]]) -> Optional[bool]:
+        """
+        Prüft ob coords im geo_radius_km zu mindestens einer der
+        Koordinaten in event_coords liegt.
+        Gibt None zurück wenn event_coords leer ist.
+        """
+        if not event_coords:
+            return None
+
+        if SCIPY_AVAILABLE and len(event_coords) >= _KDTREE_MIN_POINTS:
+            return self.gps_near_any_kdtree(coords, event_coords)
+
+        if NUMPY_AVAILABLE and len(event_coords) >= _VECTOR_MIN_POINTS:
+            # Vektorisierte Haversine-Formel über die inkrementell
+            # gepflegten Radianten-Puffer: eine ufunc-Auswertung statt
+            # einer Python-Schleife über alle Event-Fotos
+            n = len(event_coords)
+            self._sync_event_arrays(event_coords)
+            lat_p = math.radians(coords[0])
+            lon_p = math.radians(coords[1])
+            dlat = self._event_lat_rad[:n] - lat_p
+
+            # Bounding-Box-Vorfilter: Punkte, deren Breitengrad-Abstand
+            # allein schon über dem Radius liegt, brauchen keine Haversine
+            lat_limit = self.geo_radius_km / _EARTH_RADIUS_KM
+            mask = np.abs(dlat) <= lat_limit
+            if not mask.any():
+                return False
+
+            dlat = dlat[mask]
+            dlon = self._event_lon_rad[:n][mask] - lon_p
+            a = (np.sin(dlat / 2) ** 2
+                 + self._event_cos_lat[:n][mask] * math.cos(lat_p) * np.sin(dlon / 2) ** 2)
+            distances = 2 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+            return bool(np.any(distances <= self.geo_radius_km))
+
+        # Breitengrad-Schranke in Grad (~111 km pro Grad)
+        dlat_deg_limit = self.geo_radius_km / 111.0
+        for event_coord in event_coords:
+            if abs(coords[0] - event_coord[0]) > dlat_deg_limit:
+                continue
+            if self.calculate_distance_fast(coords, event_coord) <= self.geo_radius_km:
+                return True
+        return False
+
+    def _sync_event_arrays(self, event_coords: List[Tuple[float, float]]) -> None:
+        """
+        Hält die Radianten-/cos(lat)-Puffer mit event_coords synchron.
+        Es werden nur die seit dem letzten Aufruf hinzugekommenen
+        Koordinaten umgerechnet; die Puffer wachsen mit Verdopplung.
+        """
+        n = len(event_coords)
+        if self._event_lat_rad is None or n > len(self._event_lat_rad):
+            capacity = max(16, 2 * n)
+            new_lat = np.empty(capacity)
+            new_lon = np.empty(capacity)
+            new_cos = np.empty(capacity)
+            synced = self._event_coords_synced
+            if synced and self._event_lat_rad is not None:
+                new_lat[:synced] = self._event_lat_rad[:synced]
+                new_lon[:synced] = self._event_lon_rad[:synced]
+                new_cos[:synced] = self._event_cos_lat[:synced]
+            self._event_lat_rad = new_lat
+            self._event_lon_rad = new_lon
+            self._event_cos_lat = new_cos
+
+        for i in range(self._event_coords_synced, n):
+            lat_rad = math.radians(event_coords[i][0])
+            self._event_lat_rad[i] = lat_rad
+            self._event_lon_rad[i] = math.radians(event_coords[i][1])
+            self._event_cos_lat[i] = math.cos(lat_rad)
+        self._event_coords_synced = n
+
+    def gps_near_any_kdtree(self, coords: Tuple[float, float],
+                            event_coords: List[Tuple[float, float]]) -> bool:
+        """
+        KD-Baum-Pfad für große Events: die Event-Koordinaten werden
+        ECEF-projiziert in einem cKDTree gehalten, der höchstens alle
+        sqrt(n) Einfügungen neu gebaut wird; seitdem hinzugekommene
+        Koordinaten werden linear nachgeprüft.
+        """
+        n = len(event_coords)
+        if self.event_kdtree is None or n - self.event_kdtree_size > math.isqrt(n):
+            self.event_kdtree = cKDTree([_ecef(c) for c in event_coords])
+            self.event_kdtree_size = n
+
+        # Sehnenlänge, die der geodätischen Distanz geo_radius_km entspricht
+        chord_radius = 2 * _EARTH_RADIUS_KM * math.sin(
+            self.geo_radius_km / (2 * _EARTH_RADIUS_KM))
+        if self.event_kdtree.query_ball_point(_ecef(coords), chord_radius,
+                                              return_length=True) > 0:
+            return True
+
+        # Nachzügler seit dem letzten Baum-Aufbau linear prüfen
+        for event_coord in event_coords[self.event_kdtree_size:]:
+            if self.calculate_distance_fast(coords, event_coord) <= self.geo_radius_km:
+                return True
+        return False
+
+    def open_geocache_db(self) -> Optional[sqlite3.Connection]:
+        """Öffnet die persistente Geocoding-Datenbank (None bei Fehler)"""
+        try:
+            cache_dir = os.environ.get('PROJECT_CACHE')
+            if not cache_dir:
+                cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'photo_organizer')
+            ensure_directory_exists(Path(cache_dir))
+            db = sqlite3.connect(os.path.join(cache_dir, 'geocache.sqlite'),
+                                 check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE IF NOT EXISTS cache ('
+                       'lat_key REAL, lon_key REAL, name TEXT, ts INTEGER, '
+                       'PRIMARY KEY(lat_key, lon_key))')
+            return db
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Geocache-Datenbank nicht verfügbar: {e}")
+            return None
+
+    def open_hash_manifest_db(self) -> Optional[sqlite3.Connection]:
+        """Öffnet das persistente Hash-Manifest (None bei Fehler)"""
+        try:
+            cache_dir = os.environ.get('PROJECT_CACHE')
+            if not cache_dir:
+                cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'photo_organizer')
+            ensure_directory_exists(Path(cache_dir))
+            db = sqlite3.connect(os.path.join(cache_dir, 'hash_manifest.sqlite'),
+                                 check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS manifest ('
+                       'path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, '
+                       'hash TEXT, dt TEXT, lat REAL, lon REAL, '
+                       'meta_ok INTEGER DEFAULT 0)')
+            # Migration: Metadaten-Spalten in Manifesten aus älteren Läufen nachrüsten
+            for column in ('dt TEXT', 'lat REAL', 'lon REAL', 'meta_ok INTEGER DEFAULT 0'):
+                try:
+                    db.execute(f'ALTER TABLE manifest ADD COLUMN {column}')
+                except sqlite3.OperationalError:
+                    pass  # Spalte existiert bereits
+            return db
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Hash-Manifest nicht verfügbar: {e}")
+            return None
+
+    def manifest_lookup(self, filepath: Path, stat_result: os.stat_result):
+        """
+        Sucht Hash und EXIF-Metadaten einer unveränderten Datei im
+        persistenten Manifest.
+
+        Returns:
+            (hash, exif_result) bei Treffer, sonst None. exif_result ist
+            (datetime, gps_coords) wenn Metadaten gespeichert wurden,
+            sonst None (Zeile aus älterem Lauf ohne Metadaten).
+        """
+        if self.hash_manifest_db is None:
+            return None
+        with self.hash_manifest_lock:
+            try:
+                row = self.hash_manifest_db.execute(
+                    'SELECT hash, dt, lat, lon, meta_ok FROM manifest '
+                    'WHERE path = ? AND size = ? AND mtime_ns = ?',
+                    (str(filepath), stat_result.st_size, stat_result.st_mtime_ns)).fetchone()
+            except sqlite3.Error:
+                row = None
+        if row is None:
+            return None
+
+        file_hash, dt_str, lat, lon, meta_ok = row
+        if not meta_ok:
+            return file_hash, None
+
+        exif_datetime = datetime.fromisoformat(dt_str) if dt_str else None
+        gps_coords = (lat, lon) if lat is not None and lon is not None else None
+        return file_hash, (exif_datetime, gps_coords)
+
+    def manifest_store(self, filepath: Path, stat_result: os.stat_result,
+                       file_hash: str, exif_result=None) -> None:
+        """
+        Speichert Hash und (falls vorhanden) EXIF-Metadaten einer Datei
+        im persistenten Manifest. exif_result ist (datetime, gps_coords);
+        None bedeutet "Metadaten nicht gelesen" und wird von "Datei hat
+        keine Metadaten" ('', NULL) unterschieden.
+        """
+        if self.hash_manifest_db is None or not file_hash:
+            return
+        if exif_result is not None:
+            exif_datetime, gps_coords = exif_result
+            dt_str = exif_datetime.isoformat() if exif_datetime else ''
+            lat, lon = gps_coords if gps_coords else (None, None)
+            meta_ok = 1
+        else:
+            dt_str, lat, lon, meta_ok = None, None, None, 0
+        with self.hash_manifest_lock:
+            try:
+                self.hash_manifest_db.execute(
+                    'INSERT OR REPLACE INTO manifest '
+                    '(path, size, mtime_ns, hash, dt, lat, lon, meta_ok) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (str(filepath), stat_result.st_size, stat_result.st_mtime_ns,
+                     file_hash, dt_str, lat, lon, meta_ok))
+                self.hash_manifest_db.commit()
+            except sqlite3.Error:
+                pass
+
+    def manifest_update_meta(self, filepath: Path, exif_datetime, gps_coords) -> None:
+        """Trägt nachträglich gelesene EXIF-Metadaten im Manifest nach"""
+        if self.hash_manifest_db is None:
+            return
+        dt_str = exif_datetime.isoformat() if exif_datetime else ''
+        lat, lon = gps_coords if gps_coords else (None, None)
+        with self.hash_manifest_lock:
+            try:
+                self.hash_manifest_db.execute(
+                    'UPDATE manifest SET dt = ?, lat = ?, lon = ?, meta_ok = 1 '
+                    'WHERE path = ?',
+                    (dt_str, lat, lon, str(filepath)))
+                self.hash_manifest_db.commit()
+            except sqlite3.Error:
+                pass
+
+    def hash_and_metadata_mmap(self, filepath: Path, is_video: bool):
+        """
+        Berechnet Hash UND liest EXIF-Metadaten in einem Datei-Durchlauf:
+        die Datei wird einmal geöffnet und per mmap eingeblendet, Hash
+        und EXIF-Parser teilen sich dieselben Seiten im Page-Cache statt
+        die Datei zweimal zu lesen.
+
+        Returns:
+            (hash, datetime, gps_coords) oder None wenn mmap nicht
+            möglich ist (Video, leere Datei, Lesefehler)
+        """
+        if is_video:
+            return None
+        try:
+            with open(filepath, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    file_hash = get_bytes_hash(mm)
+                    exif_datetime, gps_coords = self.get_exif_metadata(
+                        filepath, is_video, file_obj=mm)
+            return file_hash, exif_datetime, gps_coords
+        except (OSError, ValueError):
+            return None
+
+    def geocache_lookup(self, rounded_coords: Tuple[float, float]) -> Optional[Tuple[Optional[str]]]:
+        """Liest einen Eintrag aus der Geocoding-Datenbank (None = kein Eintrag)"""
+        if self.geocache_db is None:
+            return None
+        try:
+            row = self.geocache_db.execute(
+                'SELECT name FROM cache WHERE lat_key = ? AND lon_key = ?',
+                rounded_coords).fetchone()
+            return row  # (name,) oder None; name kann NULL sein (negatives Ergebnis)
+        except sqlite3.Error:
+            return None
+
+    def geocache_store(self, rounded_coords: Tuple[float, float], name: Optional[str]) -> None:
+        """Schreibt ein (auch negatives) Geocoding-Ergebnis in die Datenbank"""
+        if self.geocache_db is None:
+            return
+        try:
+            self.geocache_db.execute(
+                'INSERT OR REPLACE INTO cache (lat_key, lon_key, name, ts) VALUES (?, ?, ?, ?)',
+                (rounded_coords[0], rounded_coords[1], name, int(time.time())))
+            self.geocache_db.commit()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def geo_key(coords: Tuple[float, float]) -> Tuple[float, float]:
+        """
+        Quantisiert GPS-Koordinaten auf das Cache-Raster (3 Nachkommastellen,
+        ~100 m). GPS-Rauschen benachbarter Aufnahmen fällt damit auf denselben
+        Schlüssel, statt für jede Koordinate neu zu geocodieren.
+        """
+        return (round(coords[0], 3), round(coords[1], 3))
+
+    def wait_for_rate_limit(self) -> None:
+        """Wartet bis zur nächsten erlaubten Nominatim-Anfrage (max 1 req/s)"""
+        if self.nominatim_url:
+            # Eigene Instanz: kein Rate-Limit nötig
+            return
+        with self.rate_limit_lock:
+            now = time.monotonic()
+            if now < self.next_request_time:
+                time.sleep(self.next_request_time - now)
+            self.next_request_time = time.monotonic() + 1.05
+
+    def bulk_offline_geocoding(self, coords_to_process, photos_by_coords):
+        """
+        Löst alle offenen Koordinaten in einer gebatchten
+        reverse_geocoder-Abfrage auf (GeoNames-KD-Baum, kein Netzwerk).
+
+        Returns:
+            Liste der Koordinaten, die offline nicht aufgelöst wurden
+            (für den Nominatim-Fallback).
+        """
+        print(f"\n🌍 Offline-Geocoding für {len(coords_to_process)} Orte (reverse_geocoder)...")
+        try:
+            results = reverse_geocoder.search(coords_to_process)
+        except Exception as e:
+            print(f"⚠️  Offline-Geocoding fehlgeschlagen: {e}")
+            return coords_to_process
+
+        remaining = []
+        for coords, result in zip(coords_to_process, results):
+            name = result.get('name') if result else None
+            if name:
+                # Wie im Nominatim-Pfad: GeoNames-Namen (Umlaute, Akzente,
+                # Leerzeichen) erst bereinigen, sie landen in Ordnernamen
+                # und werden in geo_coords.cfg persistiert
+                name = clean_location_name_util(name)
+                self.location_cache[coords] = name
+                self.geocache_store(coords, name)
+                for photo in photos_by_coords[coords]:
+                    photo.location_name = name
+            else:
+                remaining.append(coords)
+
+        print(f"   ✅ {len(coords_to_process) - len(remaining)} Orte offline aufgelöst")
+        return remaining
+
+    def get_location_name(self, coords: Tuple[float, float]) -> Optional[str]:
+        """Konvertiert GPS-Koordinaten zu Ortsnamen via Reverse-Geocoding (Thread-sicher)"""
+        if not self.use_geocoding:
+            return None
+
+        # Cache prüfen (gerundet auf ~100m Genauigkeit)
+        rounded_coords = self.geo_key(coords)
+
+        if rounded_coords in self.location_cache:
+            return self.location_cache[rounded_coords]
+
+        # Persistenter Cache: Ergebnisse früherer Läufe (auch negative)
+        row = self.geocache_lookup(rounded_coords)
+        if row is not None:
+            self.location_cache[rounded_coords] = row[0]
+            return row[0]
+
+        try:
+            # Rate-Limiting VOR der Anfrage: JSON-Parsing und Foto-Updates
+            # laufen dadurch innerhalb des Wartefensters statt danach
+            self.wait_for_rate_limit()
+
+            # Nominatim (OpenStreetMap) API - kostenlos, aber mit Rate-Limiting
+            # (oder eigene Instanz via nominatim_url, dann ohne Limit)
+            url = self.nominatim_url or "https://nominatim.openstreetmap.org/reverse"
+            params = {
+                'lat': coords[0],
+                'lon': coords[1],
+                'format': 'json',
+                'addressdetails': 1,
+                'zoom': 10,  # Stadt-Level
+                'extratags': 1
+            }
+            # User-Agent ist in der Session hinterlegt (Keep-Alive + Retry)
+            response = self.http_session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+
+            if 'address' in data:
+                address = data['address']
+                
+                # Priorisierte Ortsnamen (vom spezifischsten zum allgemeinsten)
+                location_candidates = [
+                    address.get('city'),
+                    address.get('town'),
+                    address.get('village'),
+                    address.get('municipality'),
+                    address.get('county'),
+                    address.get('state_district'),
+                    address.get('state')
+                ]
+                
+                # Ersten verfügbaren Ortsnamen nehmen
+                for location in location_candidates:
+                    if location:
+                        # Sonderzeichen für Dateinamen bereinigen
+                        clean_location = clean_location_name_util(location)
+
+                        # In Cache speichern
+                        self.location_cache[rounded_coords] = clean_location
+                        self.geocache_store(rounded_coords, clean_location)
+                        return clean_location
+            
+            # API hat geantwortet, aber keinen brauchbaren Ortsnamen geliefert:
+            # negatives Ergebnis persistent merken, um erneute Anfragen zu sparen
+            self.location_cache[rounded_coords] = None
+            self.geocache_store(rounded_coords, None)
+            return None
+
+        except requests.RequestException as e:
+            print(f"Geocoding-Fehler für {coords}: {e}")
+        except Exception as e:
+            print(f"Unerwarteter Geocoding-Fehler für {coords}: {e}")
+
+        # Fehlerfall: nur im Speicher-Cache merken (transiente Fehler
+        # sollen beim nächsten Lauf erneut versucht werden)
+        self.location_cache[rounded_coords] = None
+        return None
+    
+    
+    def save_cache(self) -> None:
+        """Speichert Photo-Daten in JSON-Cache"""
+        if not self.cache_file:
+            return
+            
+        cache_data = {
+            'metadata': {
+                'created': datetime.now().isoformat(),
+                'source_dir': str(self.source_dir),
+                'target_dir': str(self.target_dir),
+                'total_photos': len(self.photos),
+                'duplicates_count': len(self.duplicates),
+                'cached_count': len(self.cached)
+            },
+            'photos': [],
+            'duplicates': list(self.duplicates),
+            'cached': list(self.cached),  # Dateien bereits in der Sammlung
+            'location_cache': {}
+        }
+        
+        # Photo-Daten serialisieren
+        for photo in self.photos:
+            photo_data = {
+                'filepath': str(photo.filepath),
+                'datetime': photo.datetime.isoformat(),
+                'gps_coords': photo.gps_coords,
+                'location_name': photo.location_name,
+                'file_hash': photo.file_hash,
+                'file_size': photo.file_size,
+                'is_video': photo.is_video
+            }
+            cache_data['photos'].append(photo_data)
+        
+        # Location-Cache serialisieren
+        for coords, location in self.location_cache.items():
+            key = f"{coords[0]:.3f},{coords[1]:.3f}"
+            cache_data['location_cache'][key] = location
+        
+        try:
+            if MSGPACK_AVAILABLE and self.cache_file.suffix == '.msgpack':
+                # Binärformat: kein String-Escaping, deutlich schnelleres
+                # Parsen beim nächsten Start. Nur unter der .msgpack-Endung —
+                # photo_cache_*.json bleibt JSON, damit cache.py und
+                # _load_cache_hashes die Dateien weiter lesen können
+                with open(self.cache_file, 'wb') as f:
+                    msgpack.pack(cache_data, f, use_bin_type=True)
+            else:
+                with open(self.cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            print(f"💾 Cache gespeichert: {self.cache_file}")
+        except Exception as e:
+            print(f"❌ Fehler beim Speichern des Caches: {e}")
+    
+    def load_cache(self) -> bool:
+        """Lädt Photo-Daten aus JSON-Cache"""
+        if not self.cache_file or not self.cache_file.exists():
+            if self.cache_file:
+                print(f"📂 Cache-Datei nicht gefunden: {self.cache_file}")
+            return False
+            
+        try:
+            # Format am ersten Byte erkennen: JSON beginnt mit '{',
+            # ältere Caches bleiben damit weiterhin lesbar
+            with open(self.cache_file, 'rb') as f:
+                first_byte = f.read(1)
+                f.seek(0)
+                if first_byte in (b'{', b' ', b'\n', b'\t'):
+                    cache_data = json.loads(f.read().decode('utf-8'))
+                elif MSGPACK_AVAILABLE:
+                    cache_data = msgpack.unpack(f, raw=False)
+                else:
+                    print(f"⚠️  Cache ist msgpack-kodiert, aber msgpack ist nicht installiert")
+                    return False
+
+            print(f"📂 Lade Cache: {self.cache_file}")
+            
+            # Metadata prüfen
+            metadata = cache_data.get('metadata', {})
+            cached_source = metadata.get('source_dir')
+            cached_target = metadata.get('target_dir')
+            
+            # Validiere Cache-Kompatibilität
+            if cached_source != str(self.source_dir):
+                print(f"⚠️  Cache-Warnung: Quellverzeichnis unterschiedlich")
+                print(f"   Cache: {cached_source}")
+                print(f"   Aktuell: {self.source_dir}")
+                print(f"   Cache wird trotzdem verwendet (nur bei identischen Inhalten sinnvoll)")
+            
+            # Zielverzeichnis wird nicht validiert (irrelevant für Cache)
+            
+            # Photo-Daten laden
+            self.photos = []
+            skipped_files = 0
+            for photo_data in cache_data.get('photos', []):
+                try:
+                    filepath = Path(photo_data['filepath'])
+
+                    # Skip files that no longer exist
+                    if not filepath.exists():
+                        skipped_files += 1
+                        continue
+
+                    gps_raw = photo_data.get('gps_coords')
+                    photo = PhotoInfo(
+                        filepath=filepath,
+                        datetime=datetime.fromisoformat(photo_data['datetime']),
+                        gps_coords=tuple(gps_raw) if gps_raw else None,
+                        location_name=photo_data.get('location_name'),
+                        file_hash=photo_data.get('file_hash', ''),
+                        file_size=photo_data.get('file_size', 0),
+                        is_video=photo_data.get('is_video', False)
+                    )
+                    self.photos.append(photo)
+                except Exception as e:
+                    print(f"⚠️  Fehler beim Laden von Photo-Daten: {e}")
+            
+            # Fotos wurden ersetzt: Event-Memo invalidieren
+            self._photos_version += 1
+
+            # Duplikate laden
+            self.duplicates = set(cache_data.get('duplicates', []))
+
+            # Cached-Einträge laden (Dateien bereits in der Sammlung)
+            self.cached = set(cache_data.get('cached', []))
+
+            # Location-Cache laden
+            location_cache_data = cache_data.get('location_cache', {})
+            self.location_cache = {}
+            for coord_str, location in location_cache_data.items():
+                    try:
+                        lat_str, lon_str = coord_str.split(',')
+                        coords = (float(lat_str), float(lon_str))
+                        self.location_cache[coords] = location
+                    except Exception as e:
+                        print(f"⚠️  Fehler beim Laden von GPS-Cache: {e}")
+            
+            cache_created = metadata.get('created', 'unbekannt')
+            print(f"✅ Cache geladen (erstellt: {cache_created}):")
+            print(f"  📸 {len(self.photos)} Fotos/Videos")
+            if skipped_files > 0:
+                print(f"  ⚠️  {skipped_files} Dateien aus Cache übersprungen (nicht mehr vorhanden)")
+            print(f"  🗑️  {len(self.duplicates)} Duplikate")
+            print(f"  🗺️  {len(self.location_cache)} Orte im GPS-Cache")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Fehler beim Laden des Caches: {e}")
+            return False
+    
+    def post_process_geocoding(self) -> None:
+        """Führt Geocoding als separaten, sequenziellen Schritt durch"""
+        if not self.use_geocoding:
+            return
+
+        # Lade aktuelle Geokoordinaten aus geo_coords.cfg nochmals
+        # (für den Fall, dass die Datei zwischen Läufen aktualisiert wurde)
+        print("🔄 Aktualisiere Geokoordinaten aus geo_coords.cfg...")
+        updated_cache = self.load_geo_cords()
+        # Merge: neue Einträge hinzufügen, bestehende behalten
+        for coords, location in updated_cache.items():
+            if coords not in self.location_cache:
+                self.location_cache[coords] = location
+
+        # Sammle alle eindeutigen GPS-Koordinaten ohne Ortsname.
+        # Set statt Liste: der Membership-Test war O(n) pro Foto und
+        # machte das Sammeln bei vielen Koordinaten quadratisch.
+        seen_coords: Set[Tuple[float, float]] = set()
+        coords_to_process = []
+        # Fotos nach gerundeter Koordinate gebuckelt: das Nachtragen der
+        # Ortsnamen wird damit ein Dict-Lookup statt eines Durchlaufs
+        # über alle Fotos pro geocodierter Koordinate
+        photos_by_coords: Dict[Tuple[float, float], List[PhotoInfo]] = defaultdict(list)
+        for photo in self.photos:
+            if photo.gps_coords and not photo.location_name:
+                rounded_coords = self.geo_key(photo.gps_coords)
+                photos_by_coords[rounded_coords].append(photo)
+                if rounded_coords not in seen_coords:
+                    seen_coords.add(rounded_coords)
+                    coords_to_process.append(rounded_coords)
+
+        if not coords_to_process:
+            print("🌍 Alle GPS-Koordinaten haben bereits Ortsnamen")
+            return
+
+        # Offline-Geocoding falls reverse_geocoder installiert ist: eine
+        # gebatchte KD-Baum-Abfrage über alle Koordinaten statt einer
+        # rate-limitierten Nominatim-Anfrage pro Ort
+        if REVERSE_GEOCODER_AVAILABLE:
+            coords_to_process = self.bulk_offline_geocoding(
+                coords_to_process, photos_by_coords)
+            if not coords_to_process:
+                print(f"✅ Geocoding abgeschlossen (offline)")
+                self._photos_version += 1
+                if self.cache_file:
+                    self.save_cache()
+                    self.save_geo_locations_to_config()
+                return
+
+        print(f"\n🌍 Starte sequenzielles Geocoding für {len(coords_to_process)} Orte...")
+
+        processed_count = 0
+        for coords in coords_to_process:
+            processed_count += 1
+            print(f"📍 Geocoding {processed_count}/{len(coords_to_process)}: {coords[0]:.3f}, {coords[1]:.3f}")
+
+            # Überspringe wenn bereits im Cache
+            if coords in self.location_cache:
+                location = self.location_cache[coords]
+                if location is None:
+                    print(f"   ❌ Bereits als nicht-verfügbar markiert")
+                else:
+                    print(f"   ✅ Aus Cache: {location}")
+                continue
+            
+            # Geocoding durchführen
+            location_name = self.get_location_name(coords)
+            if location_name:
+                print(f"   ✅ Gefunden: {location_name}")
+
+                # Aktualisiere alle Fotos mit diesen Koordinaten
+                for photo in photos_by_coords[coords]:
+                    photo.location_name = location_name
+            else:
+                print(f"   ❌ Kein Ortsname gefunden")
+        
+        print(f"✅ Geocoding abgeschlossen")
+
+        # Ortsnamen fließen in Event-Namen ein: Memo invalidieren
+        self._photos_version += 1
+
+        # Cache aktualisieren falls vorhanden
+        if self.cache_file:
+            self.save_cache()
+            self.save_geo_locations_to_config()
+    
+    def process_single_file(self, filepath: Path) -> Optional[PhotoInfo]:
+        """
+        Verarbeitet eine einzelne Datei (für parallele Ausführung) - OHNE Geocoding
+
+        Duplikat-Erkennung: Mit permanentem Cache wird der volle Hash benötigt
+        (die CSV ist nach vollen Hashes indiziert). Ohne permanenten Cache
+        reicht ein schneller Fingerprint (Größe + Kopf/Ende); der volle Hash
+        wird nur zur Bestätigung bei Fingerprint-Kollisionen berechnet.
+        """
+        try:
+            # Suffix und stat nur einmal pro Datei bestimmen
+            suffix = filepath.suffix.lower()
+            is_video = suffix in self.video_extensions
+            stat_result = filepath.stat()
+
+            # EXIF-Ergebnis, falls es schon beim Hashen mitgelesen wurde
+            exif_result = None
+
+            if self.compare_with_cache:
+                # Voller Hash für Duplikat-Erkennung gegen permanente CSV;
+                # Manifest-Treffer sparen Hashen UND EXIF-Lesen komplett
+                manifest_row = self.manifest_lookup(filepath, stat_result)
+                if manifest_row is not None:
+                    file_hash, exif_result = manifest_row
+                else:
+                    # Datei muss gelesen werden: Hash und EXIF in einem
+                    # mmap-Durchlauf statt zwei getrennter Datei-Reads
+                    combined = self.hash_and_metadata_mmap(filepath, is_video)
+                    if combined is not None:
+                        file_hash, exif_datetime, gps_coords = combined
+                        exif_result = (exif_datetime, gps_coords)
+                    else:
+                        file_hash = get_file_hash(filepath)
+                    self.manifest_store(filepath, stat_result, file_hash, exif_result)
+
+                # Prüfe ob bereits in permanenter Cache vorhanden
+                if file_hash in self.cached_hash_dict:
+                    # Datei ist bereits in der Sammlung gespeichert
+                    self.cached.add(str(filepath))
+                    return None
+
+                # Lock-frei: setdefault ist unter dem GIL atomar, der erste
+                # Thread pro Hash gewinnt, alle späteren sehen dessen Pfad
+                first_path = self.hash_cache.setdefault(file_hash, str(filepath))
+                if first_path != str(filepath):
+                    # Duplikat gefunden (in dieser Verarbeitung)
+                    return None
+            else:
+                # Gestufte Duplikat-Erkennung: Größe → Fingerprint → voller
+                # Hash. Dateien mit eindeutiger Größe (die große Mehrheit)
+                # werden gar nicht erst gelesen. Der Fingerprint wandert
+                # bewusst NICHT in file_hash: Cache-Konsumenten (permanente
+                # CSV, _load_cache_hashes) erwarten dort einen vollen Digest
+                file_hash = ""
+                file_size = stat_result.st_size
+                with self.fingerprint_cache_lock:
+                    prev_same_size = self.size_cache.get(file_size)
+                    if prev_same_size is None:
+                        self.size_cache[file_size] = str(filepath)
+
+                if prev_same_size is not None:
+                    # Größen-Kollision: Fingerprints (Kopf/Ende) vergleichen
+                    fingerprint = get_quick_fingerprint(filepath)
+
+                    # Fingerprint der ersten Datei dieser Größe nachholen.
+                    # Claim und Veröffentlichung laufen über ein Event:
+                    # parallele Duplikate warten, bis der Fingerprint der
+                    # ersten Datei im Cache steht, statt ihren eigenen
+                    # Lookup gegen einen noch leeren Cache zu gewinnen
+                    with self.fingerprint_cache_lock:
+                        ready = self.fingerprint_ready.get(prev_same_size)
+                        need_prev = ready is None
+                        if need_prev:
+                            ready = threading.Event()
+                            self.fingerprint_ready[prev_same_size] = ready
+                    if need_prev:
+                        try:
+                            prev_fingerprint = get_quick_fingerprint(Path(prev_same_size))
+                            with self.fingerprint_cache_lock:
+                                if prev_fingerprint and prev_fingerprint not in self.fingerprint_cache:
+                                    self.fingerprint_cache[prev_fingerprint] = prev_same_size
+                        finally:
+                            ready.set()
+                    else:
+                        ready.wait()
+
+                    with self.fingerprint_cache_lock:
+                        prev_filepath = self.fingerprint_cache.get(fingerprint)
+                        if prev_filepath is None:
+                            self.fingerprint_cache[fingerprint] = str(filepath)
+
+                    if prev_filepath is not None and prev_filepath != str(filepath):
+                        # Fingerprint-Kollision: mit vollem Hash bestätigen (selten)
+                        full_hash = get_file_hash(filepath)
+                        if full_hash == get_file_hash(Path(prev_filepath)):
+                            return None
+                        # Echter Digest liegt ohnehin vor — mitspeichern
+                        file_hash = full_hash
+
+            # EXIF-Datum und GPS in einem Durchlauf extrahieren (entfällt,
+            # wenn sie aus Manifest oder mmap-Durchlauf bereits vorliegen)
+            if exif_result is not None:
+                exif_datetime, gps_coords = exif_result
+            else:
+                exif_datetime, gps_coords = self.get_exif_metadata(filepath, is_video)
+                if self.compare_with_cache:
+                    # Nachträglich gelesene Metadaten (z.B. Videos) im
+                    # Manifest nachtragen, damit der nächste Lauf sie hat
+                    self.manifest_update_meta(filepath, exif_datetime, gps_coords)
+
+            # Zeitstempel bestimmen (Priorität: EXIF > Dateiname > Datei-Zeit)
+            photo_datetime = self.get_best_datetime(filepath, exif_datetime, stat_result)
+
+            # Prüfe ob GPS-Koordinate bereits in geo_coords.cfg vorhanden ist
+            location_name = None
+            if gps_coords:
+                rounded_coords = self.geo_key(gps_coords)
+                # Dict-Lookup ist unter dem GIL atomar; während des parallelen
+                # Scans wird der Cache ausschließlich gelesen
+                location_name = self.location_cache.get(rounded_coords)
+
+            return PhotoInfo(
+                filepath=filepath,
+                datetime=photo_datetime,
+                gps_coords=gps_coords,
+                location_name=location_name,  # Aus geo_coords.cfg oder None (wird später geocodiert)
+                file_hash=file_hash,
+                file_size=stat_result.st_size,
+                is_video=is_video
+            )
+
+        except Exception as e:
+            print(f"❌ Fehler bei der Verarbeitung von {filepath}: {e}")
+            return None
+    
+    def iter_media_files(self, root: Path):
+        """
+        Generator über alle Mediendateien unter root.
+        Nutzt os.scandir statt rglob: DirEntry.is_file() liest den vom
+        Verzeichnis-Eintrag gecachten Dateityp, ohne stat-Aufruf pro Datei.
+        """
+        supported = self.supported_extensions  # lokale Bindung für die heiße Schleife
+        stack = [str(root)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            # Wie Path.suffix: Dateien ohne Endung ("jpg")
+                            # und versteckte Dateien (".jpg") zählen nicht
+                            name = entry.name
+                            if '.' in name[1:]:
+                                extension = '.' + name.rpartition('.')[2].lower()
+                                if extension in supported:
+                                    yield Path(entry.path)
+            except OSError as e:
+                print(f"⚠️  Verzeichnis nicht lesbar: {current}: {e}")
+
+    def scan_photos(self) -> None:
+        """Scannt alle Fotos im Quellverzeichnis mit paralleler Verarbeitung"""
+
+        # Versuche Cache zu laden
+        if self.cache_file and self.load_cache():
+            print("📂 Verwende Daten aus Cache")
+            return
+
+        print(f"🔍 Scanne Fotos in: {self.source_dir}")
+
+        # Sammle alle zu verarbeitenden Dateien
+        all_files = list(self.iter_media_files(self.source_dir))
+
+        print(f"📁 Gefunden: {len(all_files)} Dateien zum Verarbeiten")
+        print(f"🚀 Starte parallele Verarbeitung mit {self.max_workers} Threads...")
+        print("⚠️  Geocoding wird später sequenziell durchgeführt")
+        
+        # Progress tracking
+        processed_count = 0
+        duplicates_count = 0
+        
+        # Parallele Verarbeitung mit ThreadPoolExecutor (OHNE Geocoding)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Alle Tasks starten
+            future_to_filepath = {
+                executor.submit(self.process_single_file, filepath): filepath 
+                for filepath in all_files
+            }
+            
+            # Ergebnisse sammeln
+            for future in as_completed(future_to_filepath):
+                filepath = future_to_filepath[future]
+                processed_count += 1
+                
+                # Progress anzeigen (alle 100 Dateien)
+                if processed_count % 100 == 0 or processed_count == len(all_files):
+                    progress = (processed_count / len(all_files)) * 100
+                    print(f"📊 Progress: {processed_count}/{len(all_files)} ({progress:.1f}%)")
+                
+                try:
+                    photo_info = future.result()
+                    if photo_info is None:
+                        # Duplikat
+                        duplicates_count += 1
+                        self.duplicates.add(str(filepath))
+                    else:
+                        self.photos.append(photo_info)
+                        
+                except Exception as e:
+                    print(f"❌ Fehler bei {filepath}: {e}")
+        
+        self._photos_version += 1
+
+        print(f"\n✅ Parallel-Verarbeitung abgeschlossen:")
+        print(f"  📸 {len(self.photos)} Fotos/Videos erfolgreich verarbeitet")
+        print(f"  🗑️  {duplicates_count} Duplikate gefunden")
+        if self.compare_with_cache and self.cached:
+            print(f"  💾 {len(self.cached)} Dateien bereits in Sammlung (Cache)")
+        print(f"  🌍 {len([p for p in self.photos if p.gps_coords])} Fotos mit GPS-Daten")
+        
+        # EXIF-Statistiken anzeigen
+        if self.add_exif:
+            print(f"\n📋 EXIF-Hinzufügung:")
+            print(f"  ✅ {self.exif_added_count} EXIF-Daten hinzugefügt")
+            print(f"  ⏭️  {self.exif_skipped_count} bereits vorhanden")
+            print(f"  ❌ {self.exif_error_count} Fehler")
+        
+        # Cache speichern (vor Geocoding)
+        if self.cache_file:
+            self.save_cache()
+        
+        # Geocoding als separater sequenzieller Schritt
+        self.post_process_geocoding()
+        
+        # Cache erneut speichern (nach Geocoding)
+        if self.cache_file:
+            self.save_cache()
+        
+        print(f"  📍 {len([p for p in self.photos if p.location_name])} Fotos mit Ortsinformation")
+    
+    def group_photos_into_events(self) -> Dict[str, List[PhotoInfo]]:
+        """Gruppiert Fotos in Events basierend auf Zeit und Ort"""
+        if not self.photos:
+            return {}
+
+        # Memoisiert: Vorschau und Script-Generierung rufen die Gruppierung
+        # nacheinander auf, die Fotos ändern sich dazwischen nicht
+        if (self._events_cache is not None
+                and self._events_cache_version == self._photos_version):
+            return self._events_cache
+
+        # Sortiere Fotos nach Datum
+        sorted_photos = sorted(self.photos, key=lambda p: p.datetime)
+
+        events = {}
+        self.event_meta = {}
+        current_event_photos = []
+        # Laufend gepflegte GPS-Liste des Events: erspart das erneute
+        # Durchsuchen aller Event-Fotos bei jeder Zugehörigkeits-Prüfung
+        current_event_coords = []
+        current_event_start = None
+
+        for photo in sorted_photos:
+            if not current_event_photos:
+                # Erstes Foto eines neuen Events
+                current_event_photos = [photo]
+                current_event_coords = [photo.gps_coords] if photo.gps_coords else []
+                current_event_start = photo.datetime
+                self.event_kdtree = None
+                self.event_kdtree_size = 0
+                self._event_coords_synced = 0
+            else:
+                # Prüfe ob Foto zum aktuellen Event gehört
+                time_diff = photo.datetime - current_event_start
+                belongs_to_event = False
+
+                # Zeitkriterium
+                if time_diff.days <= self.event_max_days:
+                    belongs_to_event = True
+
+                    # Zusätzliche GPS-Prüfung wenn verfügbar
+                    if photo.gps_coords:
+                        # Prüfe GPS-Nähe zu anderen Fotos im Event
+                        # (None = kein Event-Foto hat GPS → nur Zeitkriterium)
+                        if self.gps_near_any(photo.gps_coords, current_event_coords) is False:
+                            belongs_to_event = False
+
+                if belongs_to_event:
+                    current_event_photos.append(photo)
+                    if photo.gps_coords:
+                        current_event_coords.append(photo.gps_coords)
+                else:
+                    # Event abschließen wenn es groß genug ist
+                    self.event_name_from_number(events, current_event_photos)
+
+                    # Neues Event starten
+                    current_event_photos = [photo]
+                    current_event_coords = [photo.gps_coords] if photo.gps_coords else []
+                    current_event_start = photo.datetime
+                    self.event_kdtree = None
+                    self.event_kdtree_size = 0
+                    self._event_coords_synced = 0
+        
+        # Letztes Event verarbeiten
+        if current_event_photos:
+            self.event_name_from_number(events, current_event_photos)
+
+        self._events_cache = events
+        self._events_cache_version = self._photos_version
+        return events
+
+    def event_name_from_number(self, events, current_event_photos):
+        if len(current_event_photos) == 1:
+            # Einzelnes Foto: direkt im Zielverzeichnis
+            event_name = self.create_event_name(current_event_photos)
+            year = event_name.split("/")[0]
+            key = year + "/einzeldateien"
+            events[key] = current_event_photos
+            self.event_meta[key] = EventMeta(
+                is_singles=True, year=year,
+                target_folder=self.target_dir / year / "einzeldateien")
+        else:
+            # Gruppe von Fotos: Event-Ordner klassisch benennen
+            event_name = self.create_event_name(current_event_photos)
+            events[event_name] = current_event_photos
+            self.event_meta[event_name] = EventMeta(
+                is_singles=False, year=None,
+                target_folder=self.target_dir / event_name)
+
+    def _event_meta_for(self, event_name: str) -> EventMeta:
+        """Liefert die vorberechneten Metadaten zu einem Event-Namen.
+
+        Normalfall ist ein Dict-Lookup; der String-Scan läuft nur noch im
+        Fallback für Namen, die nicht aus der Gruppierung stammen (z.B.
+        das Legacy-"." direkt ins Zielverzeichnis).
+        """
+        meta = self.event_meta.get(event_name)
+        if meta is None:
+            if event_name == ".":
+                meta = EventMeta(is_singles=True, year=None,
+                                 target_folder=self.target_dir)
+            elif event_name == "einzeldateien" or event_name.endswith("/einzeldateien"):
+                year = event_name.split("/")[0] if "/" in event_name else None
+                meta = EventMeta(is_singles=True, year=year,
+                                 target_folder=self.target_dir / event_name)
+            else:
+                meta = EventMeta(is_singles=False, year=None,
+                                 target_folder=self.target_dir / event_name)
+            self.event_meta[event_name] = meta
+        return meta
+
+    def create_event_name(self, photos: List[PhotoInfo]) -> str:
+        """
+        Erstellt Event-Namen basierend auf Zeitraum und optional Ort.
+        Verwendet konfigurierbare Muster aus [foldernames_target].
+        """
+        start_date = min(p.datetime for p in photos)
+        end_date = max(p.datetime for p in photos)
+
+        # Bestimme dominanten Ort falls GPS-Daten vorhanden
+        location_name = self.get_dominant_location(photos)
+
+        # Formatiere die Daten
+        year = start_date.strftime('%Y')
+        start_date_str = start_date.strftime('%Y-%m-%d')
+        end_date_str = end_date.strftime('%Y-%m-%d')
+
+        # Wähle das passende Muster aus der Konfiguration
+        if (end_date - start_date).days == 0:
+            # Eintägiges Event - nutze 'single_day' Muster
+            pattern = self.foldernames_config.get('single_day', '{year}/{start_date}')
+        else:
+            # Mehrtägiges Event - nutze 'multi_day' Muster
+            pattern = self.foldernames_config.get('multi_day', '{year}/{start_date}_bis_{end_date}')
+
+        # Ersetze Variablen im Muster
+        event_name = pattern.format(
+            year=year,
+            yyyy=year,  # Alias
+            start_date=start_date_str,
+            end_date=end_date_str,
+            location=location_name if location_name else ''
+        )
+
+        # Entferne trailing Bindestriche falls kein Ort vorhanden
+        if not location_name and event_name.endswith('-'):
+            event_name = event_name[:-1]
+
+        return event_name
+    
+    def get_dominant_location(self, photos: List[PhotoInfo]) -> Optional[str]:
+        """Bestimmt den dominanten Ort einer Foto-Gruppe"""
+        if not self.use_geocoding:
+            return None
+            
+        # Häufigster Ortsname in einem Durchlauf (mitlaufendes Maximum
+        # statt Counter + most_common-Heap pro Event)
+        counts: Dict[str, int] = {}
+        dominant_location = None
+        dominant_count = 0
+        for photo in photos:
+            location = photo.location_name
+            if not location:
+                continue
+            count = counts[location] = counts.get(location, 0) + 1
+            if count > dominant_count:
+                dominant_location, dominant_count = location, count
+
+        # Nur verwenden wenn mindestens 30% der Fotos diesen Ort haben
+        if dominant_location and dominant_count >= max(1, len(photos) * 0.3):
+            return dominant_location
+
+        return None
+    
+    def preview_organization(self) -> Dict[str, List[PhotoInfo]]:
+        """Zeigt Vorschau der geplanten Organisation"""
+        events = self.group_photos_into_events()
+        
+        print("\n=== VORSCHAU DER ORGANISATION ===")
+        
+        # Separate Zählung für Events und einzelne Dateien
+        event_count = sum(1 for k in events
+                          if not self._event_meta_for(k).is_singles)
+        single_files_count = sum(len(photos) for event_name, photos in events.items()
+                                 if self._event_meta_for(event_name).is_singles)
+        
+        print(f"Insgesamt {len(self.photos)} Fotos:")
+        if event_count > 0:
+            print(f"  📁 {event_count} Event-Ordner")
+        if single_files_count > 0:
+            print(f"  📄 {single_files_count} einzelne Dateien (in Jahresordnern)")
+        
+        # Ausgabe puffern: ein write-Syscall für die ganze Vorschau statt
+        # mehrerer print-Aufrufe pro Event
+        out = io.StringIO()
+        emit = out.write
+
+        for event_name, photos in events.items():
+            # Ein Durchlauf für alle Event-Statistiken statt je einer
+            # Comprehension pro Kennzahl
+            photo_count = 0
+            video_count = 0
+            gps_count = 0
+            location_counts = Counter()
+            for p in photos:
+                if p.is_video:
+                    video_count += 1
+                else:
+                    photo_count += 1
+                if p.gps_coords:
+                    gps_count += 1
+                if p.location_name:
+                    location_counts[p.location_name] += 1
+
+
+            # Event-Listen entstehen aus der zeitlich sortierten Gruppierung:
+            # Anfang und Ende stehen an den Listenenden, kein min/max nötig
+            start_date = photos[0].datetime
+            end_date = photos[-1].datetime
+            
+            meta = self._event_meta_for(event_name)
+            if meta.is_singles:
+                year = meta.year
+                if year:
+                    emit(f"\n📄 Einzeldateien {year}/:\n")
+                else:
+                    emit(f"\n📄 Einzeldateien:\n")
+                emit(f"   📊 {photo_count} Fotos, {video_count} Videos\n")
+                emit(f"   📅 Zeitraum: {start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')}\n")
+            else:
+                emit(f"\n📁 {event_name}/\n")
+                emit(f"   📊 {photo_count} Fotos, {video_count} Videos\n")
+                emit(f"   📅 {start_date.strftime('%d.%m.%Y %H:%M')} - {end_date.strftime('%d.%m.%Y %H:%M')}\n")
+
+            # GPS-Info falls verfügbar
+            if gps_count:
+                emit(f"   🌍 {gps_count} Fotos mit GPS-Daten\n")
+
+                # Zeige Ortsinformationen
+                if location_counts:
+                    most_common_locations = location_counts.most_common(3)
+                    location_str = ", ".join([f"{loc} ({count})" for loc, count in most_common_locations])
+                    emit(f"   📍 Orte: {location_str}\n")
+
+        if self.duplicates:
+            emit(f"\n🗑️  {len(self.duplicates)} Duplikate werden übersprungen\n")
+
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+
+        return events
+    
+    def organize_photos(self, dry_run: bool = True) -> None:
+        """Organisiert die Fotos in die Zielstruktur"""
+        events = self.group_photos_into_events()
+        
+        # Shell-Script generieren falls gewünscht (am Ende!)
+        if self.generate_script:
+            self.generate_shell_script(events)
+            if dry_run:
+                print(f"\n💡 Dry-Run abgeschlossen.")
+                return
+        
+        if dry_run:
+            print("\n=== DRY RUN - Keine Dateien werden verschoben ===")
+            moved_count = 0
+            # Gepufferte Ausgabe: eine Zeile pro Datei summiert sich sonst
+            # zu Tausenden write-Syscalls
+            out = io.StringIO()
+            emit = out.write
+            for event_name, photos in events.items():
+                meta = self._event_meta_for(event_name)
+                if event_name == ".":
+                    emit(f"\n📄 Einzelne Dateien (Zielverzeichnis) - {len(photos)} Dateien\n")
+                else:
+                    emit(f"\n📁 {event_name}/ ({len(photos)} Dateien)\n")
+                # Pfad-Präfix einmal pro Event: erspart eine pathlib-
+                # Allokation (__truediv__ + Neu-Parsen) pro Foto
+                folder_prefix = os.fspath(meta.target_folder) + os.sep
+                if meta.is_singles:
+                    folder_name = event_name if meta.year else "einzeldateien"
+                    for photo in photos:
+                        emit(f"  würde verschieben: {photo.name} -> {folder_name}/{photo.name}\n")
+                        moved_count += 1
+                else:
+                    for photo in photos:
+                        emit(f"  würde verschieben: {photo.name} -> {folder_prefix}{photo.name}\n")
+                        moved_count += 1
+            sys.stdout.write(out.getvalue())
+            moved_text = 'würden verschoben werden'
+            error_count = 0
+        else:
+            print("\n=== DATEIEN WERDEN VERSCHOBEN ===")
+            moved_count, error_count = self.execute_moves(self.plan_moves(events))
+            moved_text = 'verschoben'
+
+        print(f"\n=== ZUSAMMENFASSUNG ===")
+        print(f"✅ {moved_count} Dateien {moved_text}")
+        if error_count > 0:
+            print(f"❌ {error_count} Fehler")
+            import traceback
+            for path, exc in self.errors:
+                reason = traceback.format_exception_only(type(exc), exc)[-1].strip()
+                print(f"   ❌ {path.name}: {reason}")
+        if self.duplicates:
+            print(f"🗑️  {len(self.duplicates)} Duplikate übersprungen")
+        sys.stdout.flush()
+
+    def plan_moves(self, events: Dict[str, List[PhotoInfo]]) -> List[Tuple[Path, Path]]:
+        """Plant alle Verschiebe-Operationen als (Quelle, Ziel)-Paare.
+
+        Löst Namenskonflikte gegen bereits existierende und bereits
+        geplante Zielpfade auf, ohne Dateien anzufassen.
+        """
+        plan: List[Tuple[Path, Path]] = []
+        # Vorhandene Dateinamen pro Zielordner einmal per scandir lesen
+        # statt eines stat-Syscalls pro exists()-Probe; geplante Namen
+        # werden im selben Set mitgeführt
+        folder_names: Dict[Path, Set[str]] = {}
+
+        for event_name, photos in events.items():
+            target_folder = self._event_meta_for(event_name).target_folder
+
+            names = folder_names.get(target_folder)
+            if names is None:
+                try:
+                    names = {entry.name for entry in os.scandir(target_folder)}
+                except OSError:
+                    names = set()  # Ordner existiert noch nicht
+                folder_names[target_folder] = names
+
+            for photo in photos:
+                # Handle Namenskonflikte
+                target_name = photo.name
+                suffix = photo.name[len(photo.stem):]
+                counter = 1
+                while target_name in names:
+                    target_name = f"{photo.stem}_{counter}{suffix}"
+                    counter += 1
+
+                names.add(target_name)
+                plan.append((photo.filepath, target_folder / target_name))
+
+        return plan
+
+    def execute_moves(self, plan: List[Tuple[Path, Path]]) -> Tuple[int, int]:
+        """Führt geplante Verschiebe-Operationen direkt aus (ohne Shell-Script).
+
+        Auf demselben Dateisystem ist os.replace ein atomares rename();
+        nur bei Cross-Device-Fehlern fällt es auf shutil.move zurück.
+
+        Returns:
+            (verschobene Dateien, Fehler)
+        """
+        moved_count = 0
+        error_count = 0
+
+        # Zielordner sequenziell vorab anlegen (dedupliziert pro Ordner),
+        # damit die parallelen Moves keine mkdir-Races haben
+        created_dirs: Set[Path] = set()
+        for _, target in plan:
+            parent = target.parent
+            if parent not in created_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(parent)
+
+        def move_one(pair: Tuple[Path, Path]):
+            source, target = pair
+            try:
+                # Gleiche Partition: genau ein rename-Syscall. Der except-
+                # Zweig kostet auf dem Erfolgspfad nichts, deckt aber auch
+                # einzelne Dateien ab, die eine Mount-Grenze kreuzen
+                # (z.B. Bind-Mounts unterhalb des Quellbaums)
+                try:
+                    os.replace(source, target)
+                except OSError:
+                    # Cross-Device: copyfile nutzt sendfile/
+                    # copy_file_range (Kernel-Copy ohne Userspace-
+                    # Puffer); nur mtime erhalten, das volle
+                    # copystat von shutil.move braucht niemand hier
+                    stat_result = source.stat()
+                    shutil.copyfile(source, target)
+                    os.utime(target, (stat_result.st_atime,
+                                      stat_result.st_mtime))
+                    source.unlink()
+                return source, target, None
+            except Exception as e:
+                return source, target, e
+
+        def run_moves():
+            # Spezialfall winzige Pläne (typisch: ein einzelnes Nachzügler-
+            # Foto): seriell ohne Thread-Pool abarbeiten
+            if len(plan) <= _SERIAL_MOVE_MAX:
+                yield from map(move_one, plan)
+                return
+            # os.replace gibt den GIL frei: parallele Moves überlappen die
+            # VFS-Latenz. Ausgabe bleibt im Hauptthread (map liefert in Reihenfolge)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                yield from executor.map(move_one, plan)
+
+        self.errors = []
+        for source, target, error in run_moves():
+            if error is None:
+                print(f"  ✅ {source.name} -> {target}")
+                moved_count += 1
+            else:
+                # Fehler nur sammeln: die Ausgabe (inkl. str-Cast der
+                # Exception) bleibt aus dem heißen Loop draußen und
+                # erscheint gebündelt in der Zusammenfassung
+                self.errors.append((source, error))
+                error_count += 1
+
+        return moved_count, error_count
+
+    def _load_cache_hashes(self) -> Optional[Dict[str, str]]:
+        """
+        Lädt alle bekannten Hashes aus CSV- und JSON-Cache-Dateien.
+
+        Returns:
+            Dict hash -> filepath, oder None wenn kein Cache verfügbar.
+        """
+        import csv
+
+        print("🔍 Lade Cache-Hashes...")
+
+        project_cache = os.environ.get('PROJECT_CACHE')
+        if not project_cache:
+            print("⚠️  PROJECT_CACHE nicht gesetzt. Kein Cache verfügbar.")
+            return None
+
+        cache_dir = Path(project_cache)
+        if not cache_dir.exists():
+            print(f"⚠️  Cache-Verzeichnis nicht gefunden: {cache_dir}")
+            return None
+
+        cache_hash_map: Dict[str, str] = {}
+
+        for csv_file in sorted(cache_dir.glob('photo_cache_permanent_*.csv')):
+            print(f"  📄 Lade CSV: {csv_file.name}")
+            try:
+                with open(csv_file, 'r', encoding='utf-8') as f:
+                    reader = csv.DictReader(f, delimiter=';')
+                    count = 0
+                    for row in reader:
+                        file_hash = row.get('file_hash', '').strip()
+                        filepath = row.get('filepath', '').strip()
+                        if file_hash and filepath:
+                            cache_hash_map[file_hash] = filepath
+                            count += 1
+                print(f"     {count} Hashes geladen")
+            except Exception as e:
+                print(f"⚠️  Fehler beim Lesen von {csv_file.name}: {e}")
+
+        cache_files = sorted(cache_dir.glob('photo_cache_*.json'))
+        if MSGPACK_AVAILABLE:
+            cache_files += sorted(cache_dir.glob('photo_cache_*.msgpack'))
+        for cache_file in cache_files:
+            print(f"  📄 Lade Cache: {cache_file.name}")
+            try:
+                if cache_file.suffix == '.msgpack':
+                    with open(cache_file, 'rb') as f:
+                        cache_data = msgpack.unpack(f, raw=False)
+                else:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        cache_data = json.load(f)
+                count = 0
+                for photo in cache_data.get('photos', []):
+                    file_hash = photo.get('file_hash', '').strip()
+                    filepath = photo.get('filepath', '').strip()
+                    if file_hash and filepath and file_hash not in cache_hash_map:
+                        cache_hash_map[file_hash] = filepath
+                        count += 1
+                print(f"     {count} neue Hashes geladen")
+            except Exception as e:
+                print(f"⚠️  Fehler beim Lesen von {cache_file.name}: {e}")
+
+        if not cache_hash_map:
+            print("⚠️  Keine Hashes in Cache gefunden.")
+            return None
+
+        print(f"✅ {len(cache_hash_map)} Hashes aus Cache geladen")
+        return cache_hash_map
+
+    def _find_duplicates_in_source(self, cache_hash_map: Dict[str, str]) -> Tuple[List[Tuple[Path, str]], int, int]:
+        """
+        Scannt das Quellverzeichnis und findet Dateien, deren Hash im Cache bekannt ist.
+
+        Args:
+            cache_hash_map: Dict hash -> filepath aus dem Cache.
+
+        Returns:
+            (duplicates, unique_count, error_count)
+            duplicates: List of (source_path, cached_path)
+        """
+        print(f"\n🔍 Scanne Quelldateien in: {self.source_dir}")
+
+        all_files = list(self.iter_media_files(self.source_dir))
+
+        print(f"📁 {len(all_files)} Dateien zum Prüfen gefunden")
+        print(f"🚀 Berechne Hashes mit {self.max_workers} Threads...")
+
+        duplicates_found = []
+        unique_count = 0
+        error_count = 0
+
+        def hash_and_check(filepath: Path):
+            file_hash = get_file_hash(filepath)
+            if not file_hash:
+                return filepath, None, None
+            cached_path = cache_hash_map.get(file_hash)
+            return filepath, cached_path, file_hash
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_file = {executor.submit(hash_and_check, f): f for f in all_files}
+            processed = 0
+            for future in as_completed(future_to_file):
+                processed += 1
+                if processed % 100 == 0 or processed == len(all_files):
+                    print(f"  📊 Progress: {processed}/{len(all_files)}")
+                try:
+                    filepath, cached_path, file_hash = future.result()
+                    if file_hash is None:
+                        error_count += 1
+                    elif cached_path:
+                        duplicates_found.append((filepath, cached_path))
+                    else:
+                        unique_count += 1
+                except Exception as e:
+                    print(f"❌ Fehler: {e}")
+                    error_count += 1
+
+        duplicates_found.sort(key=lambda x: str(x[0]))
+        return duplicates_found, unique_count, error_count
+
+    def _print_duplicates_report(self, duplicates: List[Tuple[Path, str]], total_files: int, unique_count: int, error_count: int) -> None:
+        """Gibt den Duplikat-Bericht auf der Konsole aus."""
+        print(f"\n{'='*70}")
+        print(f"DUPLIKAT-BERICHT")
+        print(f"{'='*70}")
+        print(f"Geprüfte Dateien: {total_files}")
+        print(f"Duplikate:        {len(duplicates)}")
+        print(f"Einzigartig:      {unique_count}")
+        if error_count:
+            print(f"Fehler:           {error_count}")
+
+        if duplicates:
+            print(f"\n{'='*70}")
+            print(f"DUPLIKATE IM QUELLVERZEICHNIS:")
+            print(f"{'='*70}")
+            for src_file, cached_path in duplicates:
+                try:
+                    rel_src = src_file.relative_to(self.source_dir)
+                except ValueError:
+                    rel_src = src_file
+                print(f"\n  QUELLE:  {rel_src}")
+                print(f"  BEREITS: {cached_path}")
+        else:
+            print("\n✅ Keine Duplikate gefunden.")
+
+    def show_duplicates_from_cache(self) -> None:
+        """Zeigt Duplikate im Quellverzeichnis verglichen mit Cache-Dateien."""
+        cache_hash_map = self._load_cache_hashes()
+        if cache_hash_map is None:
+            return
+
+        duplicates, unique_count, error_count = self._find_duplicates_in_source(cache_hash_map)
+        total = len(duplicates) + unique_count + error_count
+        self._print_duplicates_report(duplicates, total, unique_count, error_count)
+
+    def remove_duplicates_from_source(self) -> None:
+        """
+        Entfernt Duplikate aus dem Quellverzeichnis.
+        Dateien, deren Hash im Cache bekannt ist, werden gelöscht.
+        Gibt zuerst den Bericht aus, dann werden die Dateien entfernt.
+        """
+        cache_hash_map = self._load_cache_hashes()
+        if cache_hash_map is None:
+            return
+
+        duplicates, unique_count, error_count = self._find_duplicates_in_source(cache_hash_map)
+        total = len(duplicates) + unique_count + error_count
+        self._print_duplicates_report(duplicates, total, unique_count, error_count)
+
+        if not duplicates:
+            return
+
+        print(f"\n{'='*70}")
+        print(f"ENTFERNE {len(duplicates)} DUPLIKATE AUS QUELLVERZEICHNIS...")
+        print(f"{'='*70}")
+
+        removed = 0
+        remove_errors = 0
+        for src_file, cached_path in duplicates:
+            try:
+                src_file.unlink()
+                try:
+                    rel_src = src_file.relative_to(self.source_dir)
+                except ValueError:
+                    rel_src = src_file
+                print(f"  🗑️  Gelöscht: {rel_src}")
+                removed += 1
+            except Exception as e:
+                print(f"  ❌ Fehler beim Löschen von {src_file.name}: {e}")
+                remove_errors += 1
+
+        print(f"\n✅ {removed} Duplikate entfernt")
+        if remove_errors:
+            print(f"❌ {remove_errors} Fehler beim Löschen")
+
+
+def main():
+    """Hauptfunktion mit Beispiel-Verwendung"""
+    import argparse
+
+    # An einem Terminal ist stdout zeilengepuffert (ein flush pro print).
+    # Blockpufferung spart bei tausenden Vorschau-Zeilen die meisten
+    # write-Syscalls; geflusht wird an den Phasen-Enden.
+    try:
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        pass  # z.B. umgeleiteter/ersetzter Stream ohne reconfigure
+
+    # Get defaults from environment variables
+    default_source = os.environ.get('PROJECT_DATA', './data')
+    default_target = os.environ.get('PROJECT_WORK', './results')
+
+    examples = """
+EXAMPLES:
+
+  1. Dry-run: Vorschau der Organisation (keine Dateien werden verschoben):
+     python lib/photo_organizer.py
+
+  2. Mit benutzerdefinierten Verzeichnissen (Vorschau):
+     python lib/photo_organizer.py D:\\Fotos D:\\OrganisierteFotos
+
+  3. Dateien tatsächlich verschieben:
+     python lib/photo_organizer.py --execute
+
+  4. Mit benutzerdefinierten Verzeichnissen und Ausführung:
+     python lib/photo_organizer.py D:\\Fotos D:\\OrganisierteFotos --execute
+
+  5. Mit EXIF-Ergänzung aus Dateinamen:
+     python lib/photo_organizer.py --addexif --execute
+
+  6. Ohne Geocoding (schneller, wenn GPS-Daten nicht benötigt):
+     python lib/photo_organizer.py --no-geocoding --execute
+
+  7. Shell-Script generieren für spätere Ausführung:
+     python lib/photo_organizer.py --generate-script
+
+  8. PowerShell-Script statt Bash-Script:
+     python lib/photo_organizer.py --generate-script --powershell
+
+  9. Mit benutzerdefinierten Event-Einstellungen:
+     python lib/photo_organizer.py --event-max-days 5 --geo-radius 20.0 --execute
+
+ 10. Mit allen Optimierungen:
+     python lib/photo_organizer.py --addexif --no-compare-with-cache --max-workers 8 --execute
+
+ 11. Duplikate anzeigen (Quelldateien die schon im Cache vorhanden sind):
+     python lib/photo_organizer.py --show-duplicates
+
+ 12. Duplikate aus Quellverzeichnis löschen:
+     python lib/photo_organizer.py --remove-duplicates
+
+TYPICAL WORKFLOW:
+
+  Step 1: Analysiere Fotos und erhalte Empfehlungen
+    python lib/analyze_photos.py --quick
+    python lib/analyze_photos.py
+
+    Output: Empfehlungen für Flags (--no-geocoding, --addexif, etc.)
+
+  Step 2: Vorschau der Organisation (kein --execute)
+    python lib/photo_organizer.py
+
+    Output: Zeigt geplante Ordnerstruktur ohne Dateien zu verschieben
+
+  Step 3: Führe mit empfohlenen Flags aus
+    python lib/photo_organizer.py --no-geocoding --addexif --execute
+
+  Step 4: Cache und Dateitypen aktualisieren (optional)
+    python lib/cache.py --to-permanent
+    python lib/cache.py --folder D:\\OrganisierteFotos
+
+  Step 5: Duplikate im Quellverzeichnis prüfen und entfernen
+    python lib/photo_organizer.py --show-duplicates
+    python lib/photo_organizer.py --remove-duplicates
+
+OPTIMIZATION:
+
+  Schnelle Verarbeitung:
+    python lib/photo_organizer.py --no-geocoding --max-workers 8 --execute
+
+  Detaillierte Metadaten:
+    python lib/photo_organizer.py --addexif --execute
+
+  Script-Generierung für Batch-Verarbeitung:
+    python lib/photo_organizer.py --generate-script --powershell
+    powershell -ExecutionPolicy Bypass -File scripts\\photo_move_*.ps1
+
+FEATURES:
+
+  --execute:                  Dateien tatsächlich verschieben (sonst Vorschau)
+  --addexif:                  EXIF-Daten aus Dateinamen hinzufügen
+  --no-geocoding:             Ortsnamen-Geocoding deaktivieren (schneller)
+  --generate-script:          Shell/PowerShell-Script für spätere Ausführung
+  --powershell:               PowerShell-Script (.ps1) statt Bash (.sh)
+  --event-max-days:           Maximale Tage für Event-Zusammenfassung
+  --geo-radius:               GPS-Radius in km für räumliche Gruppierung
+  --same-day-hours:           Stunden-Schwelle für "gleicher Tag"
+  --max-workers:              Parallele Threads (default: auto)
+  --cache:                    JSON-Cache-Datei (default: auto)
+  --compare-with-cache:       Duplikate mit permanenter CSV prüfen (default: ja)
+  --show-duplicates:          Zeigt Quelldateien die bereits im Cache bekannt sind (kein Löschen)
+  --remove-duplicates:        Löscht Quelldateien die bereits im Cache bekannt sind
+
+COMMON OPTIONS:
+
+  Schnell (keine GPS/Geocoding):
+    --no-geocoding
+
+  Detailliert (mit Dateimetadaten):
+    --addexif
+
+  Für große Foto-Sammlungen:
+    --max-workers 16 --no-geocoding --execute
+
+  Mit Script-Generierung:
+    --generate-script --powershell
+"""
+
+    parser = argparse.ArgumentParser(
+        description='Automatische Foto-Organisation basierend auf Datum, GPS und Dateinamen',
+        epilog=examples,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('source', nargs='?', type=Path, default=default_source, help=f'Quellverzeichnis mit Fotos (default: {default_source})')
+    parser.add_argument('target', nargs='?', type=Path, default=default_target, help=f'Zielverzeichnis für organisierte Fotos (default: {default_target})')
+    parser.add_argument('--execute', action='store_true', help='Dateien tatsächlich verschieben (ohne --execute nur Vorschau)')
+    parser.add_argument('--same-day-hours', type=int, default=12, help='Stunden für gleichen Tag (default: 12)')
+    parser.add_argument('--event-max-days', type=int, default=3, help='Max. Tage für Event (default: 3)')
+    parser.add_argument('--geo-radius', type=float, default=10.0, help='GPS-Radius in km (default: 10.0)')
+    parser.add_argument('--min-event-photos', type=int, default=10, help='Min. Fotos für Event (default: 10)')
+    parser.add_argument('--no-geocoding', action='store_true', help='Deaktiviert Reverse-Geocoding für Ortsnamen')
+    parser.add_argument('--nominatim-url', default=None, help='Eigene Nominatim-Instanz (Reverse-Endpoint), deaktiviert das 1 req/s Rate-Limit')
+    parser.add_argument('--max-workers', type=int, default=None, help='Anzahl paralleler Threads (default: auto)')
+    parser.add_argument('--generate-script', action='store_true', help='Erzeugt Shell-Script für spätere Ausführung')
+    parser.add_argument('--script-path', type=Path, default=None, help='Pfad für Shell-Script (default: auto mit PROJECT_SCRIPTS)')
+    parser.add_argument('--cache', type=Path, help='JSON-Cache-Datei für Photo-Daten (default: auto mit PROJECT_CACHE)')
+    parser.add_argument('--addexif', action='store_true', help='Fügt EXIF-Daten basierend auf Dateinamen zu Originaldateien hinzu')
+    parser.add_argument('--powershell', action='store_true', help='Erzeugt PowerShell-Script (.ps1) statt Bash-Script (.sh)')
+    parser.add_argument('--compare-with-cache', action='store_true', default=True, help='Vergleicht mit permanenter CSV (default: True)')
+    parser.add_argument('--no-compare-with-cache', action='store_false', dest='compare_with_cache', help='Deaktiviert Vergleich mit permanenter Cache')
+    parser.add_argument('--show-duplicates', action='store_true', help='Zeigt Duplikate im Quellverzeichnis verglichen mit JSON/CSV-Cache-Dateien')
+    parser.add_argument('--remove-duplicates', action='store_true', help='Entfernt Duplikate aus dem Quellverzeichnis (Dateien, die bereits im Cache bekannt sind)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Gibt Details pro Datei aus (EXIF-/Dateinamen-/Datei-Zeit)')
+
+    args = parser.parse_args()
+
+    organizer = PhotoOrganizer(
+        source_dir=args.source,
+        target_dir=args.target,
+        same_day_hours=args.same_day_hours,
+        event_max_days=args.event_max_days,
+        geo_radius_km=args.geo_radius,
+        use_geocoding=not args.no_geocoding,
+        max_workers=args.max_workers,
+        generate_script=args.generate_script,
+        script_path=args.script_path,
+        cache_file=args.cache,
+        add_exif=args.addexif,
+        powershell=args.powershell,
+        compare_with_cache=args.compare_with_cache,
+        verbose=args.verbose,
+        nominatim_url=args.nominatim_url
+    )
+
+    if args.show_duplicates:
+        organizer.show_duplicates_from_cache()
+        return
+
+    if args.remove_duplicates:
+        organizer.remove_duplicates_from_source()
+        return
+
+    # Fotos scannen
+    organizer.scan_photos()
+    
+    if not organizer.photos:
+        print("Keine Fotos gefunden!")
+        return
+    
+    # Vorschau anzeigen
+    organizer.preview_organization()
+    
+    # Organisation durchführen
+    organizer.organize_photos(dry_run=not args.execute)
+    
+    if not args.execute and not args.generate_script:
+        print("\n💡 Verwende --execute um die Dateien tatsächlich zu verschieben")
+        print("💡 Verwende --generate-script um ein Shell-Script zu erstellen")
+
+if __name__ == "__main__":
+    main()
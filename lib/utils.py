@@ -6,12 +6,23 @@ Shared utilities used across multiple modules
 import os
 import re
 import json
+import mmap
 import hashlib
 import shlex
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Bevorzugter Hash-Algorithmus für Duplikat-Erkennung: BLAKE3 ist deutlich
+# schneller als SHA-256 und für Datei-Deduplizierung mehr als ausreichend
+DEFAULT_HASH_ALGORITHM = 'blake3' if BLAKE3_AVAILABLE else 'sha256'
+
 
 # ============================================================================
 # ENVIRONMENT VARIABLE MANAGEMENT
@@ -265,6 +276,17 @@ def clean_filename(name: str, max_length: int = 20) -> str:
     return cleaned or "unnamed"
 
 
+# Precompiled at module scope: clean_location_name runs once per photo
+# and should not pay re.compile cache lookups or per-char replace loops
+_UMLAUT_TABLE = str.maketrans({
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss',
+    'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue'
+})
+_RE_NONWORD = re.compile(r'[^\w\-_\s]')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_UNDERSCORES = re.compile(r'_+')
+
+
 def clean_location_name(location: str, max_length: int = 30) -> str:
     """
     Clean a location/city name for use in folder names.
@@ -280,20 +302,15 @@ def clean_location_name(location: str, max_length: int = 30) -> str:
     if not location:
         return ""
 
-    # Replace German umlauts and special characters
-    replacements = {
-        'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss',
-        'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue'
-    }
-    for old, new in replacements.items():
-        location = location.replace(old, new)
+    # Replace German umlauts and special characters (single C-level pass)
+    location = location.translate(_UMLAUT_TABLE)
 
     # Remove special characters, keep alphanumeric, hyphen, underscore, space
-    location = re.sub(r'[^\w\-_\s]', '', location)
+    location = _RE_NONWORD.sub('', location)
 
     # Replace multiple spaces with underscore and collapse underscores
-    location = re.sub(r'\s+', '_', location.strip())
-    location = re.sub(r'_+', '_', location)
+    location = _RE_WHITESPACE.sub('_', location.strip())
+    location = _RE_UNDERSCORES.sub('_', location)
 
     # Truncate if needed
     if max_length:
@@ -526,25 +543,121 @@ def get_file_metadata(filepath: Path,
 # FILE HASHING
 # ============================================================================
 
-def get_file_hash(filepath: Path, algorithm: str = 'sha256') -> str:
+def get_file_hash(filepath: Path, algorithm: str = None) -> str:
     """
     Compute hash of a file for duplicate detection.
 
+    Uses BLAKE3 if installed (5-10x faster than SHA-256, memory-mapped
+    with parallel tree hashing for large files); duplicate detection
+    needs no cryptographic properties, only a strong fast hash.
+    Otherwise uses hashlib.file_digest (Python 3.11+) which runs the
+    whole read/update loop in C, with a chunked fallback on older
+    interpreters.
+
+    Note: caches written with a different algorithm will not match;
+    hex digests are compared verbatim.
+
     Args:
         filepath: Path to file
-        algorithm: Hash algorithm ('sha256', 'md5', etc.)
+        algorithm: Hash algorithm ('blake3', 'sha256', 'md5', etc.;
+                   default: blake3 if available, else sha256)
 
     Returns:
         Hex digest of file hash
     """
+    if algorithm is None:
+        algorithm = DEFAULT_HASH_ALGORITHM
+
+    if algorithm == 'blake3' and BLAKE3_AVAILABLE:
+        try:
+            hash_obj = blake3.blake3()
+            hash_obj.update_mmap(str(filepath))
+            return hash_obj.hexdigest()
+        except OSError as e:
+            print(f"❌ Error computing hash for {filepath}: {e}")
+            return ""
+
     try:
-        hash_obj = hashlib.new(algorithm)
+        with open(filepath, "rb", buffering=0) as f:
+            # Ganze Datei per mmap in einem einzigen C-Aufruf hashen:
+            # kein Python-Schleifenkörper, keine Kopien in Lese-Puffer
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.new(algorithm, mm).hexdigest()
+            except (OSError, ValueError):
+                pass  # leere Datei oder mmap nicht möglich → Stream-Pfad
+
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, algorithm).hexdigest()
+
+            # Fallback für Python < 3.11: 1 MiB readinto-Puffer statt
+            # 4 KiB-Chunks (weniger Python-Iterationen, keine
+            # bytes-Allokation pro Chunk)
+            hash_obj = hashlib.new(algorithm)
+            buf = bytearray(1 << 20)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                hash_obj.update(view[:n])
+            return hash_obj.hexdigest()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error computing hash for {filepath}: {e}")
+        return ""
+
+
+def get_bytes_hash(data, algorithm: str = None) -> str:
+    """
+    Compute hash of an in-memory buffer (bytes, memoryview or mmap).
+
+    Uses the same algorithm selection as get_file_hash so digests from
+    both functions are interchangeable. Hashing a whole mapping is a
+    single C call with no Python-level chunk loop.
+
+    Args:
+        data: Buffer to hash
+        algorithm: Hash algorithm (default: blake3 if available, else sha256)
+
+    Returns:
+        Hex digest of the buffer hash
+    """
+    if algorithm is None:
+        algorithm = DEFAULT_HASH_ALGORITHM
+
+    if algorithm == 'blake3' and BLAKE3_AVAILABLE:
+        return blake3.blake3(data).hexdigest()
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+def get_quick_fingerprint(filepath: Path, sample_size: int = 65536) -> str:
+    """
+    Compute a fast file fingerprint for duplicate detection.
+
+    Hashes only the file size plus the first and last sample_size bytes
+    instead of the whole file. Two files sharing a fingerprint are almost
+    certainly duplicates; callers should confirm with get_file_hash on
+    collision.
+
+    Args:
+        filepath: Path to file
+        sample_size: Bytes to sample from head and tail (default 64 KiB)
+
+    Returns:
+        Hex digest of the fingerprint
+    """
+    try:
+        file_size = os.path.getsize(filepath)
+        hash_obj = hashlib.sha256()
+        hash_obj.update(str(file_size).encode())
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_obj.update(chunk)
+            hash_obj.update(f.read(sample_size))
+            if file_size > sample_size * 2:
+                f.seek(-sample_size, os.SEEK_END)
+                hash_obj.update(f.read(sample_size))
         return hash_obj.hexdigest()
-    except Exception as e:
-        print(f"❌ Error computing hash for {filepath}: {e}")
+    except OSError as e:
+        print(f"❌ Error computing fingerprint for {filepath}: {e}")
         return ""
 
 